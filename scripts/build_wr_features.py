@@ -34,13 +34,14 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--playerid-csv", type=Path, default=Path("NFLAdvancedStats/data/db_playerids.csv"), help="Player ID mapping CSV")
     parser.add_argument("--write", action="store_true", help="Persist to database tables")
     parser.add_argument("--db-uri", type=str, default=None, help="Override DB URI (otherwise env SUPABASE_DB_URI or DB_URI)")
+    parser.add_argument("--cache-dir", type=str, default="data/nfl_cache", help="Parquet cache for nfl_data_py downloads ('' to disable)")
     return parser.parse_args()
 
 
-def main(seasons: Sequence[int], playerid_csv: Path, write: bool, db_uri: str | None) -> int:
+def main(seasons: Sequence[int], playerid_csv: Path, write: bool, db_uri: str | None, cache_dir: str | None = None) -> int:
     logger.info("Building WR/TE features seasons=%s write=%s", seasons, write)
     engine = get_engine(db_uri)
-    train, inf = build_feature_matrices(engine, seasons, str(playerid_csv))
+    train, inf = build_feature_matrices(engine, seasons, str(playerid_csv), cache_dir=cache_dir or None)
 
     logger.info("Train rows=%s, columns=%s", len(train), len(train.columns))
     logger.info("Inference rows=%s, columns=%s", len(inf), len(inf.columns))
@@ -60,6 +61,6 @@ def main(seasons: Sequence[int], playerid_csv: Path, write: bool, db_uri: str |
 
 if __name__ == "__main__":
     args = parse_args()
-    raise SystemExit(main(args.seasons, args.playerid_csv, args.write, args.db_uri))
+    raise SystemExit(main(args.seasons, args.playerid_csv, args.write, args.db_uri, args.cache_dir))
 
 
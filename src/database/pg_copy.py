@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+if TYPE_CHECKING:  # sqlalchemy/psycopg2 are only needed when a direct DB URI is used
+    import pandas as pd
+    from sqlalchemy.engine import Engine
+
+
+# COPY ... CSV treats this token as NULL so real empty strings survive the load.
+_NULL = r"\N"
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _csv_value(v: Any) -> Any:
+    if v is None:
+        return _NULL
+    if isinstance(v, (dict, list)):
+        return json.dumps(v, default=str, separators=(",", ":"))
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    return v
+
+
+def rows_to_csv(rows: Sequence[dict[str, Any]], columns: Sequence[str]) -> io.StringIO:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for r in rows:
+        writer.writerow([_csv_value(r.get(c)) for c in columns])
+    buf.seek(0)
+    return buf
+
+
+def _copy_in(cur: Any, sql: str, buf: io.StringIO) -> None:
+    """Run ``COPY ... FROM STDIN`` on a psycopg2 (copy_expert) or psycopg 3 (copy) cursor."""
+    if hasattr(cur, "copy_expert"):
+        cur.copy_expert(sql, buf)
+        return
+    with cur.copy(sql) as copy:
+        copy.write(buf.getvalue())
+
+
+def copy_rows_method(pd_table: Any, conn: Any, keys: Sequence[str], data_iter: Any) -> int:
+    """
+    ``method=`` for ``DataFrame.to_sql`` on Postgres: each chunk is loaded with
+    one COPY ... FROM STDIN on the connection pandas is writing through (so it
+    shares its transaction), instead of parameterized INSERTs.
+    """
+    target = _quote_ident(pd_table.name)
+    if pd_table.schema:
+        target = f"{_quote_ident(pd_table.schema)}.{target}"
+    cols = ", ".join(_quote_ident(k) for k in keys)
+    buf = io.StringIO()
+    n = 0
+    writer = csv.writer(buf)
+    for row in data_iter:
+        writer.writerow([_csv_value(v) for v in row])
+        n += 1
+    buf.seek(0)
+    cur = conn.connection.cursor()
+    try:
+        _copy_in(cur, f"COPY {target} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')", buf)
+    finally:
+        cur.close()
+    return n
+
+
+def _conflict_keys(on_conflict: Optional[str]) -> list[str]:
+    return [k.strip() for k in (on_conflict or "").split(",") if k.strip()]
+
+
+def _last_per_key(rows: Sequence[dict[str, Any]], keys: Sequence[str]) -> list[dict[str, Any]]:
+    """Rows with a repeated ``keys`` tuple reduced to the last one (``drop_duplicates(keep="last")``)."""
+    latest: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for r in rows:
+        k = tuple(r.get(c) for c in keys)
+        latest.pop(k, None)
+        latest[k] = r
+    return list(latest.values())
+
+
+def copy_upsert_sql(table: str, stage: str, columns: Sequence[str], on_conflict: Optional[str]) -> str:
+    cols = ", ".join(_quote_ident(c) for c in columns)
+    sql = f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage}"
+    if not on_conflict:
+        return sql
+    keys = _conflict_keys(on_conflict)
+    updates = [c for c in columns if c not in keys]
+    conflict = ", ".join(_quote_ident(k) for k in keys)
+    if not updates:
+        return f"{sql} ON CONFLICT ({conflict}) DO NOTHING"
+    set_clause = ", ".join(f"{_quote_ident(c)} = EXCLUDED.{_quote_ident(c)}" for c in updates)
+    return f"{sql} ON CONFLICT ({conflict}) DO UPDATE SET {set_clause}"
+
+
+class PostgresCopyClient:
+    """
+    Bulk writer that loads rows with COPY into a temp stage table and merges
+    them with INSERT ... ON CONFLICT, bypassing PostgREST's JSON round trips.
+
+    Exposes the same ``upsert(table, rows, on_conflict=...)`` call as
+    SupabaseClient so it can be passed as ``supabase=`` to the ingestors for
+    large historical backfills (requires a direct Postgres URI + psycopg2/psycopg).
+    """
+
+    def __init__(self, engine: Engine, *, schema: str = "public") -> None:
+        self._engine = engine
+        self._schema = schema
+
+    def upsert(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        *,
+        on_conflict: Optional[str] = None,
+    ) -> int:
+        """
+        Rows repeating an ``on_conflict`` key keep the last one, as successive
+        upsert batches would (one INSERT ... ON CONFLICT can't touch a row twice).
+        """
+        if not rows:
+            return 0
+        keys = _conflict_keys(on_conflict)
+        if keys:
+            rows = _last_per_key(rows, keys)
+        columns = list(rows[0].keys())
+        self._load(table, columns, rows_to_csv(rows, columns), on_conflict)
+        return len(rows)
+
+    def upsert_frame(
+        self,
+        table: str,
+        df: pd.DataFrame,
+        *,
+        on_conflict: Optional[str] = None,
+    ) -> int:
+        """
+        ``upsert`` for a DataFrame of scalar columns: the frame is written into the
+        COPY buffer by ``to_csv`` in one pass, with no dict built per row.
+        Repeated ``on_conflict`` keys keep the last row, as in ``upsert``.
+        """
+        keys = _conflict_keys(on_conflict)
+        if keys:
+            df = df.drop_duplicates(keys, keep="last")
+        if df.empty:
+            return 0
+        buf = io.StringIO()
+        df.to_csv(buf, header=False, index=False, na_rep=_NULL)
+        buf.seek(0)
+        self._load(table, list(df.columns), buf, on_conflict)
+        return len(df)
+
+    def _load(self, table: str, columns: Sequence[str], buf: io.StringIO, on_conflict: Optional[str]) -> None:
+        target = f"{_quote_ident(self._schema)}.{_quote_ident(table)}"
+        stage = _quote_ident(f"_stage_{table}")
+        cols = ", ".join(_quote_ident(c) for c in columns)
+
+        raw = self._engine.raw_connection()
+        try:
+            cur = raw.cursor()
+            cur.execute(f"CREATE TEMP TABLE {stage} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP")
+            _copy_in(cur, f"COPY {stage} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')", buf)
+            cur.execute(copy_upsert_sql(target, stage, columns, on_conflict))
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
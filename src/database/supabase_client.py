@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import time
@@ -9,6 +10,11 @@ from urllib.parse import urlencode
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 
 class SupabaseError(RuntimeError):
     pass
@@ -18,6 +24,37 @@ def _sleep(seconds: float) -> None:
     time.sleep(seconds)
 
 
+# Suggested ``gzip_min_bytes`` for callers that opt in to compressed request bodies;
+# below this the gzip overhead isn't worth it.
+GZIP_MIN_BYTES = 16 * 1024
+
+
+def _json_default(o: Any) -> Any:
+    # numpy/pandas scalars and arrays (from nfl_data_py frames) expose tolist().
+    tolist = getattr(o, "tolist", None)
+    return tolist() if callable(tolist) else str(o)
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Encode a request body to compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Decode a response body (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _compact(row: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in row.items() if v is not None}
+
+
 @dataclass(frozen=True)
 class SupabaseConfig:
     url: str
@@ -37,6 +74,10 @@ class SupabaseConfig:
 class SupabaseClient:
     """
     Minimal Supabase REST (PostgREST) wrapper for the hrb server.
+
+    ``gzip_min_bytes`` opts in to gzip request bodies at or above that size; it is
+    off by default since not every gateway in front of PostgREST decompresses
+    ``Content-Encoding: gzip`` requests.
     """
 
     def __init__(
@@ -46,11 +87,13 @@ class SupabaseClient:
         session: Optional[requests.Session] = None,
         max_retries: int = 6,
         sleep_fn: Callable[[float], None] = _sleep,
+        gzip_min_bytes: Optional[int] = None,
     ) -> None:
         self._cfg = cfg
         self._session = session or requests.Session()
         self._max_retries = max_retries
         self._sleep = sleep_fn
+        self._gzip_min_bytes = gzip_min_bytes
 
     def _headers(self, *, prefer: Optional[str] = None, content_type_json: bool = False) -> dict[str, str]:
         h = {
@@ -86,7 +129,11 @@ class SupabaseClient:
 
         body = None
         if json_body is not None:
-            body = json.dumps(json_body, default=str)
+            # Encode once to compact bytes; a str body gets re-encoded by http.client.
+            body = _json_bytes(json_body)
+            if self._gzip_min_bytes is not None and len(body) >= self._gzip_min_bytes:
+                body = gzip.compress(body, compresslevel=5)
+                merged_headers["Content-Encoding"] = "gzip"
 
         last_err: Optional[Exception] = None
         backoff = 0.6
@@ -128,7 +175,7 @@ class SupabaseClient:
     def upsert(
         self,
         table: str,
-        rows: list[dict[str, Any]],
+        rows: Optional[list[dict[str, Any]]],
         *,
         on_conflict: Optional[str] = None,
     ) -> int:
@@ -137,12 +184,18 @@ class SupabaseClient:
         params: dict[str, Any] = {}
         if on_conflict:
             params["on_conflict"] = on_conflict
+        body: list[dict[str, Any]] = rows
+        if any(v is None for r in rows for v in r.values()):
+            # Omit null fields from the payload; listing every column in
+            # ?columns= makes PostgREST write NULL for the missing keys.
+            params["columns"] = ",".join(dict.fromkeys(k for r in rows for k in r))
+            body = [_compact(r) for r in rows]
         resp = self._request(
             "POST",
             f"/rest/v1/{table}",
             params=params,
             headers=self._headers(prefer="resolution=merge-duplicates,return=minimal", content_type_json=True),
-            json_body=rows,
+            json_body=body,
         )
         if not (200 <= resp.status_code < 300):
             raise SupabaseError(f"Upsert failed table={table} status={resp.status_code} body={resp.text[:500]}")
@@ -182,7 +235,7 @@ class SupabaseClient:
         )
         if not (200 <= resp.status_code < 300):
             raise SupabaseError(f"Select failed table={table} status={resp.status_code} body={resp.text[:500]}")
-        data = resp.json()
+        data = _json_loads(resp.content)
         if not isinstance(data, list):
             raise SupabaseError(f"Unexpected select response type table={table} type={type(data)}")
         return data
@@ -228,12 +281,24 @@ class SupabaseClient:
         if not (200 <= resp.status_code < 300):
             raise SupabaseError(f"Update failed table={table} status={resp.status_code} body={resp.text[:500]}")
             
-        data = resp.json()
+        data = _json_loads(resp.content)
         if not isinstance(data, list):
             # Sometimes empty list if no match
             return []
         return data
 
+    def rpc(self, fn: str, params: Optional[dict[str, Any]] = None) -> Any:
+        """Call a Postgres function exposed by PostgREST; returns its decoded result."""
+        resp = self._request(
+            "POST",
+            f"/rest/v1/rpc/{fn}",
+            headers=self._headers(content_type_json=True),
+            json_body=params or {},
+        )
+        if not (200 <= resp.status_code < 300):
+            raise SupabaseError(f"RPC failed fn={fn} status={resp.status_code} body={resp.text[:500]}")
+        return _json_loads(resp.content) if resp.content else None
+
     def delete(self, table: str, *, filters: dict[str, Any]) -> int:
         """Delete rows matching filters."""
         if not filters:
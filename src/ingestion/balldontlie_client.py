@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import json
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Callable, Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class BallDontLieError(RuntimeError):
@@ -19,21 +23,40 @@ def _sleep(seconds: float) -> None:
 class RateLimiter:
     """
     Client-side limiter for GOAT Tier (600 req/min = ~0.1s interval).
+    Thread-safe, so one client can be shared by concurrent fetchers.
     """
     min_interval_seconds: float
     _sleep: Callable[[float], None] = _sleep
     _last_ts: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def wait(self) -> None:
-        now = time.time()
-        if self._last_ts <= 0:
-            self._last_ts = now
-            return
-        elapsed = now - self._last_ts
-        remaining = self.min_interval_seconds - elapsed
-        if remaining > 0:
-            self._sleep(remaining)
-        self._last_ts = time.time()
+        with self._lock:
+            now = time.time()
+            if self._last_ts <= 0:
+                self._last_ts = now
+                return
+            elapsed = now - self._last_ts
+            remaining = self.min_interval_seconds - elapsed
+            if remaining > 0:
+                self._sleep(remaining)
+            self._last_ts = time.time()
+
+
+# Team IDs essentially never change; a week-old on-disk copy is still good.
+_TEAM_IDS_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _pooled_session(pool_maxsize: int = 32) -> requests.Session:
+    """Keep-alive session with enough pooled connections for concurrent fetchers."""
+    session = requests.Session()
+    # Stats pages are large JSON; ask for compressed bodies (urllib3 decodes them).
+    # "br" is left out: decoding it needs the optional brotli package.
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 class BallDontLieNFLClient:
@@ -48,18 +71,30 @@ class BallDontLieNFLClient:
         per_page: int = 100,
         rate_limiter: Optional[RateLimiter] = None,
         sleep_fn: Callable[[float], None] = _sleep,
+        cache_dir: Optional[str] = None,
     ) -> None:
         self._api_key = api_key.strip()
         if not self._api_key:
             raise BallDontLieError("BALLDONTLIE api_key is required")
         self._base_url = base_url.rstrip("/")
-        self._session = session or requests.Session()
+        self._session = session or _pooled_session()
         self._timeout = timeout_seconds
         self._max_retries = max_retries
         self._per_page = per_page
         self._sleep = sleep_fn
         # GOAT Tier: 10 req/sec
         self._rl = rate_limiter or RateLimiter(min_interval_seconds=0.11, _sleep=sleep_fn)
+        self._team_ids: Optional[tuple[int, ...]] = None
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> "BallDontLieNFLClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     def _headers(self) -> dict[str, str]:
         return {"Authorization": self._api_key}
@@ -130,6 +165,22 @@ class BallDontLieNFLClient:
     def iter_teams(self) -> Iterator[dict[str, Any]]:
         yield from self.paginate("/teams")
 
+    def team_ids(self) -> tuple[int, ...]:
+        """
+        All team IDs, fetched once per client (the league's teams don't change mid-run).
+        With ``cache_dir`` set they are also kept on disk for a week across runs.
+        """
+        if self._team_ids is None:
+            cache = self._cache_dir / "teams.json" if self._cache_dir else None
+            if cache and cache.exists() and time.time() - cache.stat().st_mtime < _TEAM_IDS_TTL_SECONDS:
+                self._team_ids = tuple(json.loads(cache.read_text()))
+            else:
+                self._team_ids = tuple(t["id"] for t in self.iter_teams() if t.get("id"))
+                if cache and self._team_ids:
+                    cache.parent.mkdir(parents=True, exist_ok=True)
+                    cache.write_text(json.dumps(list(self._team_ids)))
+        return self._team_ids
+
     def iter_games(self, *, seasons: list[int], weeks: Optional[list[int]] = None) -> Iterator[dict[str, Any]]:
         params = {"seasons[]": seasons}
         if weeks:
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Iterable, Optional
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from queue import Empty, Queue
+from typing import Any, Callable, Iterable, Optional, Sequence
 
-from src.database.supabase_client import SupabaseClient
+from src.database.supabase_client import SupabaseClient, SupabaseError
 from src.ingestion.balldontlie_client import BallDontLieError, BallDontLieNFLClient
 
 
@@ -33,38 +39,127 @@ def _now_iso() -> str:
 
 
 def _chunked(items: Iterable[dict[str, Any]], size: int) -> Iterable[list[dict[str, Any]]]:
-    buf: list[dict[str, Any]] = []
-    for it in items:
-        buf.append(it)
-        if len(buf) >= size:
-            yield buf
-            buf = []
-    if buf:
-        yield buf
+    """
+    Batch rows for upsert. Never yields an empty chunk, so callers can upsert
+    each chunk without an emptiness check; filter rows before chunking.
+    """
+    # islice fills each chunk in C rather than a Python-level loop per row.
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+_DONE = object()
+
+
+def _prefetched(chunks: Iterable[list[dict[str, Any]]], maxsize: int = 2) -> Iterable[list[dict[str, Any]]]:
+    """
+    Produce chunks on a background thread so the next API page is fetched and
+    mapped while the caller upserts the current one. Producer errors are
+    re-raised in the caller; at most ``maxsize`` chunks are buffered.
+    """
+    q: Queue[tuple[Any, Optional[BaseException]]] = Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _produce() -> None:
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    return
+                q.put((chunk, None))
+            q.put((_DONE, None))
+        except Exception as e:
+            q.put((_DONE, e))
+
+    t = threading.Thread(target=_produce, daemon=True)
+    t.start()
+    try:
+        while True:
+            item, err = q.get()
+            if item is _DONE:
+                if err is not None:
+                    raise err
+                return
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer still waiting on a full queue after an early exit.
+        while t.is_alive():
+            try:
+                q.get(timeout=0.1)
+            except Empty:
+                pass
 
 
 def _valid_rows(
     rows: Iterable[dict[str, Any]],
     mapper: Optional[Any] = None,
     *,
-    required_fields: list[str],
+    required_fields: Sequence[str],
     abort_threshold: int = 25,
 ) -> Iterable[dict[str, Any]]:
     """
     Map rows and drop any missing required fields; abort if too many invalids.
     """
     mapper = mapper or (lambda x: x)
+    required = tuple(required_fields)
     invalid = 0
     for raw in rows:
         mapped = mapper(raw)
-        if any(mapped.get(f) is None for f in required_fields):
+        # Mappers emit every key, so direct lookups are the fast path; explicit
+        # nulls from BDL still count as missing.
+        missing = False
+        try:
+            for f in required:
+                if mapped[f] is None:
+                    missing = True
+                    break
+        except (KeyError, TypeError):
+            missing = True
+        if missing:
             invalid += 1
             if invalid > abort_threshold:
-                raise ValueError(f"Too many invalid rows missing {required_fields}")
+                raise ValueError(f"Too many invalid rows missing {list(required)}")
             continue
         yield mapped
 
 
+@lru_cache(maxsize=32)
+def _key_getter(key_fields: tuple[str, ...]) -> Callable[[dict[str, Any]], Any]:
+    return itemgetter(*key_fields)
+
+
+def _unique_rows(
+    chunks: Iterable[list[dict[str, Any]]],
+    key_fields: tuple[str, ...],
+) -> Iterable[list[dict[str, Any]]]:
+    """
+    Keep the last row per conflict key within each chunk (one upsert can't touch a
+    row twice). Later chunks still resend a repeated key, so the last row the API
+    returned is the one left in the table, as with successive upserts.
+    """
+    get_key = _key_getter(tuple(key_fields))
+    for chunk in chunks:
+        yield list({get_key(r): r for r in chunk}.values())
+
+
+def _rows_with_keys(rows: Iterable[dict[str, Any]], key_fields: tuple[str, ...]) -> Iterable[dict[str, Any]]:
+    """
+    Drop mapped rows with a falsy key field. Mappers always set their key
+    fields, so plain subscripts are safe; a single key filters in C.
+    """
+    if len(key_fields) == 1:
+        return filter(_key_getter(key_fields), rows)
+    if len(key_fields) == 2:
+        a, b = key_fields
+        return (r for r in rows if r[a] and r[b])
+    return (r for r in rows if all(map(r.__getitem__, key_fields)))
+
+
+_ADV_KEY_FIELDS = ("player_id", "season", "week", "postseason")
+_GAME_STATS_KEY_FIELDS = ("player_id", "game_id")
+
+
 def _ensure_defaults(mapped: dict[str, Any], *, season: int, week: int, postseason: bool) -> dict[str, Any]:
     if mapped.get("season") is None:
         mapped["season"] = season
@@ -89,8 +184,8 @@ def map_team(t: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_player(p: dict[str, Any]) -> dict[str, Any]:
-    team = p.get("team") if isinstance(p.get("team"), dict) else None
-    team_id = team.get("id") if isinstance(team, dict) else None
+    team = p.get("team")
+    team_id = team.get("id") if type(team) is dict else None
     return {
         "id": p.get("id"),
         "first_name": p.get("first_name"),
@@ -109,8 +204,10 @@ def map_player(p: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_game(g: dict[str, Any]) -> dict[str, Any]:
-    home = g.get("home_team") if isinstance(g.get("home_team"), dict) else None
-    visitor = g.get("visitor_team") if isinstance(g.get("visitor_team"), dict) else None
+    home = g.get("home_team")
+    home_id = home.get("id") if type(home) is dict else None
+    visitor = g.get("visitor_team")
+    visitor_id = visitor.get("id") if type(visitor) is dict else None
     return {
         "id": g.get("id"),
         "season": g.get("season"),
@@ -120,8 +217,8 @@ def map_game(g: dict[str, Any]) -> dict[str, Any]:
         "status": g.get("status"),
         "venue": g.get("venue"),
         "summary": g.get("summary"),
-        "home_team_id": home.get("id") if isinstance(home, dict) else None,
-        "visitor_team_id": visitor.get("id") if isinstance(visitor, dict) else None,
+        "home_team_id": home_id,
+        "visitor_team_id": visitor_id,
         "home_team_score": g.get("home_team_score"),
         "home_team_q1": g.get("home_team_q1"),
         "home_team_q2": g.get("home_team_q2"),
@@ -139,8 +236,8 @@ def map_game(g: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_player_season_stats(s: dict[str, Any]) -> dict[str, Any]:
-    p = s.get("player") if isinstance(s.get("player"), dict) else None
-    pid = p.get("id") if isinstance(p, dict) else None
+    p = s.get("player")
+    pid = p.get("id") if type(p) is dict else None
     return {
         "player_id": pid,
         "season": s.get("season"),
@@ -164,17 +261,20 @@ def map_player_season_stats(s: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_player_game_stats(s: dict[str, Any]) -> dict[str, Any]:
-    p = s.get("player") if isinstance(s.get("player"), dict) else None
-    pid = p.get("id") if isinstance(p, dict) else None
-    t = s.get("team") if isinstance(s.get("team"), dict) else None
-    tid = t.get("id") if isinstance(t, dict) else None
-    g = s.get("game") if isinstance(s.get("game"), dict) else None
-    gid = g.get("id") if isinstance(g, dict) else None
+    p = s.get("player")
+    pid = p.get("id") if type(p) is dict else None
+    t = s.get("team")
+    tid = t.get("id") if type(t) is dict else None
+    g = s.get("game")
+    if type(g) is dict:
+        gid, g_season, g_week = g.get("id"), g.get("season"), g.get("week")
+    else:
+        gid = g_season = g_week = None
     return {
         "player_id": pid,
         "game_id": gid,
-        "season": g.get("season") if isinstance(g, dict) else None,
-        "week": g.get("week") if isinstance(g, dict) else None,
+        "season": g_season,
+        "week": g_week,
         "team_id": tid,
         "passing_completions": s.get("passing_completions"),
         "passing_attempts": s.get("passing_attempts"),
@@ -194,8 +294,8 @@ def map_player_game_stats(s: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_adv_receiving(s: dict[str, Any]) -> dict[str, Any]:
-    p = s.get("player") if isinstance(s.get("player"), dict) else None
-    pid = p.get("id") if isinstance(p, dict) else None
+    p = s.get("player")
+    pid = p.get("id") if type(p) is dict else None
     return {
         "player_id": pid,
         "season": s.get("season"),
@@ -217,8 +317,8 @@ def map_adv_receiving(s: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_adv_rushing(s: dict[str, Any]) -> dict[str, Any]:
-    p = s.get("player") if isinstance(s.get("player"), dict) else None
-    pid = p.get("id") if isinstance(p, dict) else None
+    p = s.get("player")
+    pid = p.get("id") if type(p) is dict else None
     return {
         "player_id": pid,
         "season": s.get("season"),
@@ -240,8 +340,8 @@ def map_adv_rushing(s: dict[str, Any]) -> dict[str, Any]:
 
 
 def map_adv_passing(s: dict[str, Any]) -> dict[str, Any]:
-    p = s.get("player") if isinstance(s.get("player"), dict) else None
-    pid = p.get("id") if isinstance(p, dict) else None
+    p = s.get("player")
+    pid = p.get("id") if type(p) is dict else None
     return {
         "player_id": pid,
         "season": s.get("season"),
@@ -307,6 +407,14 @@ def ingest_core(
     )
 
 
+# (label, BDL client iterator, mapper, table) for each advanced stats endpoint.
+ADV_SPECS: list[tuple[str, str, Callable[[dict[str, Any]], dict[str, Any]], str]] = [
+    ("receiving", "iter_advanced_receiving", map_adv_receiving, "nfl_advanced_receiving_stats"),
+    ("rushing", "iter_advanced_rushing", map_adv_rushing, "nfl_advanced_rushing_stats"),
+    ("passing", "iter_advanced_passing", map_adv_passing, "nfl_advanced_passing_stats"),
+]
+
+
 def ingest_stats_and_advanced(
     *,
     seasons: list[int],
@@ -337,13 +445,16 @@ def ingest_stats_and_advanced(
     # Per-game player stats
     game_stats_upserted = 0
     if include_game_stats:
-        for chunk in _chunked(
-            _valid_rows(
-                (map_player_game_stats(s) for s in bdl.iter_player_game_stats(seasons=seasons)),
-                required_fields=["player_id", "game_id"],
-                abort_threshold=invalid_abort_threshold,
+        for chunk in _unique_rows(
+            _chunked(
+                _valid_rows(
+                    (map_player_game_stats(s) for s in bdl.iter_player_game_stats(seasons=seasons)),
+                    required_fields=_GAME_STATS_KEY_FIELDS,
+                    abort_threshold=invalid_abort_threshold,
+                ),
+                batch_size,
             ),
-            batch_size,
+            _GAME_STATS_KEY_FIELDS,
         ):
             game_stats_upserted += supabase.upsert("nfl_player_game_stats", chunk, on_conflict="player_id,game_id")
             if game_stats_upserted % (batch_size * 10) == 0:
@@ -351,149 +462,44 @@ def ingest_stats_and_advanced(
     logger.info("Upserted nfl_player_game_stats=%d", game_stats_upserted)
 
     # Advanced stats (week 0 = full season)
-    adv_receiving_upserted = 0
-    adv_rushing_upserted = 0
-    adv_passing_upserted = 0
+    adv_upserted = {table: 0 for _, _, _, table in ADV_SPECS}
     if include_advanced:
         weeks = advanced_weeks if advanced_weeks is not None else [0]
+        cases = [(week, False) for week in weeks]
+        if advanced_include_postseason:
+            cases.append((0, True))
         for season in seasons:
-            for week in weeks:
-                try:
-                    for chunk in _chunked(
-                        _valid_rows(
-                            (
-                                map_adv_receiving(s)
-                                for s in bdl.iter_advanced_receiving(season=season, week=week, postseason=False)
-                            ),
-                            mapper=lambda m: _ensure_defaults(m, season=season, week=week, postseason=False),
-                            required_fields=["player_id", "season", "week", "postseason"],
-                            abort_threshold=invalid_abort_threshold,
-                        ),
-                        batch_size,
-                    ):
-                        adv_receiving_upserted += supabase.upsert(
-                            "nfl_advanced_receiving_stats", chunk, on_conflict="player_id,season,week,postseason"
-                        )
-                except BallDontLieError as e:
-                    logger.warning("Skipping advanced receiving season=%s week=%s due to BDL error: %s", season, week, e)
-
-                try:
-                    for chunk in _chunked(
-                        _valid_rows(
-                            (
-                                map_adv_rushing(s)
-                                for s in bdl.iter_advanced_rushing(season=season, week=week, postseason=False)
-                            ),
-                            mapper=lambda m: _ensure_defaults(m, season=season, week=week, postseason=False),
-                            required_fields=["player_id", "season", "week", "postseason"],
-                            abort_threshold=invalid_abort_threshold,
-                        ),
-                        batch_size,
-                    ):
-                        adv_rushing_upserted += supabase.upsert(
-                            "nfl_advanced_rushing_stats", chunk, on_conflict="player_id,season,week,postseason"
-                        )
-                except BallDontLieError as e:
-                    logger.warning("Skipping advanced rushing season=%s week=%s due to BDL error: %s", season, week, e)
-
-                try:
-                    for chunk in _chunked(
-                        _valid_rows(
-                            (
-                                map_adv_passing(s)
-                                for s in bdl.iter_advanced_passing(season=season, week=week, postseason=False)
-                            ),
-                            mapper=lambda m: _ensure_defaults(m, season=season, week=week, postseason=False),
-                            required_fields=["player_id", "season", "week", "postseason"],
-                            abort_threshold=invalid_abort_threshold,
-                        ),
-                        batch_size,
-                    ):
-                        adv_passing_upserted += supabase.upsert(
-                            "nfl_advanced_passing_stats", chunk, on_conflict="player_id,season,week,postseason"
-                        )
-                except BallDontLieError as e:
-                    logger.warning("Skipping advanced passing season=%s week=%s due to BDL error: %s", season, week, e)
-
-            if advanced_include_postseason:
-                postseason_week = 0
-                try:
-                    for chunk in _chunked(
-                        _valid_rows(
-                            (
-                                map_adv_receiving(
-                                    s
-                                )
-                                for s in bdl.iter_advanced_receiving(season=season, week=postseason_week, postseason=True)
-                            ),
-                            mapper=lambda m: _ensure_defaults(m, season=season, week=postseason_week, postseason=True),
-                            required_fields=["player_id", "season", "week", "postseason"],
-                            abort_threshold=invalid_abort_threshold,
-                        ),
-                        batch_size,
-                    ):
-                        adv_receiving_upserted += supabase.upsert(
-                            "nfl_advanced_receiving_stats", chunk, on_conflict="player_id,season,week,postseason"
-                        )
-                except BallDontLieError as e:
-                    logger.warning(
-                        "Skipping advanced receiving postseason season=%s week=%s due to BDL error: %s",
-                        season,
-                        postseason_week,
-                        e,
-                    )
-
-                try:
-                    for chunk in _chunked(
-                        _valid_rows(
-                            (
-                                map_adv_rushing(
-                                    s
-                                )
-                                for s in bdl.iter_advanced_rushing(season=season, week=postseason_week, postseason=True)
+            for week, postseason in cases:
+                for kind, fetch_name, mapper, table in ADV_SPECS:
+                    fetch = getattr(bdl, fetch_name)
+                    try:
+                        for chunk in _unique_rows(
+                            _chunked(
+                                _valid_rows(
+                                    (mapper(s) for s in fetch(season=season, week=week, postseason=postseason)),
+                                    mapper=lambda m: _ensure_defaults(m, season=season, week=week, postseason=postseason),
+                                    required_fields=_ADV_KEY_FIELDS,
+                                    abort_threshold=invalid_abort_threshold,
+                                ),
+                                batch_size,
                             ),
-                            mapper=lambda m: _ensure_defaults(m, season=season, week=postseason_week, postseason=True),
-                            required_fields=["player_id", "season", "week", "postseason"],
-                            abort_threshold=invalid_abort_threshold,
-                        ),
-                        batch_size,
-                    ):
-                        adv_rushing_upserted += supabase.upsert(
-                            "nfl_advanced_rushing_stats", chunk, on_conflict="player_id,season,week,postseason"
+                            _ADV_KEY_FIELDS,
+                        ):
+                            adv_upserted[table] += supabase.upsert(
+                                table, chunk, on_conflict="player_id,season,week,postseason"
+                            )
+                    except BallDontLieError as e:
+                        logger.warning(
+                            "Skipping advanced %s%s season=%s week=%s due to BDL error: %s",
+                            kind,
+                            " postseason" if postseason else "",
+                            season,
+                            week,
+                            e,
                         )
-                except BallDontLieError as e:
-                    logger.warning(
-                        "Skipping advanced rushing postseason season=%s week=%s due to BDL error: %s",
-                        season,
-                        postseason_week,
-                        e,
-                    )
-
-                try:
-                    for chunk in _chunked(
-                        _valid_rows(
-                            (
-                                map_adv_passing(
-                                    s
-                                )
-                                for s in bdl.iter_advanced_passing(season=season, week=postseason_week, postseason=True)
-                            ),
-                            mapper=lambda m: _ensure_defaults(m, season=season, week=postseason_week, postseason=True),
-                            required_fields=["player_id", "season", "week", "postseason"],
-                            abort_threshold=invalid_abort_threshold,
-                        ),
-                        batch_size,
-                    ):
-                        adv_passing_upserted += supabase.upsert(
-                            "nfl_advanced_passing_stats", chunk, on_conflict="player_id,season,week,postseason"
-                        )
-                except BallDontLieError as e:
-                    logger.warning(
-                        "Skipping advanced passing postseason season=%s week=%s due to BDL error: %s",
-                        season,
-                        postseason_week,
-                        e,
-                    )
+    adv_receiving_upserted = adv_upserted["nfl_advanced_receiving_stats"]
+    adv_rushing_upserted = adv_upserted["nfl_advanced_rushing_stats"]
+    adv_passing_upserted = adv_upserted["nfl_advanced_passing_stats"]
     logger.info(
         "Upserted advanced stats: receiving=%d rushing=%d passing=%d",
         adv_receiving_upserted,
@@ -515,6 +521,8 @@ def ingest_stats_and_advanced(
 # =============================================================================
 
 
+_NO_MARKET: dict[str, Any] = {}
+
 
 def should_ingest_prop(prop: dict[str, Any]) -> bool:
     """
@@ -523,469 +531,298 @@ def should_ingest_prop(prop: dict[str, Any]) -> bool:
     - KEEP: market_type == 'milestone' AND prop_type == 'anytime_td'
     - DISCARD: All others
     """
-    market = prop.get("market", {})
-    market_type = market.get("type", "")
-    prop_type = prop.get("prop_type", "")
-
-    if market_type == "over_under":
-        return True
+    # Shared empty default: no per-call dict allocation, and a null market is skipped.
+    market_type = (prop.get("market") or _NO_MARKET).get("type")
+    return market_type == "over_under" or (
+        market_type == "milestone" and prop.get("prop_type") == "anytime_td"
+    )
 
-    if market_type == "milestone" and prop_type == "anytime_td":
-        return True
 
-    return False
+# (column, BDL key) pairs copied straight from the team season stats payload.
+_TEAM_STAT_KEYMAP: tuple[tuple[str, str], ...] = (
+    ("games_played", "games_played"),
+
+    # Scoring & Totals
+    ("total_points", "total_points"),
+    ("total_points_per_game", "total_points_per_game"),
+    ("total_offensive_yards", "total_offensive_yards"),
+    ("total_offensive_yards_per_game", "total_offensive_yards_per_game"),
+    ("net_total_offensive_yards", "net_total_offensive_yards"),
+    ("net_total_offensive_yards_per_game", "net_total_offensive_yards_per_game"),
+
+    # Passing
+    ("passing_attempts", "passing_attempts"),
+    ("passing_completions", "passing_completions"),
+    ("passing_completion_pct", "passing_completion_pct"),
+    ("passing_yards", "passing_yards"),
+    ("passing_yards_per_game", "passing_yards_per_game"),
+    ("passing_touchdowns", "passing_touchdowns"),
+    ("passing_interceptions", "passing_interceptions"),
+    ("net_passing_yards", "net_passing_yards"),
+    ("net_passing_yards_per_game", "net_passing_yards_per_game"),
+    ("yards_per_pass_attempt", "yards_per_pass_attempt"),
+    ("net_yards_per_pass_attempt", "net_yards_per_pass_attempt"),
+    ("passing_first_downs", "misc_first_downs_passing"),
+    ("passing_first_down_pct", "passing_first_down_pct"),
+    ("passing_20_plus_yards", "passing_20_plus_yards"),
+    ("passing_40_plus_yards", "passing_40_plus_yards"),
+    ("passing_sacks", "passing_sacks"),
+    ("passing_sack_yards", "passing_sack_yards_lost"), # Note field mismatch in json sample vs doc name? Doc says passing_sack_yards, JSON usually passing_sack_yards_lost. Using API key from sample.
+    ("qb_rating", "passing_qb_rating"),
+    ("passing_long", "passing_long"),
+
+    # Rushing
+    ("rushing_attempts", "rushing_attempts"),
+    ("rushing_yards", "rushing_yards"),
+    ("rushing_yards_per_game", "rushing_yards_per_game"),
+    ("rushing_touchdowns", "rushing_touchdowns"),
+    ("rushing_average", "rushing_yards_per_rush_attempt"), # Doc says rushing_average, JSON usually has rushing_yards_per_rush_attempt
+    ("rushing_first_downs", "misc_first_downs_rushing"),
+    ("rushing_first_down_pct", "rushing_first_down_pct"),
+    ("rushing_20_plus_yards", "rushing_20_plus_yards"),
+    ("rushing_40_plus_yards", "rushing_40_plus_yards"),
+    ("rushing_fumbles", "rushing_fumbles"),
+    ("rushing_fumbles_lost", "rushing_fumbles_lost"),
+    ("rushing_long", "rushing_long"),
+
+    # Receiving
+    ("receiving_receptions", "receiving_receptions"),
+    ("receiving_yards", "receiving_yards"),
+    ("receiving_touchdowns", "receiving_touchdowns"),
+    ("receiving_targets", "receiving_targets"),
+    ("receiving_average", "receiving_yards_per_reception"),
+    ("receiving_first_downs", "receiving_first_downs"),
+    ("receiving_yards_per_game", "receiving_yards_per_game"),
+    ("receiving_fumbles", "receiving_fumbles"),
+    ("receiving_fumbles_lost", "receiving_fumbles_lost"),
+    ("receiving_long", "receiving_long"),
+
+    # Efficiency & Misc
+    ("misc_first_downs", "misc_first_downs"),
+    ("misc_first_downs_passing", "misc_first_downs_passing"),
+    ("misc_first_downs_rushing", "misc_first_downs_rushing"),
+    ("misc_first_downs_penalty", "misc_first_downs_penalty"),
+    ("third_down_conv_pct", "misc_third_down_conv_pct"),
+    ("misc_third_down_convs", "misc_third_down_convs"),
+    ("misc_third_down_attempts", "misc_third_down_attempts"),
+
+    ("misc_fourth_down_convs", "misc_fourth_down_convs"),
+    ("misc_fourth_down_attempts", "misc_fourth_down_attempts"),
+    ("red_zone_efficiency", "misc_red_zone_efficiency"), # Not in Step 118 sample?
+    ("goal_to_go_efficiency", "misc_goal_to_go_efficiency"), # Not in Step 118 sample?
+    ("misc_total_penalties", "misc_total_penalties"),
+    ("misc_total_penalty_yards", "misc_total_penalty_yards"),
+    ("misc_total_takeaways", "misc_total_takeaways"),
+    ("misc_total_giveaways", "misc_total_giveaways"),
+
+    # Special Teams
+    ("kicking_field_goals_made", "kicking_field_goals_made"),
+    ("kicking_field_goals_attempted", "kicking_field_goal_attempts"),
+    ("kicking_pct", "kicking_field_goal_pct"),
+    ("punting_punts", "punting_punts"),
+    ("punting_yards", "punting_punt_yards"),
+    ("punting_average", "punting_gross_avg_punt_yards"),
+    ("punting_net_average", "punting_net_avg_punt_yards"),
+    ("punts_inside_20", "punting_punts_inside_20"),
+    ("kick_returns", "returning_kick_returns"),
+    ("kick_return_yards", "returning_kick_return_yards"),
+    ("kick_return_average", "returning_yards_per_kick_return"),
+    ("kick_return_touchdowns", "returning_kick_return_touchdowns"),
+    ("punt_returns", "returning_punt_returns"),
+    ("punt_return_yards", "returning_punt_return_yards"),
+    ("punt_return_average", "returning_yards_per_punt_return"),
+    ("punt_return_touchdowns", "returning_punt_return_touchdowns"),
+    ("returning_long_kick_return", "returning_long_kick_return"),
+    ("returning_long_punt_return", "returning_long_punt_return"),
+    ("returning_punt_return_fair_catches", "returning_punt_return_fair_catches"),
+    ("kicking_long_field_goal_made", "kicking_long_field_goal_made"),
+    ("kicking_field_goals_made_1_19", "kicking_field_goals_made_1_19"),
+    ("kicking_field_goals_made_20_29", "kicking_field_goals_made_20_29"),
+    ("kicking_field_goals_made_30_39", "kicking_field_goals_made_30_39"),
+    ("kicking_field_goals_made_40_49", "kicking_field_goals_made_40_49"),
+    ("kicking_field_goals_made_50", "kicking_field_goals_made_50"),
+    ("kicking_field_goal_attempts_1_19", "kicking_field_goal_attempts_1_19"),
+    ("kicking_field_goal_attempts_20_29", "kicking_field_goal_attempts_20_29"),
+    ("kicking_field_goal_attempts_30_39", "kicking_field_goal_attempts_30_39"),
+    ("kicking_field_goal_attempts_40_49", "kicking_field_goal_attempts_40_49"),
+    ("kicking_field_goal_attempts_50", "kicking_field_goal_attempts_50"),
+    ("kicking_extra_points_made", "kicking_extra_points_made"),
+    ("kicking_extra_point_attempts", "kicking_extra_point_attempts"),
+    ("kicking_extra_point_pct", "kicking_extra_point_pct"),
+    ("punting_long_punt", "punting_long_punt"),
+    ("punting_punts_blocked", "punting_punts_blocked"),
+    ("punting_touchbacks", "punting_touchbacks"),
+    ("punting_fair_catches", "punting_fair_catches"),
+    ("punting_punt_returns", "punting_punt_returns"),
+    ("punting_punt_return_yards", "punting_punt_return_yards"),
+    ("punting_avg_punt_return_yards", "punting_avg_punt_return_yards"),
+
+    # Defense & Turnovers
+    ("defensive_interceptions", "defensive_interceptions"),
+    ("fumbles_forced", "defensive_fumbles_forced"), # Check if exists
+    ("fumbles_recovered", "fumbles_recovered"), # Or opp_fumbles_lost? Main team fumbles recovered usually means defensive recovery?
+    # Wait, "fumbles_recovered": 4 in step 118 sample (for Lions).
+    # "opp_fumbles_recovered": 2.
+    # "misc_total_takeaways": 11.
+
+    ("turnovers", "misc_total_giveaways"),
+    ("turnover_differential", "misc_turnover_differential"),
+    ("fumbles_lost", "fumbles_lost"),
+
+    # Possession
+    ("possession_time", "possession_time"), # Often in Game stats, not always Season stats.
+    # Step 118 sample DOES NOT show possession time in season stats.
+    ("possession_time_seconds", "possession_time_seconds"),
+
+    # Opponent block
+    ("opp_games_played", "opp_games_played"),
+    ("opp_fumbles_recovered", "opp_fumbles_recovered"),
+    ("opp_fumbles_lost", "opp_fumbles_lost"),
+    ("opp_total_offensive_yards", "opp_total_offensive_yards"),
+    ("opp_total_offensive_yards_per_game", "opp_total_offensive_yards_per_game"),
+    ("opp_net_passing_yards", "opp_net_passing_yards"),
+    ("opp_net_passing_yards_per_game", "opp_net_passing_yards_per_game"),
+    ("opp_total_points", "opp_total_points"),
+    ("opp_total_points_per_game", "opp_total_points_per_game"),
+    ("opp_passing_completions", "opp_passing_completions"),
+    ("opp_passing_yards", "opp_passing_yards"),
+    ("opp_passing_yards_per_game", "opp_passing_yards_per_game"),
+    ("opp_passing_attempts", "opp_passing_attempts"),
+    ("opp_passing_completion_pct", "opp_passing_completion_pct"),
+    ("opp_net_total_offensive_yards", "opp_net_total_offensive_yards"),
+    ("opp_net_total_offensive_yards_per_game", "opp_net_total_offensive_yards_per_game"),
+    ("opp_net_yards_per_pass_attempt", "opp_net_yards_per_pass_attempt"),
+    ("opp_yards_per_pass_attempt", "opp_yards_per_pass_attempt"),
+    ("opp_passing_long", "opp_passing_long"),
+    ("opp_passing_touchdowns", "opp_passing_touchdowns"),
+    ("opp_passing_interceptions", "opp_passing_interceptions"),
+    ("opp_passing_sacks", "opp_passing_sacks"),
+    ("opp_passing_sack_yards_lost", "opp_passing_sack_yards_lost"),
+    ("opp_passing_qb_rating", "opp_passing_qb_rating"),
+    ("opp_rushing_yards", "opp_rushing_yards"),
+    ("opp_rushing_yards_per_game", "opp_rushing_yards_per_game"),
+    ("opp_rushing_attempts", "opp_rushing_attempts"),
+    ("opp_rushing_yards_per_rush_attempt", "opp_rushing_yards_per_rush_attempt"),
+    ("opp_rushing_long", "opp_rushing_long"),
+    ("opp_rushing_touchdowns", "opp_rushing_touchdowns"),
+    ("opp_rushing_fumbles", "opp_rushing_fumbles"),
+    ("opp_rushing_fumbles_lost", "opp_rushing_fumbles_lost"),
+    ("opp_receiving_receptions", "opp_receiving_receptions"),
+    ("opp_receiving_yards", "opp_receiving_yards"),
+    ("opp_receiving_yards_per_reception", "opp_receiving_yards_per_reception"),
+    ("opp_receiving_long", "opp_receiving_long"),
+    ("opp_receiving_touchdowns", "opp_receiving_touchdowns"),
+    ("opp_receiving_fumbles", "opp_receiving_fumbles"),
+    ("opp_receiving_fumbles_lost", "opp_receiving_fumbles_lost"),
+    ("opp_receiving_yards_per_game", "opp_receiving_yards_per_game"),
+    ("opp_misc_first_downs", "opp_misc_first_downs"),
+    ("opp_misc_first_downs_rushing", "opp_misc_first_downs_rushing"),
+    ("opp_misc_first_downs_passing", "opp_misc_first_downs_passing"),
+    ("opp_misc_first_downs_penalty", "opp_misc_first_downs_penalty"),
+    ("opp_misc_third_down_convs", "opp_misc_third_down_convs"),
+    ("opp_misc_third_down_attempts", "opp_misc_third_down_attempts"),
+    ("opp_misc_third_down_conv_pct", "opp_misc_third_down_conv_pct"),
+    ("opp_misc_fourth_down_convs", "opp_misc_fourth_down_convs"),
+    ("opp_misc_fourth_down_attempts", "opp_misc_fourth_down_attempts"),
+    ("opp_misc_fourth_down_conv_pct", "opp_misc_fourth_down_conv_pct"),
+    ("opp_misc_total_penalties", "opp_misc_total_penalties"),
+    ("opp_misc_total_penalty_yards", "opp_misc_total_penalty_yards"),
+    ("opp_misc_turnover_differential", "opp_misc_turnover_differential"),
+    ("opp_misc_total_takeaways", "opp_misc_total_takeaways"),
+    ("opp_misc_total_giveaways", "opp_misc_total_giveaways"),
+    ("opp_returning_kick_returns", "opp_returning_kick_returns"),
+    ("opp_returning_kick_return_yards", "opp_returning_kick_return_yards"),
+    ("opp_returning_yards_per_kick_return", "opp_returning_yards_per_kick_return"),
+    ("opp_returning_long_kick_return", "opp_returning_long_kick_return"),
+    ("opp_returning_kick_return_touchdowns", "opp_returning_kick_return_touchdowns"),
+    ("opp_returning_punt_returns", "opp_returning_punt_returns"),
+    ("opp_returning_punt_return_yards", "opp_returning_punt_return_yards"),
+    ("opp_returning_yards_per_punt_return", "opp_returning_yards_per_punt_return"),
+    ("opp_returning_long_punt_return", "opp_returning_long_punt_return"),
+    ("opp_returning_punt_return_touchdowns", "opp_returning_punt_return_touchdowns"),
+    ("opp_returning_punt_return_fair_catches", "opp_returning_punt_return_fair_catches"),
+    ("opp_kicking_field_goals_made", "opp_kicking_field_goals_made"),
+    ("opp_kicking_field_goal_attempts", "opp_kicking_field_goal_attempts"),
+    ("opp_kicking_field_goal_pct", "opp_kicking_field_goal_pct"),
+    ("opp_kicking_long_field_goal_made", "opp_kicking_long_field_goal_made"),
+    ("opp_kicking_field_goals_made_1_19", "opp_kicking_field_goals_made_1_19"),
+    ("opp_kicking_field_goals_made_20_29", "opp_kicking_field_goals_made_20_29"),
+    ("opp_kicking_field_goals_made_30_39", "opp_kicking_field_goals_made_30_39"),
+    ("opp_kicking_field_goals_made_40_49", "opp_kicking_field_goals_made_40_49"),
+    ("opp_kicking_field_goals_made_50", "opp_kicking_field_goals_made_50"),
+    ("opp_kicking_field_goal_attempts_1_19", "opp_kicking_field_goal_attempts_1_19"),
+    ("opp_kicking_field_goal_attempts_20_29", "opp_kicking_field_goal_attempts_20_29"),
+    ("opp_kicking_field_goal_attempts_30_39", "opp_kicking_field_goal_attempts_30_39"),
+    ("opp_kicking_field_goal_attempts_40_49", "opp_kicking_field_goal_attempts_40_49"),
+    ("opp_kicking_field_goal_attempts_50", "opp_kicking_field_goal_attempts_50"),
+    ("opp_kicking_extra_points_made", "opp_kicking_extra_points_made"),
+    ("opp_kicking_extra_point_attempts", "opp_kicking_extra_point_attempts"),
+    ("opp_kicking_extra_point_pct", "opp_kicking_extra_point_pct"),
+    ("opp_punting_punts", "opp_punting_punts"),
+    ("opp_punting_punt_yards", "opp_punting_punt_yards"),
+    ("opp_punting_long_punt", "opp_punting_long_punt"),
+    ("opp_punting_gross_avg_punt_yards", "opp_punting_gross_avg_punt_yards"),
+    ("opp_punting_net_avg_punt_yards", "opp_punting_net_avg_punt_yards"),
+    ("opp_punting_punts_blocked", "opp_punting_punts_blocked"),
+    ("opp_punting_punts_inside_20", "opp_punting_punts_inside_20"),
+    ("opp_punting_touchbacks", "opp_punting_touchbacks"),
+    ("opp_punting_fair_catches", "opp_punting_fair_catches"),
+    ("opp_punting_punt_returns", "opp_punting_punt_returns"),
+    ("opp_punting_punt_return_yards", "opp_punting_punt_return_yards"),
+    ("opp_punting_avg_punt_return_yards", "opp_punting_avg_punt_return_yards"),
+    ("opp_defensive_interceptions", "opp_defensive_interceptions"),
+)
+
+
+def _compile_projector(keymap: tuple[tuple[str, str], ...], name: str) -> Callable[[Callable[[str], Any]], dict[str, Any]]:
+    """
+    Generate ``def name(get): return {dest: get(src), ...}`` from a key map,
+    unrolled into one dict display so there is no per-field loop at runtime.
+    """
+    items = ", ".join(f"{dest!r}: get({src!r})" for dest, src in keymap)
+    ns: dict[str, Any] = {}
+    exec(compile(f"def {name}(get):\n    return {{{items}}}\n", f"<{name}>", "exec"), ns)
+    return ns[name]
 
 
-def map_injury(inj: dict[str, Any]) -> dict[str, Any]:
-    """Map injury to match existing nfl_injuries table schema."""
-    player = inj.get("player") if isinstance(inj.get("player"), dict) else {}
-    return {
-        "player_id": player.get("id"),
-        "status": inj.get("status"),
-        "comment": inj.get("comment"),
-        "date": inj.get("date"),
-        "updated_at": _now_iso(),
-    }
+_project_team_stats = _compile_projector(_TEAM_STAT_KEYMAP, "_project_team_stats")
 
 
-def map_standing(s: dict[str, Any]) -> dict[str, Any]:
-    team = s.get("team") if isinstance(s.get("team"), dict) else {}
-    return {
-        "team_id": team.get("id"),
-        "season": s.get("season"),
-        "wins": s.get("wins"),
-        "losses": s.get("losses"),
-        "ties": s.get("ties"),
-        "points_for": s.get("points_for"),
-        "points_against": s.get("points_against"),
-        "point_differential": s.get("point_differential"),
-        "playoff_seed": s.get("playoff_seed"),
-        "overall_record": s.get("overall_record"),
-        "conference_record": s.get("conference_record"),
-        "division_record": s.get("division_record"),
-        "home_record": s.get("home_record"),
-        "road_record": s.get("road_record"),
-        "win_streak": s.get("win_streak"),
-        "updated_at": _now_iso(),
-    }
-
-
-def map_team_season_stat(s: dict[str, Any], season_override: int) -> dict[str, Any]:
+def map_team_season_stat(s: dict[str, Any], season_override: int, *, now: Optional[str] = None) -> dict[str, Any]:
     """Map team stats to match Exhaustive Master Schema."""
-    team = s.get("team") if isinstance(s.get("team"), dict) else {}
-    season_type = s.get("season_type")
+    s_get = s.get
+    team = s_get("team") if isinstance(s_get("team"), dict) else {}
+    season_type = s_get("season_type")
     # Derived from season_type: 2=Reg, 3=Post
     postseason = season_type == 3 if season_type is not None else False
 
     # Use override if missing in API response
-    final_season = s.get("season")
+    final_season = s_get("season")
     if final_season is None:
         final_season = season_override
 
-    return {
-        # Identity
-        "team_id": team.get("id"),
-        "season": final_season,
-        "season_type": season_type,
-        "postseason": postseason,
-        "games_played": s.get("games_played"),
-        "stats_json": s,
-
-        # Scoring & Totals
-        "total_points": s.get("total_points"),
-        "total_points_per_game": s.get("total_points_per_game"),
-        "total_offensive_yards": s.get("total_offensive_yards"),
-        "total_offensive_yards_per_game": s.get("total_offensive_yards_per_game"),
-        "net_total_offensive_yards": s.get("net_total_offensive_yards"),
-        "net_total_offensive_yards_per_game": s.get("net_total_offensive_yards_per_game"),
-
-        # Passing
-        "passing_attempts": s.get("passing_attempts"),
-        "passing_completions": s.get("passing_completions"),
-        "passing_completion_pct": s.get("passing_completion_pct"),
-        "passing_yards": s.get("passing_yards"),
-        "passing_yards_per_game": s.get("passing_yards_per_game"),
-        "passing_touchdowns": s.get("passing_touchdowns"),
-        "passing_interceptions": s.get("passing_interceptions"),
-        "net_passing_yards": s.get("net_passing_yards"),
-        "net_passing_yards_per_game": s.get("net_passing_yards_per_game"),
-        "yards_per_pass_attempt": s.get("yards_per_pass_attempt"),
-        "net_yards_per_pass_attempt": s.get("net_yards_per_pass_attempt"),
-        "passing_first_downs": s.get("misc_first_downs_passing"),
-        "passing_first_down_pct": s.get("passing_first_down_pct"),
-        "passing_20_plus_yards": s.get("passing_20_plus_yards"),
-        "passing_40_plus_yards": s.get("passing_40_plus_yards"),
-        "passing_sacks": s.get("passing_sacks"),
-        "passing_sack_yards": s.get("passing_sack_yards_lost"), # Note field mismatch in json sample vs doc name? Doc says passing_sack_yards, JSON usually passing_sack_yards_lost. Using API key from sample.
-        "qb_rating": s.get("passing_qb_rating"),
-        "passing_long": s.get("passing_long"),
-
-        # Rushing
-        "rushing_attempts": s.get("rushing_attempts"),
-        "rushing_yards": s.get("rushing_yards"),
-        "rushing_yards_per_game": s.get("rushing_yards_per_game"),
-        "rushing_touchdowns": s.get("rushing_touchdowns"),
-        "rushing_average": s.get("rushing_yards_per_rush_attempt"), # Doc says rushing_average, JSON usually has rushing_yards_per_rush_attempt
-        "rushing_first_downs": s.get("misc_first_downs_rushing"),
-        "rushing_first_down_pct": s.get("rushing_first_down_pct"),
-        "rushing_20_plus_yards": s.get("rushing_20_plus_yards"),
-        "rushing_40_plus_yards": s.get("rushing_40_plus_yards"),
-        "rushing_fumbles": s.get("rushing_fumbles"),
-        "rushing_fumbles_lost": s.get("rushing_fumbles_lost"),
-        "rushing_long": s.get("rushing_long"),
-
-        # Receiving
-        "receiving_receptions": s.get("receiving_receptions"),
-        "receiving_yards": s.get("receiving_yards"),
-        "receiving_touchdowns": s.get("receiving_touchdowns"),
-        "receiving_targets": s.get("receiving_targets"),
-        "receiving_average": s.get("receiving_yards_per_reception"),
-        "receiving_first_downs": s.get("receiving_first_downs"),
-        "receiving_yards_per_game": s.get("receiving_yards_per_game"),
-        "receiving_fumbles": s.get("receiving_fumbles"),
-        "receiving_fumbles_lost": s.get("receiving_fumbles_lost"),
-        "receiving_long": s.get("receiving_long"),
-
-        # Efficiency & Misc
-        "misc_first_downs": s.get("misc_first_downs"),
-        "misc_first_downs_passing": s.get("misc_first_downs_passing"),
-        "misc_first_downs_rushing": s.get("misc_first_downs_rushing"),
-        "misc_first_downs_penalty": s.get("misc_first_downs_penalty"),
-        "third_down_efficiency": (
-            f"{s.get('misc_third_down_convs')}-{s.get('misc_third_down_attempts')}"
-            if s.get("misc_third_down_convs") is not None and s.get("misc_third_down_attempts") is not None
-            else None
-        ),
-        "third_down_conv_pct": s.get("misc_third_down_conv_pct"),
-        "misc_third_down_convs": s.get("misc_third_down_convs"),
-        "misc_third_down_attempts": s.get("misc_third_down_attempts"),
-        # "misc_third_down_convs": 32, "misc_third_down_attempts": 85
-        
-        "fourth_down_efficiency": (
-            f"{s.get('misc_fourth_down_convs')}-{s.get('misc_fourth_down_attempts')}"
-            if s.get("misc_fourth_down_convs") is not None and s.get("misc_fourth_down_attempts") is not None
-            else None
-        ),
-        "misc_fourth_down_convs": s.get("misc_fourth_down_convs"),
-        "misc_fourth_down_attempts": s.get("misc_fourth_down_attempts"),
-        "red_zone_efficiency": s.get("misc_red_zone_efficiency"), # Not in Step 118 sample?
-        "goal_to_go_efficiency": s.get("misc_goal_to_go_efficiency"), # Not in Step 118 sample?
-        "misc_total_penalties": s.get("misc_total_penalties"),
-        "misc_total_penalty_yards": s.get("misc_total_penalty_yards"),
-        "misc_total_takeaways": s.get("misc_total_takeaways"),
-        "misc_total_giveaways": s.get("misc_total_giveaways"),
-        
-        # Special Teams
-        "kicking_field_goals_made": s.get("kicking_field_goals_made"),
-        "kicking_field_goals_attempted": s.get("kicking_field_goal_attempts"),
-        "kicking_pct": s.get("kicking_field_goal_pct"),
-        "punting_punts": s.get("punting_punts"),
-        "punting_yards": s.get("punting_punt_yards"),
-        "punting_average": s.get("punting_gross_avg_punt_yards"),
-        "punting_net_average": s.get("punting_net_avg_punt_yards"),
-        "punts_inside_20": s.get("punting_punts_inside_20"),
-        "kick_returns": s.get("returning_kick_returns"),
-        "kick_return_yards": s.get("returning_kick_return_yards"),
-        "kick_return_average": s.get("returning_yards_per_kick_return"),
-        "kick_return_touchdowns": s.get("returning_kick_return_touchdowns"),
-        "punt_returns": s.get("returning_punt_returns"),
-        "punt_return_yards": s.get("returning_punt_return_yards"),
-        "punt_return_average": s.get("returning_yards_per_punt_return"),
-        "punt_return_touchdowns": s.get("returning_punt_return_touchdowns"),
-        "returning_long_kick_return": s.get("returning_long_kick_return"),
-        "returning_long_punt_return": s.get("returning_long_punt_return"),
-        "returning_punt_return_fair_catches": s.get("returning_punt_return_fair_catches"),
-        "kicking_long_field_goal_made": s.get("kicking_long_field_goal_made"),
-        "kicking_field_goals_made_1_19": s.get("kicking_field_goals_made_1_19"),
-        "kicking_field_goals_made_20_29": s.get("kicking_field_goals_made_20_29"),
-        "kicking_field_goals_made_30_39": s.get("kicking_field_goals_made_30_39"),
-        "kicking_field_goals_made_40_49": s.get("kicking_field_goals_made_40_49"),
-        "kicking_field_goals_made_50": s.get("kicking_field_goals_made_50"),
-        "kicking_field_goal_attempts_1_19": s.get("kicking_field_goal_attempts_1_19"),
-        "kicking_field_goal_attempts_20_29": s.get("kicking_field_goal_attempts_20_29"),
-        "kicking_field_goal_attempts_30_39": s.get("kicking_field_goal_attempts_30_39"),
-        "kicking_field_goal_attempts_40_49": s.get("kicking_field_goal_attempts_40_49"),
-        "kicking_field_goal_attempts_50": s.get("kicking_field_goal_attempts_50"),
-        "kicking_extra_points_made": s.get("kicking_extra_points_made"),
-        "kicking_extra_point_attempts": s.get("kicking_extra_point_attempts"),
-        "kicking_extra_point_pct": s.get("kicking_extra_point_pct"),
-        "punting_long_punt": s.get("punting_long_punt"),
-        "punting_punts_blocked": s.get("punting_punts_blocked"),
-        "punting_touchbacks": s.get("punting_touchbacks"),
-        "punting_fair_catches": s.get("punting_fair_catches"),
-        "punting_punt_returns": s.get("punting_punt_returns"),
-        "punting_punt_return_yards": s.get("punting_punt_return_yards"),
-        "punting_avg_punt_return_yards": s.get("punting_avg_punt_return_yards"),
-
-        # Defense & Turnovers
-        "defensive_interceptions": s.get("defensive_interceptions"),
-        "fumbles_forced": s.get("defensive_fumbles_forced"), # Check if exists
-        "fumbles_recovered": s.get("fumbles_recovered"), # Or opp_fumbles_lost? Main team fumbles recovered usually means defensive recovery? 
-        # Wait, "fumbles_recovered": 4 in step 118 sample (for Lions). 
-        # "opp_fumbles_recovered": 2.
-        # "misc_total_takeaways": 11.
-        
-        "turnovers": s.get("misc_total_giveaways"), 
-        "turnover_differential": s.get("misc_turnover_differential"),
-        "fumbles_lost": s.get("fumbles_lost"),
-
-        # Possession
-        "possession_time": s.get("possession_time"), # Often in Game stats, not always Season stats. 
-        # Step 118 sample DOES NOT show possession time in season stats.
-        "possession_time_seconds": s.get("possession_time_seconds"), 
-
-        # Opponent block
-        "opp_games_played": s.get("opp_games_played"),
-        "opp_fumbles_recovered": s.get("opp_fumbles_recovered"),
-        "opp_fumbles_lost": s.get("opp_fumbles_lost"),
-        "opp_total_offensive_yards": s.get("opp_total_offensive_yards"),
-        "opp_total_offensive_yards_per_game": s.get("opp_total_offensive_yards_per_game"),
-        "opp_net_passing_yards": s.get("opp_net_passing_yards"),
-        "opp_net_passing_yards_per_game": s.get("opp_net_passing_yards_per_game"),
-        "opp_total_points": s.get("opp_total_points"),
-        "opp_total_points_per_game": s.get("opp_total_points_per_game"),
-        "opp_passing_completions": s.get("opp_passing_completions"),
-        "opp_passing_yards": s.get("opp_passing_yards"),
-        "opp_passing_yards_per_game": s.get("opp_passing_yards_per_game"),
-        "opp_passing_attempts": s.get("opp_passing_attempts"),
-        "opp_passing_completion_pct": s.get("opp_passing_completion_pct"),
-        "opp_net_total_offensive_yards": s.get("opp_net_total_offensive_yards"),
-        "opp_net_total_offensive_yards_per_game": s.get("opp_net_total_offensive_yards_per_game"),
-        "opp_net_yards_per_pass_attempt": s.get("opp_net_yards_per_pass_attempt"),
-        "opp_yards_per_pass_attempt": s.get("opp_yards_per_pass_attempt"),
-        "opp_passing_long": s.get("opp_passing_long"),
-        "opp_passing_touchdowns": s.get("opp_passing_touchdowns"),
-        "opp_passing_interceptions": s.get("opp_passing_interceptions"),
-        "opp_passing_sacks": s.get("opp_passing_sacks"),
-        "opp_passing_sack_yards_lost": s.get("opp_passing_sack_yards_lost"),
-        "opp_passing_qb_rating": s.get("opp_passing_qb_rating"),
-        "opp_rushing_yards": s.get("opp_rushing_yards"),
-        "opp_rushing_yards_per_game": s.get("opp_rushing_yards_per_game"),
-        "opp_rushing_attempts": s.get("opp_rushing_attempts"),
-        "opp_rushing_yards_per_rush_attempt": s.get("opp_rushing_yards_per_rush_attempt"),
-        "opp_rushing_long": s.get("opp_rushing_long"),
-        "opp_rushing_touchdowns": s.get("opp_rushing_touchdowns"),
-        "opp_rushing_fumbles": s.get("opp_rushing_fumbles"),
-        "opp_rushing_fumbles_lost": s.get("opp_rushing_fumbles_lost"),
-        "opp_receiving_receptions": s.get("opp_receiving_receptions"),
-        "opp_receiving_yards": s.get("opp_receiving_yards"),
-        "opp_receiving_yards_per_reception": s.get("opp_receiving_yards_per_reception"),
-        "opp_receiving_long": s.get("opp_receiving_long"),
-        "opp_receiving_touchdowns": s.get("opp_receiving_touchdowns"),
-        "opp_receiving_fumbles": s.get("opp_receiving_fumbles"),
-        "opp_receiving_fumbles_lost": s.get("opp_receiving_fumbles_lost"),
-        "opp_receiving_yards_per_game": s.get("opp_receiving_yards_per_game"),
-        "opp_misc_first_downs": s.get("opp_misc_first_downs"),
-        "opp_misc_first_downs_rushing": s.get("opp_misc_first_downs_rushing"),
-        "opp_misc_first_downs_passing": s.get("opp_misc_first_downs_passing"),
-        "opp_misc_first_downs_penalty": s.get("opp_misc_first_downs_penalty"),
-        "opp_misc_third_down_convs": s.get("opp_misc_third_down_convs"),
-        "opp_misc_third_down_attempts": s.get("opp_misc_third_down_attempts"),
-        "opp_misc_third_down_conv_pct": s.get("opp_misc_third_down_conv_pct"),
-        "opp_misc_fourth_down_convs": s.get("opp_misc_fourth_down_convs"),
-        "opp_misc_fourth_down_attempts": s.get("opp_misc_fourth_down_attempts"),
-        "opp_misc_fourth_down_conv_pct": s.get("opp_misc_fourth_down_conv_pct"),
-        "opp_misc_total_penalties": s.get("opp_misc_total_penalties"),
-        "opp_misc_total_penalty_yards": s.get("opp_misc_total_penalty_yards"),
-        "opp_misc_turnover_differential": s.get("opp_misc_turnover_differential"),
-        "opp_misc_total_takeaways": s.get("opp_misc_total_takeaways"),
-        "opp_misc_total_giveaways": s.get("opp_misc_total_giveaways"),
-        "opp_returning_kick_returns": s.get("opp_returning_kick_returns"),
-        "opp_returning_kick_return_yards": s.get("opp_returning_kick_return_yards"),
-        "opp_returning_yards_per_kick_return": s.get("opp_returning_yards_per_kick_return"),
-        "opp_returning_long_kick_return": s.get("opp_returning_long_kick_return"),
-        "opp_returning_kick_return_touchdowns": s.get("opp_returning_kick_return_touchdowns"),
-        "opp_returning_punt_returns": s.get("opp_returning_punt_returns"),
-        "opp_returning_punt_return_yards": s.get("opp_returning_punt_return_yards"),
-        "opp_returning_yards_per_punt_return": s.get("opp_returning_yards_per_punt_return"),
-        "opp_returning_long_punt_return": s.get("opp_returning_long_punt_return"),
-        "opp_returning_punt_return_touchdowns": s.get("opp_returning_punt_return_touchdowns"),
-        "opp_returning_punt_return_fair_catches": s.get("opp_returning_punt_return_fair_catches"),
-        "opp_kicking_field_goals_made": s.get("opp_kicking_field_goals_made"),
-        "opp_kicking_field_goal_attempts": s.get("opp_kicking_field_goal_attempts"),
-        "opp_kicking_field_goal_pct": s.get("opp_kicking_field_goal_pct"),
-        "opp_kicking_long_field_goal_made": s.get("opp_kicking_long_field_goal_made"),
-        "opp_kicking_field_goals_made_1_19": s.get("opp_kicking_field_goals_made_1_19"),
-        "opp_kicking_field_goals_made_20_29": s.get("opp_kicking_field_goals_made_20_29"),
-        "opp_kicking_field_goals_made_30_39": s.get("opp_kicking_field_goals_made_30_39"),
-        "opp_kicking_field_goals_made_40_49": s.get("opp_kicking_field_goals_made_40_49"),
-        "opp_kicking_field_goals_made_50": s.get("opp_kicking_field_goals_made_50"),
-        "opp_kicking_field_goal_attempts_1_19": s.get("opp_kicking_field_goal_attempts_1_19"),
-        "opp_kicking_field_goal_attempts_20_29": s.get("opp_kicking_field_goal_attempts_20_29"),
-        "opp_kicking_field_goal_attempts_30_39": s.get("opp_kicking_field_goal_attempts_30_39"),
-        "opp_kicking_field_goal_attempts_40_49": s.get("opp_kicking_field_goal_attempts_40_49"),
-        "opp_kicking_field_goal_attempts_50": s.get("opp_kicking_field_goal_attempts_50"),
-        "opp_kicking_extra_points_made": s.get("opp_kicking_extra_points_made"),
-        "opp_kicking_extra_point_attempts": s.get("opp_kicking_extra_point_attempts"),
-        "opp_kicking_extra_point_pct": s.get("opp_kicking_extra_point_pct"),
-        "opp_punting_punts": s.get("opp_punting_punts"),
-        "opp_punting_punt_yards": s.get("opp_punting_punt_yards"),
-        "opp_punting_long_punt": s.get("opp_punting_long_punt"),
-        "opp_punting_gross_avg_punt_yards": s.get("opp_punting_gross_avg_punt_yards"),
-        "opp_punting_net_avg_punt_yards": s.get("opp_punting_net_avg_punt_yards"),
-        "opp_punting_punts_blocked": s.get("opp_punting_punts_blocked"),
-        "opp_punting_punts_inside_20": s.get("opp_punting_punts_inside_20"),
-        "opp_punting_touchbacks": s.get("opp_punting_touchbacks"),
-        "opp_punting_fair_catches": s.get("opp_punting_fair_catches"),
-        "opp_punting_punt_returns": s.get("opp_punting_punt_returns"),
-        "opp_punting_punt_return_yards": s.get("opp_punting_punt_return_yards"),
-        "opp_punting_avg_punt_return_yards": s.get("opp_punting_avg_punt_return_yards"),
-        "opp_defensive_interceptions": s.get("opp_defensive_interceptions"),
-
-        "updated_at": _now_iso(),
-    }
-
-
-def map_player_prop(p: dict[str, Any]) -> dict[str, Any]:
-    market = p.get("market", {})
-    market_type = market.get("type", "")
-    return {
-        "id": str(p.get("id")), # Converted to String as per Postgres Schema change
-        "game_id": p.get("game_id"),
-        "player_id": p.get("player_id"),
-        "vendor": p.get("vendor"),
-        "prop_type": p.get("prop_type"),
-        "market_type": market_type,
-        "line_value": p.get("line_value"),
-        "over_odds": market.get("over_odds"),
-        "under_odds": market.get("under_odds"),
-        "milestone_odds": market.get("odds"), 
-        "updated_at": _now_iso(),
-    }
-
-
-def ingest_injuries(
-    *,
-    supabase: SupabaseClient,
-    bdl: BallDontLieNFLClient,
-    team_ids: Optional[list[int]] = None,
-    batch_size: int = 500,
-) -> int:
-    """Ingest current injury reports from BallDontLie."""
-    logger.info("Fetching current injury reports from BallDontLie...")
-    all_rows = []
-    for inj in bdl.iter_injuries(team_ids=team_ids):
-        row = map_injury(inj)
-        if row.get("player_id"):
-            all_rows.append(row)
-            
-    logger.info("Fetched %d injury records.", len(all_rows))
-    
-    if not team_ids:
-        logger.info("Full sync: Truncating nfl_injuries table...")
-        try:
-            deleted_count = supabase.delete("nfl_injuries", filters={"player_id": "gt.0"})
-            logger.info("Deleted %d stale injury records", deleted_count)
-        except Exception as e:
-            logger.warning("Failed to truncate nfl_injuries: %s. Proceeding with upsert.", e)
-            
-    injuries_upserted = 0
-    for chunk in _chunked(all_rows, batch_size):
-        if chunk:
-            injuries_upserted += supabase.upsert(
-                "nfl_injuries", chunk, on_conflict="player_id,date"
-            )
-    
-    logger.info("Ingested nfl_injuries=%d", injuries_upserted)
-    return injuries_upserted
+    row = _project_team_stats(s_get)
 
+    # Identity
+    row["team_id"] = team.get("id")
+    row["season"] = final_season
+    row["season_type"] = season_type
+    row["postseason"] = postseason
+    # Full payload, same as ingest_betting_and_extras.map_team_season_stats writes;
+    # web/queries_supabase.py reads it as the raw BDL response.
+    row["stats_json"] = s
 
-def ingest_standings(
-    *,
-    seasons: list[int],
-    supabase: SupabaseClient,
-    bdl: BallDontLieNFLClient,
-    batch_size: int = 500,
-) -> int:
-    """Ingest team standings from BallDontLie."""
-    standings_upserted = 0
-    
-    for season in seasons:
-        for chunk in _chunked(
-            (map_standing(s) for s in bdl.iter_standings(season=season)),
-            batch_size,
-        ):
-            valid = [r for r in chunk if r.get("team_id")]
-            if valid:
-                standings_upserted += supabase.upsert(
-                    "nfl_team_standings", valid, on_conflict="team_id,season"
-                )
-    
-    logger.info("Upserted nfl_team_standings=%d", standings_upserted)
-    return standings_upserted
+    # Efficiency strings, e.g. "misc_third_down_convs": 32, "misc_third_down_attempts": 85 -> "32-85"
+    convs, attempts = s_get("misc_third_down_convs"), s_get("misc_third_down_attempts")
+    row["third_down_efficiency"] = f"{convs}-{attempts}" if convs is not None and attempts is not None else None
+    convs, attempts = s_get("misc_fourth_down_convs"), s_get("misc_fourth_down_attempts")
+    row["fourth_down_efficiency"] = f"{convs}-{attempts}" if convs is not None and attempts is not None else None
 
+    row["updated_at"] = now or _now_iso()
+    return row
 
-def ingest_team_season_stats(
-    *,
-    seasons: list[int],
-    supabase: SupabaseClient,
-    bdl: BallDontLieNFLClient,
-    batch_size: int = 500,
-) -> int:
-    """Ingest team season stats from BallDontLie."""
-    stats_upserted = 0
-    
-    for season in seasons:
-        logger.info(f"Fetching team stats for season {season}")
-        for chunk in _chunked(
-            (map_team_season_stat(s) for s in bdl.iter_team_season_stats(season=season)),
-            batch_size,
-        ):
-            # Debug check
-            if chunk and chunk[0].get("season") is None:
-                logger.error(f"CHUNK HAS NULL SEASON: {chunk[0]}")
-            
-            valid = [r for r in chunk if r.get("team_id")]
-            if valid:
-                stats_upserted += supabase.upsert(
-                    "nfl_team_season_stats", valid, on_conflict="team_id,season,season_type"
-                )
-    
-    logger.info("Upserted nfl_team_season_stats=%d", stats_upserted)
-    return stats_upserted
 
-
-def ingest_player_props_filtered(
-    *,
-    game_ids: list[int],
-    supabase: SupabaseClient,
-    bdl: BallDontLieNFLClient,
-    vendors: Optional[list[str]] = None,
-    batch_size: int = 500,
-) -> int:
-    """
-    Ingest player props with filtering.
-    Only ingests over_under markets and anytime_td milestones.
-    """
-    props_upserted = 0
-    filtered_out = 0
-    
-    for game_id in game_ids:
-        try:
-            raw_props = list(bdl.iter_player_props(game_id=game_id, vendors=vendors))
-            
-            # Apply filter
-            filtered = [p for p in raw_props if should_ingest_prop(p)]
-            filtered_out += len(raw_props) - len(filtered)
-            
-            for chunk in _chunked([map_player_prop(p) for p in filtered], batch_size):
-                valid = [r for r in chunk if r.get("player_id") and r.get("game_id")]
-                if valid:
-                    props_upserted += supabase.upsert(
-                        "nfl_player_props", valid, on_conflict="id"
-                    )
-        except BallDontLieError as e:
-            logger.warning("Skipping props for game_id=%s: %s", game_id, e)
-    
-    logger.info(
-        "Upserted nfl_player_props=%d (filtered out %d milestone bloat)",
-        props_upserted,
-        filtered_out,
-    )
-    return props_upserted
-
-
-def map_injury(inj: dict[str, Any]) -> dict[str, Any]:
+def map_injury(inj: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     """Map injury to match existing nfl_injuries table schema."""
     player = inj.get("player") if isinstance(inj.get("player"), dict) else {}
     return {
@@ -994,11 +831,11 @@ def map_injury(inj: dict[str, Any]) -> dict[str, Any]:
         "status": inj.get("status"),
         "comment": inj.get("comment"),
         "date": inj.get("date"),
-        "updated_at": _now_iso(),
+        "updated_at": now or _now_iso(),
     }
 
 
-def map_standing(s: dict[str, Any]) -> dict[str, Any]:
+def map_standing(s: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     team = s.get("team") if isinstance(s.get("team"), dict) else {}
     return {
         "team_id": team.get("id"),
@@ -1016,16 +853,19 @@ def map_standing(s: dict[str, Any]) -> dict[str, Any]:
         "home_record": s.get("home_record"),
         "road_record": s.get("road_record"),
         "win_streak": s.get("win_streak"),
-        "updated_at": _now_iso(),
+        "updated_at": now or _now_iso(),
     }
 
 
-
-
-
-def map_player_prop(p: dict[str, Any]) -> dict[str, Any]:
+def map_player_prop(p: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     market = p.get("market", {})
     market_type = market.get("type", "")
+    if market_type == "over_under":
+        over, under, milestone = market.get("over_odds"), market.get("under_odds"), None
+    elif market_type == "milestone":
+        over, under, milestone = None, None, market.get("odds")
+    else:
+        over = under = milestone = None
     return {
         "id": p.get("id"),
         "game_id": p.get("game_id"),
@@ -1034,10 +874,10 @@ def map_player_prop(p: dict[str, Any]) -> dict[str, Any]:
         "prop_type": p.get("prop_type"),
         "market_type": market_type,
         "line_value": p.get("line_value"),
-        "over_odds": market.get("over_odds") if market_type == "over_under" else None,
-        "under_odds": market.get("under_odds") if market_type == "over_under" else None,
-        "milestone_odds": market.get("odds") if market_type == "milestone" else None,
-        "updated_at": _now_iso(),
+        "over_odds": over,
+        "under_odds": under,
+        "milestone_odds": milestone,
+        "updated_at": now or _now_iso(),
     }
 
 
@@ -1050,44 +890,37 @@ def ingest_injuries(
 ) -> int:
     """Ingest current injury reports from BallDontLie.
     
-    Performs a FULL SYNC:
-    1. Fetches all current injuries from API.
-    2. Deletes ALL existing injuries in DB (if no team filter).
-    3. Inserts valid new records.
-    This ensures cleared injuries are removed from the database.
+    Performs a FULL SYNC (if no team filter):
+    1. Streams all current injuries from the API into upsert batches,
+       stamping every row with this run's updated_at.
+    2. Deletes rows not re-stamped by this run.
+    This ensures cleared injuries are removed from the database, and a failed
+    fetch never leaves the table emptied.
     """
     logger.info("Fetching current injury reports from BallDontLie...")
-    all_rows = []
-    for inj in bdl.iter_injuries(team_ids=team_ids):
-        row = map_injury(inj)
-        if row.get("player_id"):
-            all_rows.append(row)
-            
-    logger.info("Fetched %d injury records.", len(all_rows))
-    
-    # Full sync: Delete existing records before inserting
-    # Only if we are not filtering by team (full ingest)
-    if not team_ids:
-        logger.info("Full sync: Truncating nfl_injuries table...")
-        # Deleting all rows where player_id > 0 (effectively all)
+    now = _now_iso()
+    rows = (
+        row
+        for row in (map_injury(inj, now=now) for inj in bdl.iter_injuries(team_ids=team_ids))
+        if row["player_id"]
+    )
+
+    injuries_upserted = 0
+    for chunk in _chunked(rows, batch_size):
+        injuries_upserted += supabase.upsert(
+            "nfl_injuries", chunk, on_conflict="player_id,date"
+        )
+    logger.info("Ingested nfl_injuries=%d", injuries_upserted)
+
+    # Only prune on a full ingest that actually returned injuries.
+    if not team_ids and injuries_upserted:
+        logger.info("Full sync: Removing injuries cleared since the last run...")
         try:
-            # Fix: Use the new delete method on the client instance
-            deleted_count = supabase.delete("nfl_injuries", filters={"player_id": "gt.0"})
+            deleted_count = supabase.delete("nfl_injuries", filters={"updated_at": f"lt.{now}"})
             logger.info("Deleted %d stale injury records", deleted_count)
         except Exception as e:
-            logger.warning("Failed to truncate nfl_injuries: %s. Proceeding with upsert.", e)
-            # If delete fails, fall back to upsert
-            
-    injuries_upserted = 0
-    # Insert in chunks
-    for chunk in _chunked(all_rows, batch_size):
-        if chunk:
-            # Use upsert just in case delete failed or partial update
-            injuries_upserted += supabase.upsert(
-                "nfl_injuries", chunk, on_conflict="player_id,date"
-            )
-    
-    logger.info("Ingested nfl_injuries=%d", injuries_upserted)
+            logger.warning("Failed to prune stale nfl_injuries: %s", e)
+
     return injuries_upserted
 
 
@@ -1100,17 +933,14 @@ def ingest_standings(
 ) -> int:
     """Ingest team standings from BallDontLie."""
     standings_upserted = 0
-    
+    now = _now_iso()
+
     for season in seasons:
-        for chunk in _chunked(
-            (map_standing(s) for s in bdl.iter_standings(season=season)),
-            batch_size,
-        ):
-            valid = [r for r in chunk if r.get("team_id")]
-            if valid:
-                standings_upserted += supabase.upsert(
-                    "nfl_team_standings", valid, on_conflict="team_id,season"
-                )
+        rows = (map_standing(s, now=now) for s in bdl.iter_standings(season=season))
+        for chunk in _prefetched(_chunked(_rows_with_keys(rows, ("team_id",)), batch_size)):
+            standings_upserted += supabase.upsert(
+                "nfl_team_standings", chunk, on_conflict="team_id,season"
+            )
     
     logger.info("Upserted nfl_team_standings=%d", standings_upserted)
     return standings_upserted
@@ -1122,25 +952,41 @@ def ingest_team_season_stats(
     supabase: SupabaseClient,
     bdl: BallDontLieNFLClient,
     batch_size: int = 500,
+    team_batch: int = 8,
+    max_workers: int = 4,
 ) -> int:
-    """Ingest team season stats from BallDontLie."""
+    """
+    Ingest team season stats from BallDontLie.
+
+    Each season's teams are requested in groups of ``team_batch`` IDs, with
+    the groups fetched concurrently; upserts stay on the calling thread.
+    """
     stats_upserted = 0
     
     # Fetch all team IDs (required by API)
     logger.info("Fetching team IDs for team season stats...")
-    teams = list(bdl.iter_teams())
-    team_ids = [t["id"] for t in teams if t.get("id")]
-    logger.info(f"Found {len(team_ids)} teams")
-    
-    for season in seasons:
-        for chunk in _chunked(
-            (map_team_season_stat(s, season_override=season) for s in bdl.iter_team_season_stats(season=season, team_ids=team_ids)),
-            batch_size,
-        ):
-            valid = [r for r in chunk if r.get("team_id")]
-            if valid:
+    team_ids = list(bdl.team_ids())
+    logger.info("Found %d teams", len(team_ids))
+    team_groups = [team_ids[i : i + team_batch] for i in range(0, len(team_ids), max(1, team_batch))]
+
+    def _fetch_group(season: int, group: list[int]) -> list[dict[str, Any]]:
+        return list(bdl.iter_team_season_stats(season=season, team_ids=group))
+
+    now = _now_iso()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for season in seasons:
+            futures = [pool.submit(_fetch_group, season, group) for group in team_groups]
+            # Last write wins per conflict key, so duplicates from overlapping
+            # pages never reach the ON CONFLICT merge.
+            latest: dict[tuple[Any, ...], dict[str, Any]] = {}
+            for fut in as_completed(futures):
+                for s in fut.result():
+                    row = map_team_season_stat(s, season_override=season, now=now)
+                    if row["team_id"]:
+                        latest[(row["team_id"], row["season"], row["season_type"])] = row
+            for chunk in _chunked(latest.values(), batch_size):
                 stats_upserted += supabase.upsert(
-                    "nfl_team_season_stats", valid, on_conflict="team_id,season,season_type"
+                    "nfl_team_season_stats", chunk, on_conflict="team_id,season,season_type"
                 )
     
     logger.info("Upserted nfl_team_season_stats=%d", stats_upserted)
@@ -1153,32 +999,51 @@ def ingest_player_props_filtered(
     supabase: SupabaseClient,
     bdl: BallDontLieNFLClient,
     vendors: Optional[list[str]] = None,
-    batch_size: int = 500,
+    batch_size: int = 2000,
+    max_workers: int = 8,
 ) -> int:
     """
     Ingest player props with filtering.
     Only ingests over_under markets and anytime_td milestones.
+
+    Games are fetched concurrently (the BDL client's rate limiter is shared);
+    upserts stay on the calling thread.
     """
     props_upserted = 0
     filtered_out = 0
-    
-    for game_id in game_ids:
-        try:
-            raw_props = list(bdl.iter_player_props(game_id=game_id, vendors=vendors))
-            
-            # Apply filter
-            filtered = [p for p in raw_props if should_ingest_prop(p)]
-            filtered_out += len(raw_props) - len(filtered)
-            
-            for chunk in _chunked([map_player_prop(p) for p in filtered], batch_size):
-                valid = [r for r in chunk if r.get("player_id") and r.get("game_id")]
-                if valid:
-                    props_upserted += supabase.upsert(
-                        "nfl_player_props", valid, on_conflict="id"
-                    )
-        except BallDontLieError as e:
-            logger.warning("Skipping props for game_id=%s: %s", game_id, e)
-    
+    now = _now_iso()
+
+    def _fetch_one(game_id: int) -> tuple[list[dict[str, Any]], int]:
+        # Filter and map in one pass over the game's props.
+        rows: list[dict[str, Any]] = []
+        append = rows.append
+        dropped = 0
+        for p in bdl.iter_player_props(game_id=game_id, vendors=vendors):
+            if not should_ingest_prop(p):
+                dropped += 1
+                continue
+            r = map_player_prop(p, now=now)
+            if r["player_id"] and r["game_id"]:
+                append(r)
+        return rows, dropped
+
+    def _completed_rows(futures: dict[Any, int]) -> Iterable[dict[str, Any]]:
+        nonlocal filtered_out
+        for fut in as_completed(futures):
+            try:
+                rows, dropped = fut.result()
+            except BallDontLieError as e:
+                logger.warning("Skipping props for game_id=%s: %s", futures[fut], e)
+                continue
+            filtered_out += dropped
+            yield from rows
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(_fetch_one, game_id): game_id for game_id in game_ids}
+        # Rows from several games share a batch, so small games don't each cost a POST.
+        for chunk in _chunked(_completed_rows(futures), batch_size):
+            props_upserted += supabase.upsert("nfl_player_props", chunk, on_conflict="id")
+
     logger.info(
         "Upserted nfl_player_props=%d (filtered out %d milestone bloat)",
         props_upserted,
@@ -1191,142 +1056,86 @@ def ingest_player_props_filtered(
 # Extra Mappers for Full Coverage
 # -----------------------------------------------------------------------------
 
-def map_team_game_stat(s: dict[str, Any]) -> dict[str, Any]:
+_TEAM_GAME_COLS = (
+    "first_downs", "first_downs_passing", "first_downs_rushing", "first_downs_penalty",
+    "third_down_efficiency", "third_down_conversions", "third_down_attempts",
+    "fourth_down_efficiency", "fourth_down_conversions", "fourth_down_attempts",
+    "total_offensive_plays", "total_yards", "yards_per_play", "total_drives", "net_passing_yards",
+    "passing_completions", "passing_attempts", "yards_per_pass", "sacks", "sack_yards_lost",
+    "rushing_yards", "rushing_attempts", "yards_per_rush_attempt", "red_zone_scores",
+    "red_zone_attempts", "penalties", "penalty_yards", "turnovers", "fumbles_lost",
+    "interceptions_thrown", "defensive_touchdowns", "possession_time", "possession_time_seconds",
+)
+_PLAYER_SEASON_COLS = (
+    "games_played", "passing_completions", "passing_attempts", "passing_yards",
+    "passing_touchdowns", "passing_interceptions", "passing_yards_per_game",
+    "passing_completion_pct", "qbr", "rushing_attempts", "rushing_yards", "rushing_yards_per_game",
+    "rushing_touchdowns", "rushing_fumbles", "rushing_first_downs", "receptions", "receiving_yards",
+    "receiving_yards_per_game", "receiving_touchdowns", "receiving_targets",
+    "receiving_first_downs", "fumbles_forced", "fumbles_recovered", "total_tackles",
+    "defensive_sacks", "defensive_interceptions",
+)
+_PLAYER_GAME_COLS = (
+    "passing_completions", "passing_attempts", "passing_yards", "passing_touchdowns",
+    "passing_interceptions", "sacks", "qbr", "qb_rating", "rushing_attempts", "rushing_yards",
+    "rushing_touchdowns", "receptions", "receiving_yards", "receiving_touchdowns",
+    "receiving_targets", "fumbles", "fumbles_lost", "fumbles_recovered", "total_tackles",
+    "defensive_sacks", "defensive_interceptions",
+)
+_GAME_ODDS_COLS = (
+    "spread_home_value", "spread_home_odds", "spread_away_value", "spread_away_odds",
+    "moneyline_home_odds", "moneyline_away_odds", "total_value", "total_over_odds",
+    "total_under_odds",
+)
+
+_project_team_game = _compile_projector(tuple((c, c) for c in _TEAM_GAME_COLS), "_project_team_game")
+_project_player_season = _compile_projector(tuple((c, c) for c in _PLAYER_SEASON_COLS), "_project_player_season")
+_project_player_game = _compile_projector(tuple((c, c) for c in _PLAYER_GAME_COLS), "_project_player_game")
+_project_game_odds = _compile_projector(tuple((c, c) for c in _GAME_ODDS_COLS), "_project_game_odds")
+
+
+def map_team_game_stat(s: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     team = s.get("team") if isinstance(s.get("team"), dict) else {}
     game = s.get("game") if isinstance(s.get("game"), dict) else {}
-    return {
-        "team_id": team.get("id"),
-        "game_id": game.get("id"),
-        "season": game.get("season"),
-        "week": game.get("week"),
-        "home_away": s.get("home_away"),
-        "first_downs": s.get("first_downs"),
-        "first_downs_passing": s.get("first_downs_passing"),
-        "first_downs_rushing": s.get("first_downs_rushing"),
-        "first_downs_penalty": s.get("first_downs_penalty"),
-        "third_down_efficiency": s.get("third_down_efficiency"),
-        "third_down_conversions": s.get("third_down_conversions"),
-        "third_down_attempts": s.get("third_down_attempts"),
-        "fourth_down_efficiency": s.get("fourth_down_efficiency"),
-        "fourth_down_conversions": s.get("fourth_down_conversions"),
-        "fourth_down_attempts": s.get("fourth_down_attempts"),
-        "total_offensive_plays": s.get("total_offensive_plays"),
-        "total_yards": s.get("total_yards"),
-        "yards_per_play": s.get("yards_per_play"),
-        "total_drives": s.get("total_drives"),
-        "net_passing_yards": s.get("net_passing_yards"),
-        "passing_completions": s.get("passing_completions"),
-        "passing_attempts": s.get("passing_attempts"),
-        "yards_per_pass": s.get("yards_per_pass"),
-        "sacks": s.get("sacks"),
-        "sack_yards_lost": s.get("sack_yards_lost"),
-        "rushing_yards": s.get("rushing_yards"),
-        "rushing_attempts": s.get("rushing_attempts"),
-        "yards_per_rush_attempt": s.get("yards_per_rush_attempt"),
-        "red_zone_scores": s.get("red_zone_scores"),
-        "red_zone_attempts": s.get("red_zone_attempts"),
-        "penalties": s.get("penalties"),
-        "penalty_yards": s.get("penalty_yards"),
-        "turnovers": s.get("turnovers"),
-        "fumbles_lost": s.get("fumbles_lost"),
-        "interceptions_thrown": s.get("interceptions_thrown"),
-        "defensive_touchdowns": s.get("defensive_touchdowns"),
-        "possession_time": s.get("possession_time"),
-        "possession_time_seconds": s.get("possession_time_seconds"),
-        "updated_at": _now_iso(),
-    }
-
-def map_player_season_stat(s: dict[str, Any]) -> dict[str, Any]:
+    row = _project_team_game(s.get)
+    row["team_id"] = team.get("id")
+    row["game_id"] = game.get("id")
+    row["season"] = game.get("season")
+    row["week"] = game.get("week")
+    row["home_away"] = s.get("home_away")
+    row["updated_at"] = now or _now_iso()
+    return row
+
+def map_player_season_stat(s: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     player = s.get("player") if isinstance(s.get("player"), dict) else {}
-    return {
-        "player_id": player.get("id"),
-        "season": s.get("season"),
-        "postseason": s.get("postseason", False),
-        "games_played": s.get("games_played"),
-        "passing_completions": s.get("passing_completions"),
-        "passing_attempts": s.get("passing_attempts"),
-        "passing_yards": s.get("passing_yards"),
-        "passing_touchdowns": s.get("passing_touchdowns"),
-        "passing_interceptions": s.get("passing_interceptions"),
-        "passing_yards_per_game": s.get("passing_yards_per_game"),
-        "passing_completion_pct": s.get("passing_completion_pct"),
-        "qbr": s.get("qbr"),
-        "rushing_attempts": s.get("rushing_attempts"),
-        "rushing_yards": s.get("rushing_yards"),
-        "rushing_yards_per_game": s.get("rushing_yards_per_game"),
-        "rushing_touchdowns": s.get("rushing_touchdowns"),
-        "rushing_fumbles": s.get("rushing_fumbles"),
-        "rushing_first_downs": s.get("rushing_first_downs"),
-        "receptions": s.get("receptions"),
-        "receiving_yards": s.get("receiving_yards"),
-        "receiving_yards_per_game": s.get("receiving_yards_per_game"),
-        "receiving_touchdowns": s.get("receiving_touchdowns"),
-        "receiving_targets": s.get("receiving_targets"),
-        "receiving_first_downs": s.get("receiving_first_downs"),
-        "fumbles_forced": s.get("fumbles_forced"),
-        "fumbles_recovered": s.get("fumbles_recovered"),
-        "total_tackles": s.get("total_tackles"),
-        "defensive_sacks": s.get("defensive_sacks"),
-        "defensive_interceptions": s.get("defensive_interceptions"),
-        "updated_at": _now_iso(),
-    }
-
-def map_player_game_stat(s: dict[str, Any]) -> dict[str, Any]:
+    row = _project_player_season(s.get)
+    row["player_id"] = player.get("id")
+    row["season"] = s.get("season")
+    row["postseason"] = s.get("postseason", False)
+    row["updated_at"] = now or _now_iso()
+    return row
+
+def map_player_game_stat(s: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     player = s.get("player") if isinstance(s.get("player"), dict) else {}
     game = s.get("game") if isinstance(s.get("game"), dict) else {}
     team = s.get("team") if isinstance(s.get("team"), dict) else {}
-    return {
-        "player_id": player.get("id"),
-        "game_id": game.get("id"),
-        "team_id": team.get("id"),
-        "season": game.get("season"),
-        "week": game.get("week"),
-        
-        "passing_completions": s.get("passing_completions"),
-        "passing_attempts": s.get("passing_attempts"),
-        "passing_yards": s.get("passing_yards"),
-        "passing_touchdowns": s.get("passing_touchdowns"),
-        "passing_interceptions": s.get("passing_interceptions"),
-        "sacks": s.get("sacks"),
-        "qbr": s.get("qbr"),
-        "qb_rating": s.get("qb_rating"),
-        
-        "rushing_attempts": s.get("rushing_attempts"),
-        "rushing_yards": s.get("rushing_yards"),
-        "rushing_touchdowns": s.get("rushing_touchdowns"),
-        
-        "receptions": s.get("receptions"),
-        "receiving_yards": s.get("receiving_yards"),
-        "receiving_touchdowns": s.get("receiving_touchdowns"),
-        "receiving_targets": s.get("receiving_targets"),
-        
-        "fumbles": s.get("fumbles"),
-        "fumbles_lost": s.get("fumbles_lost"),
-        "fumbles_recovered": s.get("fumbles_recovered"),
-        "total_tackles": s.get("total_tackles"),
-        "defensive_sacks": s.get("defensive_sacks"),
-        "defensive_interceptions": s.get("defensive_interceptions"),
-        
-        "updated_at": _now_iso(),
-    }
-
-def map_game_odds(o: dict[str, Any]) -> dict[str, Any]:
+    row = _project_player_game(s.get)
+    row["player_id"] = player.get("id")
+    row["game_id"] = game.get("id")
+    row["team_id"] = team.get("id")
+    row["season"] = game.get("season")
+    row["week"] = game.get("week")
+    row["updated_at"] = now or _now_iso()
+    return row
+
+def map_game_odds(o: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     # Need game_id from wrapping loop usually, but BDL /odds response includes it.
-    return {
-        "id": str(o.get("id")),
-        "game_id": o.get("game_id"),
-        "vendor": o.get("vendor"),
-        "spread_home_value": o.get("spread_home_value"),
-        "spread_home_odds": o.get("spread_home_odds"),
-        "spread_away_value": o.get("spread_away_value"),
-        "spread_away_odds": o.get("spread_away_odds"),
-        "moneyline_home_odds": o.get("moneyline_home_odds"),
-        "moneyline_away_odds": o.get("moneyline_away_odds"),
-        "total_value": o.get("total_value"),
-        "total_over_odds": o.get("total_over_odds"),
-        "total_under_odds": o.get("total_under_odds"),
-        "updated_at": _now_iso(),
-    }
+    row = _project_game_odds(o.get)
+    row["id"] = str(o.get("id"))
+    row["game_id"] = o.get("game_id")
+    row["vendor"] = o.get("vendor")
+    row["updated_at"] = now or _now_iso()
+    return row
 
 # -----------------------------------------------------------------------------
 # New Ingestors
@@ -1337,83 +1146,106 @@ def ingest_full_stats(
     seasons: list[int],
     supabase: SupabaseClient,
     bdl: BallDontLieNFLClient,
-    batch_size: int = 500,
+    batch_size: int = 2000,
+    max_workers: int = 4,
 ) -> None:
-    """Ingest ALL team/player stats (Game & Season level)."""
-    
-    for season in seasons:
-        logger.info(f"== Season {season}: Team Game Stats ==")
-        tg_upserted = 0
-        try:
-            for chunk in _chunked(
-                (map_team_game_stat(s) for s in bdl.iter_team_game_stats(season=season)),
-                batch_size
-            ):
-                valid = [r for r in chunk if r.get("team_id") and r.get("game_id")]
-                if valid:
-                    tg_upserted += supabase.upsert("nfl_team_game_stats", valid, on_conflict="team_id,game_id")
-            logger.info(f"Upserted {tg_upserted} team game stats")
-        except Exception as e:
-            logger.error(f"Failed to ingest Team Game Stats for {season}: {e}")
-        
-        logger.info(f"== Season {season}: Player Season Stats ==")
-        ps_upserted = 0
-        try:
-            for chunk in _chunked(
-                (map_player_season_stat(s) for s in bdl.iter_player_season_stats(season=season)),
-                batch_size
-            ):
-                valid = [r for r in chunk if r.get("player_id")]
-                if valid:
-                    ps_upserted += supabase.upsert("nfl_player_season_stats", valid, on_conflict="player_id,season,postseason")
-            logger.info(f"Upserted {ps_upserted} player season stats")
-        except Exception as e:
-            logger.error(f"Failed to ingest Player Season Stats for {season}: {e}")
-        
-        logger.info(f"== Season {season}: Player Game Stats (Basic) ==")
-        pg_upserted = 0
-        try:
-            for chunk in _chunked(
-                (map_player_game_stat(s) for s in bdl.iter_player_game_stats(seasons=[season])),
-                batch_size
-            ):
-                valid = [r for r in chunk if r.get("player_id") and r.get("game_id")]
-                if valid:
-                    pg_upserted += supabase.upsert("nfl_player_game_stats", valid, on_conflict="player_id,game_id")
-            logger.info(f"Upserted {pg_upserted} player game stats")
-        except Exception as e:
-            logger.error(f"Failed to ingest Player Game Stats for {season}: {e}")
+    """
+    Ingest ALL team/player stats (Game & Season level).
+
+    (phase, season) jobs run concurrently. Jobs for different seasons of one
+    phase upsert into the same table at once; that is safe only because their
+    conflict keys never overlap (each includes a season or a season's game_id).
+    Within a job, BDL is paged on a producer thread
+    (``_prefetched``) so the next batch is fetched while the current one is
+    upserted.
+    """
+    now = _now_iso()
+
+    # label -> (fetch, mapper, required key fields, table, on_conflict)
+    phases = {
+        "team game stats": (
+            lambda season: bdl.iter_team_game_stats(season=season),
+            map_team_game_stat,
+            ("team_id", "game_id"),
+            "nfl_team_game_stats",
+            "team_id,game_id",
+        ),
+        "player season stats": (
+            lambda season: bdl.iter_player_season_stats(season=season),
+            map_player_season_stat,
+            ("player_id",),
+            "nfl_player_season_stats",
+            "player_id,season,postseason",
+        ),
+        "player game stats": (
+            lambda season: bdl.iter_player_game_stats(seasons=[season]),
+            map_player_game_stat,
+            ("player_id", "game_id"),
+            "nfl_player_game_stats",
+            "player_id,game_id",
+        ),
+    }
+
+    def _run_phase(label: str, season: int) -> int:
+        fetch, mapper, key_fields, table, on_conflict = phases[label]
+        rows = (mapper(s, now=now) for s in fetch(season))
+        upserted = 0
+        for chunk in _prefetched(_chunked(_rows_with_keys(rows, key_fields), batch_size), maxsize=4):
+            upserted += supabase.upsert(table, chunk, on_conflict=on_conflict)
+        return upserted
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(_run_phase, label, season): (label, season) for season in seasons for label in phases}
+        # Log per finished job so concurrent phases don't interleave progress lines.
+        for fut in as_completed(futures):
+            label, season = futures[fut]
+            try:
+                logger.info("Season %s: upserted %d %s", season, fut.result(), label)
+            except Exception as e:
+                logger.error("Failed to ingest %s for %s: %s", label, season, e)
 
 def ingest_odds(
     *,
     game_ids: list[int],
     supabase: SupabaseClient,
     bdl: BallDontLieNFLClient,
-    batch_size: int = 500,
+    batch_size: int = 2000,
+    max_workers: int = 8,
 ) -> None:
-    """Ingest betting odds for given games."""
+    """
+    Ingest betting odds for given games.
+
+    Game-ID chunks are fetched concurrently (the BDL client's rate limiter is
+    shared); upserts stay on the calling thread.
+    """
     upserted = 0
+    now = _now_iso()
     # Batch game_ids for query? API takes array. Max length?
     # BDL URL length limits might apply. Chunk game_ids.
-    
+
+    def _fetch_chunk(g_chunk: list[int]) -> list[dict[str, Any]]:
+        return [map_game_odds(o, now=now) for o in bdl.iter_betting_odds(game_ids=g_chunk)]
+
     game_chunks = _chunked(game_ids, 50) # Safe chunk size for URL params
-    for g_chunk in game_chunks:
-        try:
-            odds_iter = bdl.iter_betting_odds(game_ids=g_chunk)
-            rows = [map_game_odds(o) for o in odds_iter]
-            for r_chunk in _chunked(rows, batch_size):
-                if r_chunk:
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [pool.submit(_fetch_chunk, g_chunk) for g_chunk in game_chunks]
+        for fut in as_completed(futures):
+            try:
+                for r_chunk in _chunked(fut.result(), batch_size):
                     upserted += supabase.upsert("nfl_game_odds", r_chunk, on_conflict="id")
-        except Exception as e:
-            logger.warning(f"Error fetching odds for chunk: {e}")
+            except Exception as e:
+                logger.warning("Error fetching odds for chunk: %s", e)
             
-    logger.info(f"Upserted {upserted} odds records")
+    logger.info("Upserted %d odds records", upserted)
 
 # -----------------------------------------------------------------------------
 # Roster & Active Logic
 # -----------------------------------------------------------------------------
 
-def map_roster_entry(r: dict[str, Any], team_id: int, season: int) -> dict[str, Any]:
+_ST_POSITIONS = frozenset({"KR", "PR", "LS", "P", "PK", "H"})
+
+
+def map_roster_entry(r: dict[str, Any], team_id: int, season: int, *, now: Optional[str] = None) -> dict[str, Any]:
     player_data = r.get("player") or {}
     return {
         "team_id": team_id,
@@ -1422,7 +1254,7 @@ def map_roster_entry(r: dict[str, Any], team_id: int, season: int) -> dict[str,
         "position": r.get("position"),
         "depth": r.get("depth"),
         "injury_status": r.get("injury_status"),
-        "updated_at": _now_iso(),
+        "updated_at": now or _now_iso(),
     }
 
 def ingest_rosters(
@@ -1430,51 +1262,76 @@ def ingest_rosters(
     seasons: list[int],
     supabase: SupabaseClient,
     bdl: BallDontLieNFLClient,
-    batch_size: int = 500,
+    batch_size: int = 2000,
+    max_workers: int = 8,
 ) -> None:
     # Iterate all teams (we need team IDs first).
     # We can fetch teams from API or DB.
     # Let's fetch from API to be self-contained.
     logger.info("Fetching Team IDs for Roster ingestion...")
-    teams = list(bdl.iter_teams())
-    team_ids = [t["id"] for t in teams]
-    logger.info(f"Found {len(team_ids)} teams.")
+    team_ids = list(bdl.team_ids())
+    logger.info("Found %d teams.", len(team_ids))
     
     upserted = 0
-    
-    for season in seasons:
-        logger.info(f"== Season {season}: Rosters ==")
-        roster_rows = []
-        for tid in team_ids:
-            try:
-                # iter_team_roster returns list or items
-                for r in bdl.iter_team_roster(team_id=tid, season=season):
-                    mapped = map_roster_entry(r, tid, season)
-                    if mapped["player_id"]:
-                        roster_rows.append(mapped)
-            except Exception as e:
-                logger.warning(f"Error fetching roster for team {tid}: {e}")
-        
-        # Deduplicate: prefer offensive/defensive position over ST (KR/PR/LS/P/PK/H)
-        _ST_POSITIONS = {"KR", "PR", "LS", "P", "PK", "H"}
-        seen_keys: dict[tuple, dict] = {}
-        for row in roster_rows:
-            key = (row["team_id"], row["player_id"], row["season"])
-            existing = seen_keys.get(key)
-            if existing is None:
-                seen_keys[key] = row
-            elif row.get("position") not in _ST_POSITIONS:
-                # New row is offensive/defensive — always prefer it
-                seen_keys[key] = row
-            # else: new row is ST and we already have a better position — skip
-        dedupe_rows = list(seen_keys.values())
-        
-        # Batch upsert
-        for chunk in _chunked(dedupe_rows, batch_size):
-            if chunk:
+    now = _now_iso()
+
+    def _fetch_roster(tid: int, season: int) -> list[dict[str, Any]]:
+        return list(bdl.iter_team_roster(team_id=tid, season=season))
+
+    # Team rosters are fetched concurrently (the BDL client's rate limiter is
+    # shared); dedupe and upserts stay on the calling thread.
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for season in seasons:
+            logger.info("== Season %s: Rosters ==", season)
+            futures = {pool.submit(_fetch_roster, tid, season): tid for tid in team_ids}
+            # Deduplicate as rows arrive: prefer offensive/defensive position over ST (KR/PR/LS/P/PK/H)
+            seen_keys: dict[tuple, dict] = {}
+            for fut in as_completed(futures):
+                tid = futures[fut]
+                try:
+                    roster = fut.result()
+                except Exception as e:
+                    logger.warning("Error fetching roster for team %s: %s", tid, e)
+                    continue
+                for r in roster:
+                    row = map_roster_entry(r, tid, season, now=now)
+                    if not row["player_id"]:
+                        continue
+                    key = (tid, row["player_id"], season)
+                    if row["position"] not in _ST_POSITIONS:
+                        # New row is offensive/defensive — always prefer it
+                        seen_keys[key] = row
+                    else:
+                        # ST row only fills an empty slot; one dict operation either way
+                        seen_keys.setdefault(key, row)
+
+            # Batch upsert
+            for chunk in _chunked(seen_keys.values(), batch_size):
                 upserted += supabase.upsert("nfl_rosters", chunk, on_conflict="team_id,player_id,season")
                 
-    logger.info(f"Upserted {upserted} roster entries.")
+    logger.info("Upserted %d roster entries.", upserted)
+
+def _mark_active_chunked(supabase: SupabaseClient, active_ids: list[int]) -> int:
+    """Fallback for databases without set_active_players: PATCH is_active in id batches."""
+    # Update in chunks
+    chunk_size = 200 # Smaller chunk for URL length safety
+    total_updated = 0
+    
+    for i in range(0, len(active_ids), chunk_size):
+        chunk = active_ids[i:i+chunk_size]
+        ids_str = ",".join(map(str, chunk))
+        try:
+            # Use custom update method with PostgREST "in." filter
+            res = supabase.update(
+                "nfl_players", 
+                {"is_active": True}, 
+                filters={"id": f"in.({ids_str})"}
+            )
+            total_updated += len(res) # res is list of updated rows
+        except Exception as e:
+            logger.error("Error updating active chunk %d: %s", i, e)
+    return total_updated
+
 
 def ingest_active_players(
     *,
@@ -1484,58 +1341,29 @@ def ingest_active_players(
     """
     Fetches all active players and updates the 'is_active' flag in nfl_players.
     Assumption: nfl_players has already been populated with everyone.
+
+    Flags are set in one round trip via the set_active_players RPC
+    (supabase/fn_set_active_players.sql), which also clears players who are
+    no longer active; without it, falls back to chunked PATCHes.
     """
     logger.info("Fetching Active Players list...")
-    active_ids = []
     try:
-        count = 0
-        for p in bdl.iter_active_players():
-            count += 1
-            if p.get("id"):
-                active_ids.append(p["id"])
-        
-        logger.info(f"Found {len(active_ids)} active players.")
+        active_ids = [p["id"] for p in bdl.iter_active_players() if p.get("id")]
+        logger.info("Found %d active players.", len(active_ids))
         
         if not active_ids:
             return
 
-        # Update in batches. Supabase doesn't have a simple "UPDATE ... WHERE ID IN ..." bulk easily via py client 
-        # unless using RPC or careful filters.
-        # Alternatively, we can Upsert with only id and is_active=True?
-        # Upsert requires all non-null columns if we are inserting new, but for updates it might work 
-        # handled by ON CONFLICT DO UPDATE.
-        # However, we don't want to wipe other fields if row missing (unlikely if we ingested core).
-        # Safest: Use a custom update or just iterate and upsert minimal payload IF we are sure they exist?
-        # Actually, if we upsert {"id": X, "is_active": True}, and the row exists, does it keep other columns?
-        # Supabase/PostgREST upsert replaces unless specified.
-        # Better approach:
-        # Use simple update. PostgREST `in_` filter.
-        
-        # We also need to set EVERYONE to is_active=False first?
-        # The Schema default is FALSE. If we wiped the DB, they are False.
-        # If we re-run, we might want to reset? 
-        # For now, let's just set True for the ones we find.
-        
-        # Update in chunks
-        chunk_size = 200 # Smaller chunk for URL length safety
-        total_updated = 0
-        
-        for i in range(0, len(active_ids), chunk_size):
-            chunk = active_ids[i:i+chunk_size]
-            ids_str = ",".join(map(str, chunk))
-            try:
-                # Use custom update method with PostgREST "in." filter
-                res = supabase.update(
-                    "nfl_players", 
-                    {"is_active": True}, 
-                    filters={"id": f"in.({ids_str})"}
-                )
-                total_updated += len(res) # res is list of updated rows
-            except Exception as e:
-                logger.error(f"Error updating active chunk {i}: {e}")
+        try:
+            changed = supabase.rpc("set_active_players", {"ids": active_ids})
+            logger.info("Set active flags for %d players (%s rows changed).", len(active_ids), changed)
+            return
+        except SupabaseError as e:
+            logger.warning("set_active_players RPC unavailable, falling back to chunked updates: %s", e)
 
-        logger.info(f"Updated {total_updated} players to Active status.")
+        total_updated = _mark_active_chunked(supabase, active_ids)
+        logger.info("Updated %d players to Active status.", total_updated)
 
     except Exception as e:
-        logger.error(f"Error updating active players: {e}")
+        logger.error("Error updating active players: %s", e)
 
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
-Manually create nfl_data_py tables by executing SQL statements one at a time.
+Create nfl_data_py tables.
+
+With SUPABASE_DB_URI/DB_URI set, the DDL runs as one script in a single
+transaction; otherwise the combined SQL is printed for the Supabase SQL editor.
 """
 
 import sys
@@ -9,7 +12,6 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.database.supabase_client import SupabaseClient
 from dotenv import load_dotenv
 import logging
 
@@ -19,11 +21,6 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 def main():
-    sb = SupabaseClient(
-        url=os.getenv("SUPABASE_URL"),
-        service_role_key=os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    )
-    
     # SQL statements to execute
     statements = [
         # Player ID Mapping
@@ -101,21 +98,29 @@ def main():
         "CREATE INDEX IF NOT EXISTS idx_snap_counts_season_week ON nfl_snap_counts(season, week)",
     ]
     
-    logger.info("Creating nfl_data_py tables...")
-    
-    # Use Supabase RPC to execute SQL
-    for i, sql in enumerate(statements):
-        try:
-            logger.info(f"Executing statement {i+1}/{len(statements)}...")
-            # Supabase doesn't have a direct SQL execution endpoint via REST API
-            # We need to use PostgREST's RPC endpoint
-            # For now, let's just print the SQL
-            print(sql.strip())
-            print()
-        except Exception as e:
-            logger.error(f"Failed on statement {i+1}: {e}")
-    
-    print("\n\n=== COPY THIS SQL TO SUPABASE SQL EDITOR ===\n")
+    full_sql = ";\n".join(sql.strip() for sql in statements) + ";\n"
+
+    db_uri = os.getenv("SUPABASE_DB_URI") or os.getenv("DB_URI")
+    if not db_uri:
+        # PostgREST has no raw SQL endpoint; hand the script to the SQL editor.
+        print("\n=== COPY THIS SQL TO SUPABASE SQL EDITOR ===\n")
+        print(full_sql)
+        return
+
+    from sqlalchemy import create_engine
+
+    logger.info(f"Creating nfl_data_py tables ({len(statements)} statements, one round trip)...")
+    engine = create_engine(db_uri)
+    try:
+        # One transaction: a failing statement rolls back the whole script.
+        with engine.begin() as conn:
+            conn.exec_driver_sql(full_sql)
+    except Exception as e:
+        logger.error(f"Failed to create nfl_data_py tables (rolled back): {e}")
+        raise
+    finally:
+        engine.dispose()
+    logger.info("Created nfl_data_py tables.")
 
 if __name__ == "__main__":
     main()
@@ -2,14 +2,27 @@ from __future__ import annotations
 
 import logging
 import os
+import re
+import zlib
 from dataclasses import dataclass
-from typing import Iterable, Optional, Sequence
+from typing import Callable, Iterable, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 import nfl_data_py as nfl
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import Integer, bindparam, create_engine, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.elements import TextClause
+
+from src.database.pg_copy import copy_rows_method
+from src.ingestion.nflverse_cache import cached_frame
+
+try:
+    import connectorx as cx
+except ImportError:  # optional: Arrow transport for Postgres reads; pandas/SQLAlchemy is the fallback
+    cx = None
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +40,38 @@ TEAM_FIX = {
 }
 
 
+# PBP string columns used as groupby keys / filters
+_PBP_CATEGORICALS = ("posteam", "defteam", "play_type")
+
+# The PBP columns the aggregates read; the season parquet files carry ~390.
+# (season is always added by nfl_data_py; was_pressure comes from the participation merge.)
+_PBP_COLUMNS = (
+    "game_id",
+    "play_id",
+    "week",
+    "posteam",
+    "defteam",
+    "play_type",
+    "epa",
+    "success",
+    "air_yards",
+    "pass_touchdown",
+    "sack",
+    "game_seconds_remaining",
+    "wp",
+    "pass",
+    "xpass",
+    "receiver_player_id",
+    "receiving_yards",
+    "yardline_100",
+    "temp",
+    "wind",
+    "weather",
+    "roof",
+    "surface",
+)
+
+
 # ------------------------------
 # Helpers
 # ------------------------------
@@ -45,20 +90,175 @@ def clean_name(name: str | None) -> str:
     )
 
 
+# Same substrings clean_name strips, in the same order (" III" before " II"). Each
+# is its own pass, as in clean_name: "A J.r" loses "." and then " Jr".
+_NAME_STRIP = (".", " Jr", " Sr", " III", " II")
+
+
+def clean_name_series(names: pd.Series) -> pd.Series:
+    """Vectorized clean_name for a whole column (identical keys, missing values included)."""
+    out = names.astype(str)
+    for token in _NAME_STRIP:
+        out = out.str.replace(token, "", regex=False)
+    out = out.str.strip().str.lower()
+    missing = names.isna()
+    if missing.any():
+        # None -> "" but NaN -> "nan" in clean_name; only the missing rows go through it.
+        out[missing] = names[missing].map(clean_name)
+    return out
+
+
+_INT_DOWNCASTS = ("int8", "int16", "int32", "int64")
+
+
+def _smallest_int(lo, hi) -> Optional[str]:
+    if pd.isna(lo):
+        return "int8"
+    for name in _INT_DOWNCASTS:
+        info = np.iinfo(name)
+        if info.min <= lo and hi <= info.max:
+            return name
+    return None  # uint64 beyond int64 range: leave as is
+
+
+def _fits_float32(col: pd.Series) -> bool:
+    """pandas' float downcast check: float32 round-trips within 5e-4 absolute."""
+    values = col.to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(over="ignore"):
+        narrow = values.astype("float32")
+    return bool(np.allclose(narrow, values, equal_nan=True, rtol=0.0, atol=5e-4))
+
+
 def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
-    for col in df.columns:
-        if pd.api.types.is_float_dtype(df[col]):
-            df[col] = pd.to_numeric(df[col], downcast="float")
-        elif pd.api.types.is_integer_dtype(df[col]):
-            df[col] = pd.to_numeric(df[col], downcast="integer")
+    """
+    Floats to float32 where that loses nothing beyond 5e-4, and ints to the
+    smallest signed int that holds their range (same result as
+    ``pd.to_numeric(downcast=...)``), via one ``astype``.
+    """
+    # Columns are picked from df.dtypes (select_dtypes would copy them just to list
+    # names) and reduced one at a time; casts that wouldn't change a dtype are skipped.
+    dtypes = {}
+    for c, dtype in df.dtypes.items():
+        if pd.api.types.is_float_dtype(dtype):
+            name = "float32"
+            if dtype.itemsize > 4 and not _fits_float32(df[c]):
+                continue  # e.g. yyyymmdd dates or large ids would be rounded
+        elif pd.api.types.is_integer_dtype(dtype):
+            col = df[c]
+            name = _smallest_int(col.min(), col.max())
+            if not name:
+                continue
+        else:
+            continue
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            name = name.capitalize()  # nullable Int64/Float64 keep their NA mask
+        if dtype != name:
+            dtypes[c] = name
+    return df.astype(dtypes, copy=False) if dtypes else df
+
+
+def _safe_div(num: pd.Series, den: pd.Series) -> np.ndarray:
+    """``num / den`` with NaN where ``den`` is 0, masked in the divide itself."""
+    n = num.to_numpy(dtype=float, na_value=np.nan)
+    d = den.to_numpy(dtype=float, na_value=np.nan)
+    return np.divide(n, d, out=np.full(len(d), np.nan), where=d != 0)
+
+
+def _team_abbr_map(teams: pd.DataFrame) -> dict:
+    """team_id -> normalized abbreviation, with TEAM_FIX folded in so one .map does both."""
+    return {tid: TEAM_FIX.get(abbr, abbr) for tid, abbr in zip(teams["team_id"], teams["abbreviation"])}
+
+
+def _categorize(df: pd.DataFrame, cols: Iterable[str]) -> pd.DataFrame:
+    """Cast low-cardinality string columns to category so groupbys hash int codes."""
+    for c in cols:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
     return df
 
 
-def safe_read_sql(engine: Engine, query: str, **kwargs) -> pd.DataFrame:
+def _fix_team(s: pd.Series) -> pd.Series:
+    """
+    Apply TEAM_FIX to a team-code column as a categorical, touching only its
+    unique codes. Fixed codes may collide with existing ones (LAR -> LA), so
+    old category codes are remapped rather than renamed.
+    """
+    s = s.astype("category")
+    fixed = pd.Index([TEAM_FIX.get(c, c) for c in s.cat.categories])
+    cats = fixed.unique()
+    # Trailing -1 keeps missing values (code -1) missing after the lookup.
+    remap = np.append(cats.get_indexer(fixed), -1)
+    codes = remap[s.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=cats), index=s.index, name=s.name)
+
+
+def _decategorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Back to plain object keys so aggregates merge cleanly with other frames."""
+    for c in df.select_dtypes("category").columns:
+        df[c] = df[c].astype(object)
+    return df
+
+
+# Row batch for streamed reads of the large per-player-game tables.
+_STREAM_CHUNKSIZE = 200_000
+_PERSIST_CHUNKSIZE = 50_000
+
+
+def _season_sql(sql: str) -> TextClause:
+    """Query text whose ``:seasons`` binds as a Postgres int array (``= ANY(:seasons)``), keeping the SQL constant."""
+    return text(sql).bindparams(bindparam("seasons", type_=ARRAY(Integer)))
+
+
+def safe_read_sql(
+    con: Engine | Connection,
+    query: str | TextClause,
+    *,
+    params: Optional[dict] = None,
+    chunksize: Optional[int] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Read a query into a DataFrame, or an empty one if it fails. With
+    ``chunksize`` the rows come through a server-side cursor in batches, so
+    the driver never buffers the whole result next to the DataFrame.
+
+    When connectorx is installed, Postgres reads go through its columnar
+    Arrow transport instead (no DBAPI row tuples); any failure there falls
+    back to the pandas path.
+
+    ``con`` may be an open ``Connection``, so a whole build can share one
+    pooled connection; a failed query is rolled back so the next one can run.
+    """
+    engine = con.engine
+    if cx is not None and not kwargs and engine.dialect.name == "postgresql":
+        try:
+            uri = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+            sql = query
+            if isinstance(query, TextClause):
+                # connectorx takes plain SQL; inline the (int-only) binds.
+                bound = query.bindparams(**params) if params else query
+                sql = str(bound.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            return cx.read_sql(uri, sql, return_type="arrow").to_pandas()
+        except Exception as exc:
+            logger.debug("connectorx read failed; using pandas: %s", exc)
     try:
-        return pd.read_sql(query, engine, **kwargs)
+        if not chunksize:
+            return pd.read_sql(query, con, params=params, **kwargs)
+        if isinstance(con, Connection):
+            # execution_options() is in-place on a Connection; undo it after.
+            con.execution_options(stream_results=True)
+            try:
+                chunks = list(pd.read_sql(query, con, params=params, chunksize=chunksize, **kwargs))
+            finally:
+                con.execution_options(stream_results=False)
+        else:
+            with con.connect().execution_options(stream_results=True) as conn:
+                chunks = list(pd.read_sql(query, conn, params=params, chunksize=chunksize, **kwargs))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
     except Exception as exc:  # pragma: no cover - defensive
         logger.warning("Query failed; returning empty df: %s", exc)
+        if isinstance(con, Connection):
+            con.rollback()
         return pd.DataFrame()
 
 
@@ -74,7 +274,7 @@ class Lookups:
     merge_to_team_abbr: dict[str, str]
 
 
-def load_player_lookup(engine: Engine, playerid_csv: str) -> Lookups:
+def load_player_lookup(engine: Engine | Connection, playerid_csv: str) -> Lookups:
     players = safe_read_sql(
         engine,
         "select id as player_id, first_name, last_name, position_abbreviation, team_id "
@@ -84,20 +284,18 @@ def load_player_lookup(engine: Engine, playerid_csv: str) -> Lookups:
         engine,
         "select id as team_id, abbreviation from public.nfl_teams",
     )
-    players["merge_name"] = (
-        players[["first_name", "last_name"]]
-        .fillna("")
-        .agg(" ".join, axis=1)
-        .map(clean_name)
-    )
-    teams["abbreviation"] = teams["abbreviation"].map(lambda x: TEAM_FIX.get(x, x))
-    merge_to_player = dict(zip(players["merge_name"], players["player_id"]))
-    merge_to_team_abbr = dict(
-        zip(players["merge_name"], players["team_id"].map(dict(zip(teams.team_id, teams.abbreviation))))
-    )
+    full_name = players["first_name"].fillna("").str.cat(players["last_name"].fillna(""), sep=" ")
+    players["merge_name"] = clean_name_series(full_name)
+    teams["abbreviation"] = teams["abbreviation"].replace(TEAM_FIX)
+    # Duplicate names resolve to the last row (as dict(zip(...)) always did), explicitly,
+    # and both maps come from the same row so a name's player and team agree.
+    uniq = players.drop_duplicates("merge_name", keep="last")
+    names = uniq["merge_name"].to_numpy()
+    merge_to_player = dict(zip(names, uniq["player_id"].to_numpy()))
+    merge_to_team_abbr = dict(zip(names, uniq["team_id"].map(_team_abbr_map(teams)).to_numpy()))
 
     gsis_map = pd.read_csv(playerid_csv)
-    gsis_map["merge_name"] = gsis_map["merge_name"].map(clean_name)
+    gsis_map["merge_name"] = clean_name_series(gsis_map["merge_name"])
     gsis_to_merge = dict(zip(gsis_map["gsis_id"], gsis_map["merge_name"]))
 
     return Lookups(
@@ -117,45 +315,58 @@ class ExternalData:
     depth: pd.DataFrame
 
 
-def load_external_data(seasons: Sequence[int]) -> ExternalData:
+def load_external_data(seasons: Sequence[int], cache_dir: Optional[str] = None) -> ExternalData:
+    """
+    nfl_data_py externals for ``seasons``. With ``cache_dir`` the raw downloads
+    are kept as Parquet, so rebuilds within a day skip the network and CSV parse.
+    """
+    years = list(seasons)
     try:
-        pbp = nfl.import_pbp_data(list(seasons))
-        pbp["defteam"] = pbp["defteam"].replace(TEAM_FIX)
-        pbp["posteam"] = pbp["posteam"].replace(TEAM_FIX)
+        # Cache name tracks the column subset, so changing it never reads a stale copy.
+        pbp = cached_frame(
+            cache_dir,
+            f"pbp_{zlib.crc32(','.join(_PBP_COLUMNS).encode()):08x}",
+            years,
+            lambda: nfl.import_pbp_data(years, columns=list(_PBP_COLUMNS)),
+        )
+        pbp["defteam"] = _fix_team(pbp["defteam"])
+        pbp["posteam"] = _fix_team(pbp["posteam"])
+        # Every PBP aggregate groups on these; cast once for all of them.
+        pbp = _categorize(pbp, _PBP_CATEGORICALS)
     except Exception as exc:  # pragma: no cover - downstream will guard
         logger.warning("Failed to load PBP: %s", exc)
         pbp = pd.DataFrame()
 
     try:
-        sc = nfl.import_snap_counts(list(seasons))
-        sc["merge_name"] = sc["player"].map(clean_name)
-        sc["team"] = sc["team"].replace(TEAM_FIX)
-        snap_counts = sc[["merge_name", "season", "week", "offense_pct"]].rename(
-            columns={"offense_pct": "snap_pct"}
+        sc = cached_frame(cache_dir, "snap_counts", years, lambda: nfl.import_snap_counts(years))
+        sc["merge_name"] = clean_name_series(sc["player"])
+        sc["team"] = _fix_team(sc["team"])
+        snap_counts = downcast_numeric(
+            sc[["merge_name", "season", "week", "offense_pct"]].rename(columns={"offense_pct": "snap_pct"})
         )
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to load snap counts: %s", exc)
         snap_counts = pd.DataFrame(columns=["merge_name", "season", "week", "snap_pct"])
 
     try:
-        ng = nfl.import_ngs_data(stat_type="receiving", years=list(seasons))
-        ng["merge_name"] = ng["player_display_name"].map(clean_name)
+        ng = cached_frame(cache_dir, "ngs_receiving", years, lambda: nfl.import_ngs_data(stat_type="receiving", years=years))
+        ng["merge_name"] = clean_name_series(ng["player_display_name"])
         cols = [c for c in ["avg_separation", "catch_percentage_above_expectation", "avg_intended_air_yards"] if c in ng.columns]
-        ngs = ng[["merge_name", "season", "week"] + cols].rename(
-            columns={"avg_intended_air_yards": "ngs_adot"}
+        ngs = downcast_numeric(
+            ng[["merge_name", "season", "week"] + cols].rename(columns={"avg_intended_air_yards": "ngs_adot"})
         )
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to load NGS: %s", exc)
         ngs = pd.DataFrame(columns=["merge_name", "season", "week"])
 
     try:
-        depth_raw = nfl.import_depth_charts(list(seasons))
+        depth_raw = cached_frame(cache_dir, "depth_charts", years, lambda: nfl.import_depth_charts(years))
         depth_raw = depth_raw[depth_raw["formation"] == "Offense"]
-        depth_raw["merge_name"] = depth_raw["full_name"].map(clean_name)
+        depth_raw["merge_name"] = clean_name_series(depth_raw["full_name"])
         depth_raw["depth_rank"] = depth_raw["depth_position"]
         depth_raw["is_starter"] = (depth_raw["depth_rank"].astype(str) == "1").astype(int)
         depth_raw["is_slot"] = (depth_raw["depth_position"] == "SWR").astype(int)
-        depth = depth_raw[["merge_name", "season", "week", "depth_rank", "is_starter", "is_slot"]]
+        depth = downcast_numeric(depth_raw[["merge_name", "season", "week", "depth_rank", "is_starter", "is_slot"]])
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed to load depth charts: %s", exc)
         depth = pd.DataFrame(columns=["merge_name", "season", "week", "depth_rank", "is_starter", "is_slot"])
@@ -181,9 +392,11 @@ def _aggregate_defense(pbp: pd.DataFrame) -> pd.DataFrame:
                 "def_sack_rate",
             ]
         )
-    passing = pbp[pbp["play_type"] == "pass"].copy()
+    cols = ["defteam", "season", "week", "epa", "success", "air_yards", "pass_touchdown", "was_pressure", "sack"]
+    # Only the aggregated columns are sliced out; no copy of the full PBP frame.
+    passing = pbp.loc[pbp["play_type"] == "pass", cols]
     agg = (
-        passing.groupby(["defteam", "season", "week"])
+        passing.groupby(["defteam", "season", "week"], observed=True)
         .agg(
             def_epa=("epa", "mean"),
             def_success=("success", "mean"),
@@ -195,74 +408,78 @@ def _aggregate_defense(pbp: pd.DataFrame) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"defteam": "team_abbr"})
     )
-    return downcast_numeric(agg)
+    return downcast_numeric(_decategorize(agg))
 
 
 def _aggregate_game_script(pbp: pd.DataFrame) -> pd.DataFrame:
     if pbp.empty:
         return pd.DataFrame(columns=["team_abbr", "season", "week", "team_pace", "team_proe", "neutral_pace", "neutral_pass_rate"])
-    pbp = pbp.copy()
-    pbp["seconds_elapsed"] = pbp["game_seconds_remaining"].diff().abs().fillna(0)
-    neutral = pbp[(pbp["wp"] >= 0.20) & (pbp["wp"] <= 0.80) & (pbp["play_type"].isin(["pass", "run"]))]
+    keys = ["posteam", "season", "week"]
+    # Derived columns go on narrow key frames instead of a copy of the full PBP frame.
+    seconds_elapsed = pbp["game_seconds_remaining"].diff().abs().fillna(0)
+    neutral_mask = (pbp["wp"] >= 0.20) & (pbp["wp"] <= 0.80) & (pbp["play_type"].isin(["pass", "run"]))
+    neutral = pbp.loc[neutral_mask, keys].assign(seconds_elapsed=seconds_elapsed[neutral_mask])
     pace = (
-        neutral.groupby(["posteam", "season", "week"])["seconds_elapsed"]
+        neutral.groupby(["posteam", "season", "week"], observed=True)["seconds_elapsed"]
         .mean()
         .reset_index()
         .rename(columns={"posteam": "team_abbr", "seconds_elapsed": "team_pace"})
     )
     if "xpass" in pbp.columns and "pass" in pbp.columns:
-        pbp["pass_oe"] = pbp["pass"] - pbp["xpass"]
+        # Group the derived Series by the PBP key columns directly; no key-frame copy.
         proe = (
-            pbp.groupby(["posteam", "season", "week"])["pass_oe"]
+            (pbp["pass"] - pbp["xpass"])
+            .rename("team_proe")
+            .groupby([pbp[k] for k in keys], observed=True)
             .mean()
             .reset_index()
-            .rename(columns={"posteam": "team_abbr", "pass_oe": "team_proe"})
+            .rename(columns={"posteam": "team_abbr"})
         )
     else:
         proe = pd.DataFrame(columns=["team_abbr", "season", "week", "team_proe"])
-    out = pace.merge(proe, on=["team_abbr", "season", "week"], how="outer")
+    out = _decategorize(pace).merge(_decategorize(proe), on=["team_abbr", "season", "week"], how="outer")
     out["neutral_pace"] = out["team_pace"]
     out["neutral_pass_rate"] = out["team_proe"]
-    return out
+    return downcast_numeric(out)
 
 
 def _aggregate_receiver_pbp(pbp: pd.DataFrame, lookups: Lookups) -> pd.DataFrame:
     if pbp.empty:
         return pd.DataFrame(columns=["merge_name", "season", "week", "wopr", "racr", "target_share", "air_yards_share", "rz_targets"])
 
-    pbp = pbp.copy()
-    pbp["merge_name"] = pbp["receiver_player_id"].map(lookups.gsis_to_merge)
-    pbp = pbp[pbp["merge_name"].notna()]
+    merge_name = pbp["receiver_player_id"].map(lookups.gsis_to_merge)
+    known = merge_name.notna()
+    # Slice only the aggregated columns for matched receivers; no copy of the full PBP frame.
+    pbp = pbp.loc[known, ["posteam", "season", "week", "play_id", "air_yards", "receiving_yards", "yardline_100"]]
+    # Red-zone flag as a column so the groupby sums it in C instead of calling back per group.
+    pbp = pbp.assign(merge_name=merge_name[known].astype("category"), _rz=pbp["yardline_100"] <= 20)
 
     p_agg = (
-        pbp.groupby(["merge_name", "posteam", "season", "week"])
+        pbp.groupby(["merge_name", "posteam", "season", "week"], observed=True)
         .agg(
             targets=("play_id", "count"),
             air_yards=("air_yards", "sum"),
             rec_yards=("receiving_yards", "sum"),
-            rz_targets=("yardline_100", lambda x: (x <= 20).sum()),
+            rz_targets=("_rz", "sum"),
         )
         .reset_index()
     )
 
-    t_agg = (
-        pbp.groupby(["posteam", "season", "week"])
-        .agg(team_targets=("play_id", "count"), team_air_yards=("air_yards", "sum"))
-        .reset_index()
-    )
-
-    merged = p_agg.merge(
-        t_agg,
-        on=["posteam", "season", "week"],
-        how="left",
-    )
+    # Team totals are sums of the player rows, so derive them from p_agg instead of a second PBP scan.
+    team_sums = p_agg.groupby(["posteam", "season", "week"], observed=True)[["targets", "air_yards"]].transform("sum")
+    merged = p_agg.assign(team_targets=team_sums["targets"], team_air_yards=team_sums["air_yards"])
     merged["target_share"] = merged["targets"] / merged["team_targets"]
     merged["air_yards_share"] = merged["air_yards"] / merged["team_air_yards"]
     merged["wopr"] = 1.5 * merged["target_share"] + 0.7 * merged["air_yards_share"]
-    merged["racr"] = merged["rec_yards"] / merged["air_yards"].replace(0, np.nan)
+    merged["racr"] = _safe_div(merged["rec_yards"], merged["air_yards"])
     merged = merged.replace([np.inf, -np.inf], np.nan)
-    merged = merged.rename(columns={"posteam": "team_abbr"})
-    return merged[["merge_name", "team_abbr", "season", "week", "wopr", "racr", "target_share", "air_yards_share", "rz_targets"]]
+    merged = _decategorize(merged.rename(columns={"posteam": "team_abbr"}))
+    return downcast_numeric(
+        merged[["merge_name", "team_abbr", "season", "week", "wopr", "racr", "target_share", "air_yards_share", "rz_targets"]]
+    )
+
+
+_PRECIP_RE = re.compile(r"rain|snow|drizzle|sleet", re.IGNORECASE)
 
 
 def _aggregate_weather(pbp: pd.DataFrame) -> pd.DataFrame:
@@ -274,20 +491,104 @@ def _aggregate_weather(pbp: pd.DataFrame) -> pd.DataFrame:
     wx = pbp[cols].drop_duplicates(subset=["game_id"])
     wx = wx.rename(columns={"wind": "wind_speed"})
     wx["precip"] = wx.get("weather")
-    wx["is_precip"] = wx["precip"].astype(str).str.contains("rain|snow|drizzle|sleet", case=False, na=False).astype(int)
+    wx["is_precip"] = wx["precip"].astype("string").str.contains(_PRECIP_RE, na=False).astype("int8")
     wx["is_wind_cold"] = (
         (pd.to_numeric(wx.get("wind_speed"), errors="coerce").fillna(0) >= 15)
         & (pd.to_numeric(wx.get("temp"), errors="coerce").fillna(60) <= 40)
-    ).astype(int)
-    return wx
+    ).astype("int8")
+    return downcast_numeric(wx)
+
+
+def _grouped_roll(
+    df: pd.DataFrame, group: str | Sequence[str], col: str, window: int, *, stat: str = "mean", lag: int = 0
+) -> pd.Series:
+    """
+    Per-group ``x.rolling(window).<stat>().shift(lag)`` without a Python
+    callback per group. Lagging first and rolling over the lagged values is
+    equivalent, and keeps both steps in groupby's vectorized paths.
+    """
+    # Work on positions so a non-unique frame index still lines up on return.
+    keys = [df[g].to_numpy() for g in ([group] if isinstance(group, str) else group)]
+    s = pd.Series(df[col].to_numpy())
+    if lag:
+        s = s.groupby(keys, sort=False).shift(lag)
+    rolled = getattr(s.groupby(keys, sort=False).rolling(window), stat)()
+    rolled = rolled.droplevel(list(range(len(keys)))).reindex(s.index)
+    return pd.Series(rolled.to_numpy(), index=df.index)
+
+
+def _run_starts(*keys: np.ndarray) -> np.ndarray:
+    """For rows sorted by ``keys``: the position where each row's key run begins."""
+    n = len(keys[0])
+    new = np.ones(n, dtype=bool)
+    if n > 1:
+        new[1:] = np.logical_or.reduce([k[1:] != k[:-1] for k in keys])
+    return np.maximum.accumulate(np.where(new, np.arange(n), 0))
+
+
+def _prior_cumsum(x: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """
+    Per-run ``cumsum().shift(1)``: the sum of the run's earlier values (NaN-skipping,
+    NaN when the previous value is NaN, as groupby.cumsum gives) and NaN on a run's first row.
+    """
+    csum = np.concatenate(([0.0], np.cumsum(np.nan_to_num(x))))
+    idx = np.arange(len(x))
+    out = csum[idx] - csum[start]
+    out[idx == start] = np.nan
+    out[1:][np.isnan(x[:-1])] = np.nan
+    return out
+
+
+def _prior_window_means(x: np.ndarray, start: np.ndarray, windows: Sequence[int]) -> list[np.ndarray]:
+    """
+    Per-run ``shift(1).rolling(window).mean()`` for each window: the mean of the
+    previous ``window`` values in the run, NaN unless all of them exist (rolling's
+    default min_periods). ``x`` is one column or a (columns, rows) matrix; the
+    running sums are built once and each window is a difference of two slices.
+    """
+    m = np.atleast_2d(x)
+    n = m.shape[1]
+    valid = ~np.isnan(m)
+    csum = np.zeros((m.shape[0], n + 1))
+    np.cumsum(np.where(valid, m, 0.0), axis=1, out=csum[:, 1:])
+    cvalid = np.zeros((m.shape[0], n + 1), dtype=np.int32)
+    np.cumsum(valid, axis=1, out=cvalid[:, 1:])
+    pos = np.arange(n)
+    out = []
+    for w in windows:
+        mean = np.full(m.shape, np.nan)
+        if n > w:
+            full = (pos[w:] - w >= start[w:]) & (cvalid[:, w:n] - cvalid[:, : n - w] == w)
+            np.divide(csum[:, w:n] - csum[:, : n - w], w, out=mean[:, w:], where=full)
+        out.append(mean.reshape(x.shape))
+    return out
+
+
+def _prior_window_mean(x: np.ndarray, start: np.ndarray, window: int) -> np.ndarray:
+    return _prior_window_means(x, start, (window,))[0]
 
 
 def _rolling_features(df: pd.DataFrame, cols: Sequence[str], group: str = "player_id") -> pd.DataFrame:
+    """
+    Prior-3/5-game means per ``group``. Rows are sorted by the key, so its runs
+    are found once and all columns are rolled together as one float matrix
+    instead of re-grouping per column and window. A categorical key is compared
+    on its integer codes; a missing key makes each row its own run (NaN out),
+    as groupby drops NaN groups.
+    """
     df = df.sort_values([group, "season", "week"])
-    for c in cols:
-        if c in df.columns:
-            df[f"{c}_last3"] = df.groupby(group)[c].transform(lambda x: x.rolling(3).mean().shift(1))
-            df[f"{c}_last5"] = df.groupby(group)[c].transform(lambda x: x.rolling(5).mean().shift(1))
+    key = df[group]
+    start = _run_starts(key.cat.codes.to_numpy() if isinstance(key.dtype, pd.CategoricalDtype) else key.to_numpy())
+    missing = key.isna().to_numpy()
+    start[missing] = np.flatnonzero(missing)
+    cols = [c for c in cols if c in df.columns]
+    values = df[cols].to_numpy(dtype="float64", na_value=np.nan).T
+    last3, last5 = _prior_window_means(values, start, (3, 5))
+    new = {}
+    for i, c in enumerate(cols):
+        new[f"{c}_last3"] = last3[i]
+        new[f"{c}_last5"] = last5[i]
+    df[list(new)] = pd.DataFrame(new, index=df.index)
     return df
 
 
@@ -315,8 +616,19 @@ def _qb_features(passing: pd.DataFrame) -> pd.DataFrame:
 # ------------------------------
 # Feature assembly
 # ------------------------------
-def build_base_training(engine: Engine, seasons: Sequence[int]) -> pd.DataFrame:
-    query = f"""
+def _as_dates(s: pd.Series) -> pd.Series:
+    return s if pd.api.types.is_datetime64_any_dtype(s) else pd.to_datetime(s, errors="coerce", cache=True)
+
+
+def _parse_game_dates(df: pd.DataFrame) -> pd.DataFrame:
+    # Parse once at load so _compute_derived gets datetime64 and never re-parses.
+    if "date" in df.columns:
+        df["date"] = _as_dates(df["date"])
+    return df
+
+
+def build_base_training(engine: Engine | Connection, seasons: Sequence[int]) -> pd.DataFrame:
+    query = _season_sql("""
         select 
             pgs.player_id,
             pgs.game_id,
@@ -336,13 +648,15 @@ def build_base_training(engine: Engine, seasons: Sequence[int]) -> pd.DataFrame:
         from public.nfl_player_game_stats pgs
         join public.nfl_games g on g.id = pgs.game_id
         where pgs.receiving_targets is not null
-          and pgs.season in ({",".join(str(s) for s in seasons)})
-    """
-    return safe_read_sql(engine, query)
+          and pgs.season = ANY(:seasons)
+    """)
+    return _parse_game_dates(
+        safe_read_sql(engine, query, params={"seasons": list(seasons)}, chunksize=_STREAM_CHUNKSIZE)
+    )
 
 
-def build_inference_candidates(engine: Engine, seasons: Sequence[int]) -> pd.DataFrame:
-    query = f"""
+def build_inference_candidates(engine: Engine | Connection, seasons: Sequence[int]) -> pd.DataFrame:
+    query = _season_sql("""
         select 
             pp.player_id,
             pp.game_id,
@@ -357,30 +671,34 @@ def build_inference_candidates(engine: Engine, seasons: Sequence[int]) -> pd.Dat
         from public.nfl_player_props pp
         join public.nfl_games g on g.id = pp.game_id
         where pp.prop_type in ('player_rec_yds','receiving_yards')
-          and g.season in ({",".join(str(s) for s in seasons)})
-    """
-    return safe_read_sql(engine, query)
+          and g.season = ANY(:seasons)
+    """)
+    return _parse_game_dates(safe_read_sql(engine, query, params={"seasons": list(seasons)}))
 
 
-def load_advanced(engine: Engine, seasons: Sequence[int]) -> tuple[pd.DataFrame, pd.DataFrame]:
+def load_advanced(engine: Engine | Connection, seasons: Sequence[int]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    params = {"seasons": list(seasons)}
     recv = safe_read_sql(
         engine,
-        f"""
+        _season_sql("""
         select * from public.nfl_advanced_receiving_stats
-        where season in ({",".join(str(s) for s in seasons)})
-        """,
+        where season = ANY(:seasons)
+        """),
+        params=params,
+        chunksize=_STREAM_CHUNKSIZE,
     )
     pass_adv = safe_read_sql(
         engine,
-        f"""
+        _season_sql("""
         select * from public.nfl_advanced_passing_stats
-        where season in ({",".join(str(s) for s in seasons)})
-        """,
+        where season = ANY(:seasons)
+        """),
+        params=params,
     )
     return recv, pass_adv
 
 
-def load_betting(engine: Engine, seasons: Sequence[int]) -> tuple[pd.DataFrame, pd.DataFrame]:
+def load_betting(engine: Engine | Connection, seasons: Sequence[int]) -> tuple[pd.DataFrame, pd.DataFrame]:
     # Some deployments may not store season on these tables; fall back to full table if filter fails.
     odds = safe_read_sql(
         engine,
@@ -403,10 +721,11 @@ def load_betting(engine: Engine, seasons: Sequence[int]) -> tuple[pd.DataFrame,
     return odds, props
 
 
-def _defense_allowance(engine: Engine, seasons: Sequence[int], lookups: Lookups) -> pd.DataFrame:
+def _defense_allowance(engine: Engine | Connection, seasons: Sequence[int], lookups: Lookups) -> pd.DataFrame:
+    params = {"seasons": list(seasons)}
     pgs = safe_read_sql(
         engine,
-        f"""
+        _season_sql("""
         select 
             pgs.player_id,
             pgs.game_id,
@@ -417,16 +736,19 @@ def _defense_allowance(engine: Engine, seasons: Sequence[int], lookups: Lookups)
             pgs.passing_completions,
             pgs.passing_attempts
         from public.nfl_player_game_stats pgs
-        where pgs.season in ({",".join(str(s) for s in seasons)})
-        """,
+        where pgs.season = ANY(:seasons)
+        """),
+        params=params,
+        chunksize=_STREAM_CHUNKSIZE,
     )
     games = safe_read_sql(
         engine,
-        f"""
+        _season_sql("""
         select id as game_id, home_team_id, visitor_team_id
         from public.nfl_games
-        where season in ({",".join(str(s) for s in seasons)})
-        """,
+        where season = ANY(:seasons)
+        """),
+        params=params,
     )
     if pgs.empty or games.empty:
         return pd.DataFrame(columns=["team_abbr", "season", "opp_pass_yards_allowed_pg_prior", "opp_comp_pct_allowed"])
@@ -460,9 +782,8 @@ def _defense_allowance(engine: Engine, seasons: Sequence[int], lookups: Lookups)
         )
         .reset_index()
     )
-    allow["opp_comp_pct_allowed"] = allow["comp"] / allow["att"].replace(0, np.nan)
-    team_map = dict(zip(lookups.teams.team_id, lookups.teams.abbreviation))
-    allow["team_abbr"] = allow["def_team_id"].map(team_map).map(lambda x: TEAM_FIX.get(x, x))
+    allow["opp_comp_pct_allowed"] = _safe_div(allow["comp"], allow["att"])
+    allow["team_abbr"] = allow["def_team_id"].map(_team_abbr_map(lookups.teams))
     return downcast_numeric(allow.drop(columns=["comp", "att"]))
 
 
@@ -472,16 +793,14 @@ def _attach_team_abbr(df: pd.DataFrame, lookups: Lookups) -> pd.DataFrame:
         if col not in df.columns:
             df[col] = np.nan
 
-    team_map = dict(zip(lookups.teams.team_id, lookups.teams.abbreviation))
-    df["team_abbr"] = df["team_id"].map(team_map).map(lambda x: TEAM_FIX.get(x, x))
-    df["home_team_abbr"] = df["home_team_id"].map(team_map).map(lambda x: TEAM_FIX.get(x, x))
-    df["opponent_team_abbr"] = np.where(
-        df["team_id"] == df["home_team_id"],
-        df["visitor_team_id"].map(team_map),
-        df["home_team_id"].map(team_map),
-    )
-    df["opponent_team_abbr"] = df["opponent_team_abbr"].map(lambda x: TEAM_FIX.get(x, x))
-    df["is_home"] = (df["team_id"] == df["home_team_id"]).astype(int)
+    team_map = _team_abbr_map(lookups.teams)
+    home_abbr = df["home_team_id"].map(team_map).to_numpy()
+    visitor_abbr = df["visitor_team_id"].map(team_map).to_numpy()
+    is_home = df["team_id"].to_numpy() == df["home_team_id"].to_numpy()
+    df["team_abbr"] = df["team_id"].map(team_map)
+    df["home_team_abbr"] = home_abbr
+    df["opponent_team_abbr"] = np.where(is_home, visitor_abbr, home_abbr)
+    df["is_home"] = is_home.astype("int8")
     return df
 
 
@@ -494,7 +813,9 @@ def _merge_player_features(
     depth: pd.DataFrame,
     lookups: Lookups,
 ) -> pd.DataFrame:
-    df = base.copy()
+    # base is the caller's own frame (rebound to the result), so no defensive copy;
+    # the merges below return new frames anyway.
+    df = base
     df["merge_name"] = df["player_id"].map(dict(zip(lookups.players.player_id, lookups.players.merge_name)))
 
     required_adv_cols = [
@@ -544,41 +865,89 @@ def _merge_player_features(
         adv_sel,
         on=["player_id", "season", "week"],
         how="left",
+        copy=False,
     )
 
-    for ext_df in (receiver_pbp, snap_counts, ngs, depth):
+    return _join_on_keys(df, (receiver_pbp, snap_counts, ngs, depth), ["merge_name", "season", "week"])
+
+
+def _join_on_keys(df: pd.DataFrame, frames: Iterable[pd.DataFrame], keys: list[str]) -> pd.DataFrame:
+    """
+    Left-join each frame on ``keys``, hashing the base's key once: frames unique
+    on ``keys`` are looked up against one MultiIndex and the columns concatenated
+    in a single pass. A frame with repeated keys falls back to ``merge`` (it can
+    fan out rows). Columns the base already has (e.g. receiver_pbp's team_abbr)
+    keep the base's value rather than splitting into _x/_y copies.
+    """
+    left: Optional[pd.MultiIndex] = None
+    parts: list[pd.DataFrame] = []
+    for ext_df in frames:
         if ext_df.empty:
             continue
-        df = df.merge(
-            ext_df,
-            on=["merge_name", "season", "week"],
-            how="left",
-        )
-    return df
+        taken = set(df.columns).union(*(p.columns for p in parts))
+        overlap = [c for c in ext_df.columns if c in taken and c not in keys]
+        right = ext_df.drop(columns=overlap).set_index(keys)
+        if right.index.is_unique:
+            if left is None:
+                left = pd.MultiIndex.from_frame(df[keys])
+            parts.append(right.reindex(left).set_axis(df.index))
+            continue
+        if parts:
+            df, parts = pd.concat([df, *parts], axis=1), []
+        df = df.merge(right.reset_index(), on=keys, how="left", copy=False)
+        left = None
+    return pd.concat([df, *parts], axis=1) if parts else df
+
+
+def _merge_stacked(
+    frames: Sequence[pd.DataFrame], merge: Callable[[pd.DataFrame], pd.DataFrame]
+) -> list[pd.DataFrame]:
+    """
+    Run a row-wise ``merge`` once over the stacked ``frames`` and split it back,
+    so each right-hand table is prepared and hashed once for all of them. Each
+    part keeps its own columns and dtypes plus the merged-in columns.
+    Only for merges whose right-hand columns don't collide with either part's.
+    """
+    stacked = pd.concat([f.assign(_part=i) for i, f in enumerate(frames)], ignore_index=True)
+    base_cols = set(stacked.columns)
+    merged = merge(stacked)
+    added = [c for c in merged.columns if c not in base_cols]
+    part = merged.pop("_part").to_numpy()
+    return [
+        merged.loc[part == i, [*f.columns, *added]].reset_index(drop=True).astype(f.dtypes.to_dict())
+        for i, f in enumerate(frames)
+    ]
+
+
+def _unique_on(right: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """
+    The merge(validate="m:1") contract, checked on the small right-hand table only:
+    pandas' validate also hashes the (large) left keys, which costs more than the merge.
+    """
+    if right.duplicated(keys).any():
+        raise pd.errors.MergeError(f"Merge keys are not unique in right dataset {keys}")
+    return right
 
 
 def _merge_defense_context(df: pd.DataFrame, defense: pd.DataFrame, script: pd.DataFrame, allowance: pd.DataFrame) -> pd.DataFrame:
+    # Rename the (small) right-hand key instead of merging left_on/right_on and
+    # dropping it after: no team_abbr_x/_y collision and no extra full-frame drop.
+    # _unique_on pins the groupby-built tables to one row per key, so a
+    # regression there fails loudly instead of fanning out feature rows.
+    opp = {"team_abbr": "opponent_team_abbr"}
     if not defense.empty:
-        df = df.merge(
-            defense,
-            left_on=["opponent_team_abbr", "season", "week"],
-            right_on=["team_abbr", "season", "week"],
-            how="left",
-        ).drop(columns=["team_abbr"], errors="ignore")
+        keys = ["opponent_team_abbr", "season", "week"]
+        df = df.merge(_unique_on(defense.rename(columns=opp), keys), on=keys, how="left", copy=False)
     if not allowance.empty:
         df = df.merge(
-            allowance,
-            left_on=["opponent_team_abbr", "season"],
-            right_on=["team_abbr", "season"],
-            how="left",
-        ).drop(columns=["team_abbr"], errors="ignore")
-    if not script.empty:
-        df = df.merge(
-            script,
-            left_on=["team_abbr", "season", "week"],
-            right_on=["team_abbr", "season", "week"],
+            allowance.rename(columns=opp),
+            on=["opponent_team_abbr", "season"],
             how="left",
+            copy=False,
         )
+    if not script.empty:
+        keys = ["team_abbr", "season", "week"]
+        df = df.merge(_unique_on(script, keys), on=keys, how="left", copy=False)
     return df
 
 
@@ -604,6 +973,7 @@ def _merge_betting_weather_qb(
             ],
             on="game_id",
             how="left",
+            copy=False,
         )
     if not props.empty:
         df = df.merge(
@@ -612,65 +982,75 @@ def _merge_betting_weather_qb(
             ),
             on=["player_id", "game_id"],
             how="left",
+            copy=False,
         )
     if not weather.empty:
-        df = df.merge(weather, on="game_id", how="left")
+        df = df.merge(_unique_on(weather, ["game_id"]), on="game_id", how="left", copy=False)
     if not qb.empty:
-        df = df.merge(
-            qb,
-            left_on=["team_id", "season", "week"],
-            right_on=["team_id", "season", "week"],
-            how="left",
-        )
+        keys = ["team_id", "season", "week"]
+        df = df.merge(_unique_on(qb, keys), on=keys, how="left", copy=False)
     return df
 
 
+def _rest_days(team_id: pd.Series, date: pd.Series) -> np.ndarray:
+    """Days since the team's previous game, diffed over (team, date) in date order."""
+    keys = pd.DataFrame({"team_id": team_id.to_numpy(), "date": date.to_numpy()})
+    games = keys.drop_duplicates().sort_values(["team_id", "date"])
+    games["rest_days"] = games.groupby("team_id", sort=False)["date"].diff().dt.days
+    return keys.merge(games, how="left", on=["team_id", "date"])["rest_days"].to_numpy()
+
+
+def _fill_numeric(df: pd.DataFrame, cols: Iterable[str]) -> None:
+    """
+    In place: ``cols`` as numbers with 0 for missing/unparseable values (absent
+    columns become 0). Columns that already load numeric skip ``to_numeric``,
+    and ones without NaNs skip the fill, so clean SQL columns are not copied.
+    """
+    for c in cols:
+        if c not in df.columns:
+            df[c] = 0
+            continue
+        s = df[c]
+        clean = pd.api.types.is_numeric_dtype(s) and not s.hasnans
+        if not clean:
+            df[c] = pd.to_numeric(s, errors="coerce").fillna(0)
+
+
 def _compute_derived(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Adds columns to df in place (callers rebind the result); skipping the
+    # defensive copy avoids doubling the feature matrix in memory.
     if "team_proe" not in df.columns:
         df["team_proe"] = 0
     for col in ["receiving_targets", "receptions", "receiving_yards", "team_id", "season", "week"]:
         if col not in df.columns:
             df[col] = 0
-    df["spread_home_value"] = (
-        pd.to_numeric(df["spread_home_value"], errors="coerce").fillna(0)
-        if "spread_home_value" in df.columns
-        else 0
-    )
-    df["total_value"] = pd.to_numeric(df["total_value"], errors="coerce").fillna(0) if "total_value" in df.columns else 0
-    df["is_wind_cold"] = (
-        pd.to_numeric(df["is_wind_cold"], errors="coerce").fillna(0) if "is_wind_cold" in df.columns else 0
-    )
-    df["wind_speed"] = (
-        pd.to_numeric(df["wind_speed"], errors="coerce").fillna(0) if "wind_speed" in df.columns else 0
-    )
-    df["adv_avg_intended_air_yards"] = (
-        pd.to_numeric(df["adv_avg_intended_air_yards"], errors="coerce").fillna(0)
-        if "adv_avg_intended_air_yards" in df.columns
-        else 0
-    )
+    _fill_numeric(df, ("spread_home_value", "total_value", "is_wind_cold", "wind_speed", "adv_avg_intended_air_yards"))
     df["label_receiving_yards"] = df.get("receiving_yards")
     df["target_share"] = df["receiving_targets"] / df.groupby(["team_id", "season", "week"])["receiving_targets"].transform("sum")
     df["air_yards_est"] = df["receiving_targets"] * df["adv_avg_intended_air_yards"]
     df["air_yards_share"] = df["adv_share_air_yards"]
     df["wopr"] = 1.5 * df["target_share"] + 0.7 * df["air_yards_share"]
-    df["racr"] = df["receiving_yards"] / df["air_yards_est"].replace(0, np.nan)
-    df["catch_rate"] = df["receptions"] / df["receiving_targets"].replace(0, np.nan)
+    df["racr"] = _safe_div(df["receiving_yards"], df["air_yards_est"])
+    df["catch_rate"] = _safe_div(df["receptions"], df["receiving_targets"])
     df["yac_oe"] = df["adv_yac_aoe"]
     df = df.sort_values(["player_id", "season", "week"])
-    df["games_played_prior"] = df.groupby(["player_id", "season"]).cumcount()
-    df["targets_cum"] = df.groupby(["player_id", "season"])["receiving_targets"].cumsum().shift(1)
-    df["rec_yards_cum"] = df.groupby(["player_id", "season"])["receiving_yards"].cumsum().shift(1)
-    df["targets_per_game_prior"] = df["targets_cum"] / df["games_played_prior"].replace(0, np.nan)
-    df["rec_yards_per_game_prior"] = df["rec_yards_cum"] / df["games_played_prior"].replace(0, np.nan)
-    df["rec_yards_last3_avg"] = df.groupby(["player_id", "season"])["receiving_yards"].transform(lambda x: x.rolling(3).mean().shift(1))
-    df["targets_last3_avg"] = df.groupby(["player_id", "season"])["receiving_targets"].transform(lambda x: x.rolling(3).mean().shift(1))
-    df["yards_per_target_prior"] = df["rec_yards_cum"] / df["targets_cum"].replace(0, np.nan)
-    df["rest_days"] = pd.to_datetime(df.get("date")).groupby(df["team_id"]).diff().dt.days
+    # One boundary scan over the sorted (player, season) runs feeds every prior-game stat.
+    start = _run_starts(df["player_id"].to_numpy(), df["season"].to_numpy())
+    targets = df["receiving_targets"].to_numpy(dtype=float)
+    yards = df["receiving_yards"].to_numpy(dtype=float)
+    df["games_played_prior"] = np.arange(len(df)) - start
+    df["targets_cum"] = _prior_cumsum(targets, start)
+    df["rec_yards_cum"] = _prior_cumsum(yards, start)
+    df["targets_per_game_prior"] = _safe_div(df["targets_cum"], df["games_played_prior"])
+    df["rec_yards_per_game_prior"] = _safe_div(df["rec_yards_cum"], df["games_played_prior"])
+    df["rec_yards_last3_avg"] = _prior_window_mean(yards, start, 3)
+    df["targets_last3_avg"] = _prior_window_mean(targets, start, 3)
+    df["yards_per_target_prior"] = _safe_div(df["rec_yards_cum"], df["targets_cum"])
+    df["rest_days"] = _rest_days(df["team_id"], _as_dates(df["date"]))
     df["rest_days"] = df["rest_days"].fillna(df["rest_days"].median())
     df["log_week"] = np.log1p(df["week"])
     df["season_week_index"] = df["season"] * 100 + df["week"]
-    df["script_volatility"] = df.groupby("team_id")["team_proe"].transform(lambda x: x.rolling(4).std())
+    df["script_volatility"] = _grouped_roll(df, "team_id", "team_proe", 4, stat="std")
     df["team_spread"] = np.where(df["is_home"] == 1, df["spread_home_value"], -df["spread_home_value"])
     df["team_spread_abs"] = df["team_spread"].abs()
     df["implied_spread"] = df["team_spread"]
@@ -679,12 +1059,8 @@ def _compute_derived(df: pd.DataFrame) -> pd.DataFrame:
     df["prop_edge_pct"] = 0.0
     df["neutral_pace"] = df.get("neutral_pace")
     df["neutral_pass_rate"] = df.get("neutral_pass_rate")
-    df["wind_pass_interaction"] = pd.to_numeric(df.get("wind_speed"), errors="coerce") * pd.to_numeric(
-        df.get("adv_avg_intended_air_yards"), errors="coerce"
-    )
-    df["cold_wind_interaction"] = df.get("is_wind_cold") * pd.to_numeric(
-        df.get("adv_avg_intended_air_yards"), errors="coerce"
-    )
+    df["wind_pass_interaction"] = df["wind_speed"] * df["adv_avg_intended_air_yards"]
+    df["cold_wind_interaction"] = df["is_wind_cold"] * df["adv_avg_intended_air_yards"]
     return df.replace([np.inf, -np.inf], np.nan)
 
 
@@ -867,35 +1243,45 @@ def build_feature_matrices(
     engine: Engine,
     seasons: Sequence[int],
     playerid_csv: str,
+    cache_dir: Optional[str] = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    lookups = load_player_lookup(engine, playerid_csv)
-    external = load_external_data(seasons)
+    external = load_external_data(seasons, cache_dir=cache_dir)
+    # One pooled connection serves every read in the build.
+    with engine.connect() as conn:
+        lookups = load_player_lookup(conn, playerid_csv)
+        allowance = _defense_allowance(conn, seasons, lookups)
+        adv_recv, adv_pass = load_advanced(conn, seasons)
+        odds, props = load_betting(conn, seasons)
+        train = build_base_training(conn, seasons)
+        inf = build_inference_candidates(conn, seasons)
+
     defense = _aggregate_defense(external.pbp)
     script = _aggregate_game_script(external.pbp)
     receiver_pbp = _aggregate_receiver_pbp(external.pbp, lookups)
     weather = _aggregate_weather(external.pbp)
-    allowance = _defense_allowance(engine, seasons, lookups)
-    adv_recv, adv_pass = load_advanced(engine, seasons)
-    odds, props = load_betting(engine, seasons)
     qb = _qb_features(adv_pass)
 
-    train = build_base_training(engine, seasons)
-    inf = build_inference_candidates(engine, seasons)
-
     train = _attach_team_abbr(train, lookups)
     inf = _attach_team_abbr(inf, lookups)
 
-    train = _merge_player_features(train, adv_recv, receiver_pbp, external.snap_counts, external.ngs, external.depth, lookups)
-    inf = _merge_player_features(inf, adv_recv, receiver_pbp, external.snap_counts, external.ngs, external.depth, lookups)
-
-    train = _merge_defense_context(train, defense, script, allowance)
-    inf = _merge_defense_context(inf, defense, script, allowance)
+    train, inf = _merge_stacked(
+        (train, inf),
+        lambda df: _merge_defense_context(
+            _merge_player_features(
+                df, adv_recv, receiver_pbp, external.snap_counts, external.ngs, external.depth, lookups
+            ),
+            defense,
+            script,
+            allowance,
+        ),
+    )
 
     train = _merge_betting_weather_qb(train, odds, props, weather, qb)
     inf = _merge_betting_weather_qb(inf, odds, props, weather, qb)
 
-    train = _compute_derived(train)
-    inf = _compute_derived(inf)
+    # Narrow the derived frames before the rolling stage sorts (copies) every column.
+    train = downcast_numeric(_compute_derived(train))
+    inf = downcast_numeric(_compute_derived(inf))
 
     roll_cols = [
         "snap_pct",
@@ -932,15 +1318,26 @@ def persist_features(
     train_table: str = "features_wr_receiving_training_v2",
     inf_table: str = "features_wr_receiving_week18_v2",
 ) -> None:
-    train.to_sql(train_table, engine, if_exists="replace", index=False)
-    inf.to_sql(inf_table, engine, if_exists="replace", index=False)
+    # Postgres: COPY each chunk instead of parameterized INSERTs; other backends keep to_sql's default.
+    method = copy_rows_method if engine.dialect.name == "postgresql" else None
+    train.to_sql(train_table, engine, if_exists="replace", index=False, method=method, chunksize=_PERSIST_CHUNKSIZE)
+    inf.to_sql(inf_table, engine, if_exists="replace", index=False, method=method, chunksize=_PERSIST_CHUNKSIZE)
+
+
+def _ingestion_engine(uri: str) -> Engine:
+    """Engine with a pre-pinged QueuePool; psycopg2 also batches executemany (to_sql)."""
+    kwargs: dict = {"poolclass": QueuePool, "pool_size": 10, "pool_pre_ping": True}
+    url = make_url(uri)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2":
+        kwargs["executemany_mode"] = "values_plus_batch"
+    return create_engine(url, **kwargs)
 
 
 def get_engine(db_uri: Optional[str] = None) -> Engine:
     uri = db_uri or os.getenv("SUPABASE_DB_URI") or os.getenv("DB_URI")
     if not uri:
         raise RuntimeError("Missing DB URI. Set SUPABASE_DB_URI or DB_URI.")
-    return create_engine(uri)
+    return _ingestion_engine(uri)
 
 
 __all__ = [
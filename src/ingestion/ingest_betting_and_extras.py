@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Iterable, Optional, Dict
 from datetime import datetime, timezone
 from src.database.supabase_client import SupabaseClient
@@ -29,6 +30,9 @@ PROP_MAP = {
     # No milestones per request
 }
 
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
 def _chunked(items: Iterable[Any], size: int) -> Iterable[list[Any]]:
     buf = []
     for it in items:
@@ -39,32 +43,25 @@ def _chunked(items: Iterable[Any], size: int) -> Iterable[list[Any]]:
     if buf:
         yield buf
 
-def _dedupe(rows: list[dict[str, Any]], keys: list[str]) -> list[dict[str, Any]]:
-    seen = {}
-    for r in rows:
-        k = tuple(r.get(f) for f in keys)
-        seen[k] = r
-    return list(seen.values())
+def _dedupe(rows: Iterable[dict[str, Any]], keys: list[str]) -> list[dict[str, Any]]:
+    # Last row per key wins, in first-seen key order (a re-assigned dict key keeps its slot).
+    return list({tuple([r.get(f) for f in keys]): r for r in rows}.values())
+
+def _prop_priority(row: dict[str, Any]) -> Optional[int]:
+    """
+    VENDOR_PRIORITY rank of a raw prop, or None if it should be skipped:
+    vendor not in our priority list, or not a STRICT over/under market.
+    (No DST check: the props endpoint no longer returns the player object.)
+    """
+    priority = VENDOR_PRIORITY.get((row.get("vendor") or row.get("bookmaker") or "").lower())
+    if priority is None or (row.get("market") or {}).get("type") != "over_under":
+        return None
+    return priority
 
 def is_valid_prop(row: dict[str, Any]) -> bool:
-    # 1. Vendor Check: Only allow vendors in our priority list
-    vendor = (row.get("vendor") or row.get("bookmaker") or "").lower()
-    if vendor not in VENDOR_PRIORITY:
-        return False
-        
-    # 2. Defense check (skip DST) - Note: API may not have position data in props endpoint
-    # Removing this check since player object is no longer returned
-        
-    # 3. Market Type: STRICT Over/Under Only
-    market = row.get("market") or {}
-    m_type = market.get("type")
-    
-    if m_type == "over_under":
-        return True
-        
-    return False
+    return _prop_priority(row) is not None
 
-def map_player_prop(row: dict[str, Any]) -> dict[str, Any]:
+def map_player_prop(row: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     game_id = row.get("game_id")
     raw_type = row.get("prop_type")
     db_prop_type = PROP_MAP.get(raw_type)
@@ -91,48 +88,39 @@ def map_player_prop(row: dict[str, Any]) -> dict[str, Any]:
         "line_value": row.get("line_value"),
         "over_odds": market.get("over_odds"),
         "under_odds": market.get("under_odds"),
-        "updated_at": row.get("updated_at") or datetime.now(timezone.utc).isoformat()
+        "updated_at": row.get("updated_at") or now or _now_iso()
     }
 
-def _get_best_props(props_list: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+def _get_best_props(props_list: Iterable[dict[str, Any]], *, now: Optional[str] = None) -> list[dict[str, Any]]:
     """
     Deduplicates props. If multiple vendors offer the same prop for the same player,
     keep ONLY the one with the highest vendor priority (DraftKings > FanDuel > etc).
+    Winners are picked from the raw rows; only they go through map_player_prop.
     """
-    best_map: Dict[str, dict] = {} # Key: "player_id|prop_type"
+    best_map: Dict[tuple, tuple[int, dict]] = {} # Key: (player_id, prop_type)
+    db_prop_type = PROP_MAP.get
 
     for row in props_list:
-        # Validate first
-        if not is_valid_prop(row):
+        # Validate first; the vendor rank doubles as the validity check
+        priority = _prop_priority(row)
+        if priority is None:
             continue
-            
-        mapped = map_player_prop(row)
-        if not mapped:
+
+        prop_type = db_prop_type(row.get("prop_type"))
+        player_id = row.get("player_id")
+        if not prop_type or not player_id:
             continue
 
-        player_id = mapped["player_id"]
-        prop_type = mapped["prop_type"]
-        vendor = mapped["vendor"]
-        
-        # Unique Key for this prop
-        key = f"{player_id}|{prop_type}"
-        
-        current_priority = VENDOR_PRIORITY.get(vendor, 99)
-        
-        # Logic: If we haven't seen this prop, OR this vendor is higher priority (lower number)
-        # than what we have stored, replace it.
-        if key not in best_map:
-            best_map[key] = mapped
-        else:
-            existing_vendor = best_map[key]["vendor"]
-            existing_priority = VENDOR_PRIORITY.get(existing_vendor, 99)
-            
-            if current_priority < existing_priority:
-                best_map[key] = mapped # Upgrade to better vendor
-
-    return list(best_map.values())
-
-def map_team_season_stats(row: dict[str, Any], season: int) -> dict[str, Any]:
+        key = (player_id, prop_type)
+
+        # First seen wins ties; a higher-priority vendor (lower number) replaces it.
+        held = best_map.get(key)
+        if held is None or priority < held[0]:
+            best_map[key] = (priority, row)
+
+    return [map_player_prop(row, now=now) for _, row in best_map.values()]
+
+def map_team_season_stats(row: dict[str, Any], season: int, *, now: Optional[str] = None) -> dict[str, Any]:
     # Inject season manually to avoid null errors
     row_season = row.get("season") or season
     t = row.get("team") or {}
@@ -147,20 +135,20 @@ def map_team_season_stats(row: dict[str, Any], season: int) -> dict[str, Any]:
         "opp_total_points": row.get("opp_total_points"),
         "opp_sacks": row.get("opp_sacks"),
         "stats_json": row, # Dump full data for safety
-        "updated_at": row.get("updated_at") or datetime.now(timezone.utc).isoformat()
+        "updated_at": row.get("updated_at") or now or _now_iso()
     }
 
-def map_injury(r: dict[str, Any]) -> dict[str, Any]:
+def map_injury(r: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     p = r.get("player") or {}
     return {
         "player_id": p.get("id") or r.get("player_id"),
         "status": r.get("status"),
         "comment": r.get("comment"),
         "injury_date": r.get("date"),
-        "updated_at": r.get("updated_at") or datetime.now(timezone.utc).isoformat()
+        "updated_at": r.get("updated_at") or now or _now_iso()
     }
 
-def map_standing(r: dict[str, Any]) -> dict[str, Any]:
+def map_standing(r: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     t = r.get("team") or {}
     return {
         "team_id": t.get("id"),
@@ -171,10 +159,10 @@ def map_standing(r: dict[str, Any]) -> dict[str, Any]:
         "playoff_seed": r.get("playoff_seed"),
         "points_for": r.get("points_for"),
         "points_against": r.get("points_against"),
-        "updated_at": r.get("updated_at") or datetime.now(timezone.utc).isoformat()
+        "updated_at": r.get("updated_at") or now or _now_iso()
     }
 
-def map_game_odds(r: dict[str, Any]) -> dict[str, Any]:
+def map_game_odds(r: dict[str, Any], *, now: Optional[str] = None) -> dict[str, Any]:
     """Map game-level betting odds (spread, total) from DraftKings only"""
     return {
         "id": r.get("id"),
@@ -189,9 +177,49 @@ def map_game_odds(r: dict[str, Any]) -> dict[str, Any]:
         "total_under_odds": r.get("total_under_odds"),
         "moneyline_home_odds": r.get("moneyline_home_odds"),
         "moneyline_away_odds": r.get("moneyline_away_odds"),
-        "updated_at": r.get("updated_at") or datetime.now(timezone.utc).isoformat()
+        "updated_at": r.get("updated_at") or now or _now_iso()
     }
 
+def _ingest_best_props(
+    *,
+    supabase: SupabaseClient,
+    bdl: BallDontLieNFLClient,
+    game_ids: list[int],
+    batch_size: int,
+    max_workers: int,
+    now: Optional[str] = None,
+) -> int:
+    """
+    The props endpoint takes one game per request, so games are fetched (and
+    deduped to the best vendor line) on a thread pool sharing the client's rate
+    limiter; upserts stay on the calling thread, packing several games per batch.
+    """
+    # We request ALL priority vendors from the API
+    api_vendors = list(VENDOR_PRIORITY.keys())
+    upserted = 0
+
+    def _fetch_best(gid: int) -> list[dict[str, Any]]:
+        # Fetch RAW props from all accepted vendors, keep only the single best line per prop
+        return _get_best_props(bdl.iter_player_props(game_id=gid, vendors=api_vendors), now=now)
+
+    def _completed(futures: dict[Any, int]) -> Iterable[dict[str, Any]]:
+        for i, fut in enumerate(as_completed(futures), 1):
+            try:
+                yield from fut.result()
+            except Exception as e:
+                logger.error(f"Props error game {futures[fut]}: {e}")
+            if i % 10 == 0:
+                logger.info(f"Processed {i}/{len(futures)} games. Props: {upserted}")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(_fetch_best, gid): gid for gid in game_ids}
+        for chunk in _chunked(_completed(futures), batch_size):
+            try:
+                upserted += supabase.upsert("nfl_player_props", chunk, on_conflict="id")
+            except Exception as e:
+                logger.error(f"Props upsert error ({len(chunk)} rows): {e}")
+    return upserted
+
 def ingest_extras(
     *,
     supabase: SupabaseClient,
@@ -199,8 +227,11 @@ def ingest_extras(
     seasons: list[int],
     dates: Optional[list[str]] = None,
     batch_size: int = 500,
+    max_workers: int = 8,
 ) -> dict[str, int]:
     logger.info(f"Starting extras ingestion for seasons={seasons}...")
+    # One timestamp for the run instead of a clock read per mapped row.
+    now = _now_iso()
     
     stats_upserted = 0
     standings_upserted = 0
@@ -208,89 +239,81 @@ def ingest_extras(
     props_upserted = 0
     game_odds_upserted = 0
 
-    # 1. Fetch Games for IDs (Season wide or specific dates)
+    # 1. Fetch Games for IDs (Season wide or specific dates); only the IDs are kept,
+    # page by page, rather than every game dict
     game_ids = []
     try:
         logger.info("Fetching game IDs...")
-        all_games = list(bdl.iter_games(seasons=seasons))
-        
-        if dates:
-            wanted = set(dates)
-            games = [g for g in all_games if str(g.get("date","")).split("T")[0] in wanted]
-        else:
-            games = all_games
-            
-        game_ids = [g["id"] for g in games if g.get("id")]
+        wanted = set(dates) if dates else None
+        game_ids = [
+            g["id"]
+            for g in bdl.iter_games(seasons=seasons)
+            if g.get("id") and (wanted is None or str(g.get("date", "")).split("T")[0] in wanted)
+        ]
         logger.info(f"Found {len(game_ids)} games to process")
     except Exception as e:
         logger.error(f"Failed to fetch games: {e}")
 
-    for season in seasons:
-        # Team Stats
-        try:
-            rows = []
-            for r in bdl.iter_team_season_stats(season=season):
-                rows.append(map_team_season_stats(r, season))
-            
-            if rows:
-                deduped = _dedupe(rows, ["team_id", "season", "postseason"])
-                for chunk in _chunked(deduped, batch_size):
-                    stats_upserted += supabase.upsert("nfl_team_season_stats", chunk, on_conflict="team_id,season,postseason")
-        except Exception as e:
-            logger.error(f"Team stats error: {e}")
+    # Team Stats & Standings: each (stage, season) is fetched on the pool (the shared
+    # rate limiter keeps request spacing); upserts stay on this thread.
+    def _team_stats(season: int) -> list[dict[str, Any]]:
+        rows = (map_team_season_stats(r, season, now=now) for r in bdl.iter_team_season_stats(season=season))
+        return _dedupe(rows, ["team_id", "season", "postseason"])
 
-        # Standings
-        try:
-            for chunk in _chunked((map_standing(r) for r in bdl.iter_standings(season=season)), batch_size):
-                standings_upserted += supabase.upsert("nfl_team_standings", chunk, on_conflict="team_id,season")
-        except Exception as e:
-             logger.error(f"Standings error: {e}")
-
-        # Player Props (Game Loop with Priority Filter)
-        if game_ids:
-            logger.info(f"Processing props for {len(game_ids)} games...")
-            # We request ALL priority vendors from the API
-            api_vendors = list(VENDOR_PRIORITY.keys())
-            
-            for i, gid in enumerate(game_ids):
-                try:
-                    # 1. Fetch RAW props from all accepted vendors
-                    raw_props = list(bdl.iter_player_props(game_id=gid, vendors=api_vendors))
-                    
-                    # 2. Filter & Deduplicate (Keep only the single best line per prop)
-                    best_props = _get_best_props(raw_props)
-                    
-                    if best_props:
-                        supabase.upsert("nfl_player_props", best_props, on_conflict="id")
-                        props_upserted += len(best_props)
-                    
-                    if (i+1) % 10 == 0:
-                        logger.info(f"Processed {i+1}/{len(game_ids)} games. Props: {props_upserted}")
-                except Exception as e:
-                    logger.error(f"Props error game {gid}: {e}")
-        
-        # Game Odds (Spreads, Totals) - DraftKings only
-        if game_ids:
-            logger.info(f"Fetching game odds (spreads/totals) for {len(game_ids)} games...")
+    def _standings(season: int) -> list[dict[str, Any]]:
+        return [map_standing(r, now=now) for r in bdl.iter_standings(season=season)]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {}
+        for season in seasons:
+            futures[pool.submit(_team_stats, season)] = ("Team stats", season)
+            futures[pool.submit(_standings, season)] = ("Standings", season)
+        for fut in as_completed(futures):
+            stage, season = futures[fut]
             try:
-                # Fetch odds for all games at once
-                game_odds_raw = list(bdl.iter_betting_odds(game_ids=game_ids))
-                logger.info(f"Fetched {len(game_odds_raw)} raw odds records")
-                
-                # Filter for DraftKings only
-                dk_odds = [map_game_odds(r) for r in game_odds_raw if (r.get("vendor") or "").lower() == "draftkings"]
-                
-                if dk_odds:
-                    # Insert/update game odds - using id as natural key
-                    supabase.upsert("nfl_betting_odds", dk_odds, on_conflict="id")
-                    game_odds_upserted += len(dk_odds)
-                    logger.info(f"Upserted {len(dk_odds)} DraftKings game odds")
+                rows = fut.result()
+                for chunk in _chunked(rows, batch_size):
+                    if stage == "Team stats":
+                        stats_upserted += supabase.upsert("nfl_team_season_stats", chunk, on_conflict="team_id,season,postseason")
+                    else:
+                        standings_upserted += supabase.upsert("nfl_team_standings", chunk, on_conflict="team_id,season")
             except Exception as e:
-                logger.error(f"Game odds error: {e}")
+                logger.error(f"{stage} error (season {season}): {e}")
+
+    # Game Odds (Spreads, Totals) - DraftKings only. game_ids already spans every
+    # season, so this runs once; pages are filtered/mapped and upserted in batches
+    # as they arrive instead of holding every vendor's odds in memory.
+    if game_ids:
+        logger.info(f"Fetching game odds (spreads/totals) for {len(game_ids)} games...")
+        try:
+            dk_odds = (
+                map_game_odds(r, now=now)
+                for r in bdl.iter_betting_odds(game_ids=game_ids)
+                if (r.get("vendor") or "").lower() == "draftkings"
+            )
+            for chunk in _chunked(dk_odds, batch_size):
+                # Insert/update game odds - using id as natural key
+                game_odds_upserted += supabase.upsert("nfl_betting_odds", chunk, on_conflict="id")
+            logger.info(f"Upserted {game_odds_upserted} DraftKings game odds")
+        except Exception as e:
+            logger.error(f"Game odds error: {e}")
+
+    # Player Props (Game Loop with Priority Filter). game_ids already spans every
+    # season, so this runs once rather than per season.
+    if game_ids:
+        logger.info(f"Processing props for {len(game_ids)} games...")
+        props_upserted = _ingest_best_props(
+            supabase=supabase,
+            bdl=bdl,
+            game_ids=game_ids,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            now=now,
+        )
 
     # Injuries
     try:
-        for chunk in _chunked((map_injury(r) for r in bdl.iter_injuries()), batch_size):
+        for chunk in _chunked((map_injury(r, now=now) for r in bdl.iter_injuries()), batch_size):
             injuries_upserted += supabase.upsert("nfl_injuries", chunk, on_conflict="player_id")
     except Exception as e:
         logger.error(f"Injuries error: {e}")
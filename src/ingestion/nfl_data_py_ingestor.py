@@ -12,9 +12,11 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
 from src.database.supabase_client import SupabaseClient
+from src.ingestion.nflverse_cache import cached_frame
 
 # Fix SSL certificate issue on macOS
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -26,9 +28,35 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _chunked(items: list[dict], size: int) -> Iterator[list[dict]]:
-    for i in range(0, len(items), size):
-        yield items[i : i + size]
+def _col(df: pd.DataFrame, name: str) -> Any:
+    """Column ``name``, or None (a null column) when the source frame lacks it."""
+    return df[name] if name in df.columns else None
+
+
+def _int_col(df: pd.DataFrame, name: str, default: Optional[int] = None) -> Any:
+    """Nullable-int column (truncating, like ``int()``), missing values -> ``default``."""
+    if name not in df.columns:
+        return default
+    col = np.trunc(pd.to_numeric(df[name], errors="coerce")).astype("Int64")
+    return col if default is None else col.fillna(default)
+
+
+def _float_col(df: pd.DataFrame, name: str, default: Optional[float] = None) -> Any:
+    if name not in df.columns:
+        return default
+    col = pd.to_numeric(df[name], errors="coerce")
+    return col if default is None else col.fillna(default)
+
+
+def _df_to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """Rows as dicts, with every missing value (NaN/NA/None) as None."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _iter_chunks_from_df(df: pd.DataFrame, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+    """Upsert batches sliced off the typed frame, so only one batch of dicts is alive at a time."""
+    for i in range(0, len(df), batch_size):
+        yield _df_to_records(df.iloc[i : i + batch_size])
 
 
 @dataclass(frozen=True)
@@ -41,7 +69,8 @@ class NFLPyIngestSummary:
 def ingest_player_id_mappings(
     *, 
     supabase: SupabaseClient, 
-    batch_size: int = 500
+    batch_size: int = 500,
+    cache_dir: Optional[str] = None,
 ) -> int:
     """
     Ingest player ID mappings from nfl_data_py.
@@ -50,29 +79,28 @@ def ingest_player_id_mappings(
     import nfl_data_py as nfl
     
     logger.info("Fetching player IDs from nfl_data_py...")
-    ids_df = nfl.import_ids()
-    
-    rows = []
-    for _, row in ids_df.iterrows():
-        # Skip rows without gsis_id (needed for PBP matching)
-        if pd.isna(row.get('gsis_id')):
-            continue
-            
-        rows.append({
-            "gsis_id": row.get("gsis_id"),
-            "name": row.get("name"),
-            "position": row.get("position"),
-            "team": row.get("team"),
-            "espn_id": int(row["espn_id"]) if pd.notna(row.get("espn_id")) else None,
-            "yahoo_id": int(row["yahoo_id"]) if pd.notna(row.get("yahoo_id")) else None,
-            "sleeper_id": row.get("sleeper_id") if pd.notna(row.get("sleeper_id")) else None,
-            "pfr_id": row.get("pfr_id") if pd.notna(row.get("pfr_id")) else None,
+    ids_df = cached_frame(cache_dir, "ids", (), nfl.import_ids)
+    
+    # Skip rows without gsis_id (needed for PBP matching)
+    ids_df = ids_df[ids_df["gsis_id"].notna()]
+    out = pd.DataFrame(
+        {
+            "gsis_id": ids_df["gsis_id"],
+            "name": _col(ids_df, "name"),
+            "position": _col(ids_df, "position"),
+            "team": _col(ids_df, "team"),
+            "espn_id": _int_col(ids_df, "espn_id"),
+            "yahoo_id": _int_col(ids_df, "yahoo_id"),
+            "sleeper_id": _col(ids_df, "sleeper_id"),
+            "pfr_id": _col(ids_df, "pfr_id"),
             "updated_at": _now_iso(),
-        })
+        },
+        index=ids_df.index,
+    )
     
-    logger.info("Upserting %d player ID mappings...", len(rows))
+    logger.info("Upserting %d player ID mappings...", len(out))
     upserted = 0
-    for chunk in _chunked(rows, batch_size):
+    for chunk in _iter_chunks_from_df(out, batch_size):
         upserted += supabase.upsert(
             "nfl_player_id_mapping", 
             chunk, 
@@ -88,6 +116,7 @@ def ingest_historic_game_lines(
     seasons: list[int],
     supabase: SupabaseClient,
     batch_size: int = 500,
+    cache_dir: Optional[str] = None,
 ) -> int:
     """
     Ingest historic betting lines from nfl_data_py schedules.
@@ -96,48 +125,48 @@ def ingest_historic_game_lines(
     import nfl_data_py as nfl
     
     logger.info("Fetching schedules for seasons %s...", seasons)
-    sched = nfl.import_schedules(seasons)
-    
-    rows = []
-    for _, row in sched.iterrows():
-        # Skip if no betting data
-        if pd.isna(row.get("spread_line")):
-            continue
-            
-        rows.append({
-            "nflverse_game_id": row.get("game_id"),
-            "season": int(row.get("season")),
-            "week": int(row.get("week")),
-            "game_type": row.get("game_type"),
-            "gameday": str(row.get("gameday")) if pd.notna(row.get("gameday")) else None,
-            "home_team": row.get("home_team"),
-            "away_team": row.get("away_team"),
-            "home_score": int(row["home_score"]) if pd.notna(row.get("home_score")) else None,
-            "away_score": int(row["away_score"]) if pd.notna(row.get("away_score")) else None,
-            "spread_line": float(row["spread_line"]) if pd.notna(row.get("spread_line")) else None,
-            "total_line": float(row["total_line"]) if pd.notna(row.get("total_line")) else None,
-            "over_odds": int(row["over_odds"]) if pd.notna(row.get("over_odds")) else None,
-            "under_odds": int(row["under_odds"]) if pd.notna(row.get("under_odds")) else None,
-            "home_moneyline": int(row["home_moneyline"]) if pd.notna(row.get("home_moneyline")) else None,
-            "away_moneyline": int(row["away_moneyline"]) if pd.notna(row.get("away_moneyline")) else None,
-            "home_spread_odds": int(row["home_spread_odds"]) if pd.notna(row.get("home_spread_odds")) else None,
-            "away_spread_odds": int(row["away_spread_odds"]) if pd.notna(row.get("away_spread_odds")) else None,
+    sched = cached_frame(cache_dir, "schedules", seasons, lambda: nfl.import_schedules(seasons))
+    
+    # Skip if no betting data
+    sched = sched[sched["spread_line"].notna()]
+    gameday = _col(sched, "gameday")
+    out = pd.DataFrame(
+        {
+            "nflverse_game_id": _col(sched, "game_id"),
+            "season": _int_col(sched, "season"),
+            "week": _int_col(sched, "week"),
+            "game_type": _col(sched, "game_type"),
+            "gameday": gameday.astype(str).where(gameday.notna()) if gameday is not None else None,
+            "home_team": _col(sched, "home_team"),
+            "away_team": _col(sched, "away_team"),
+            "home_score": _int_col(sched, "home_score"),
+            "away_score": _int_col(sched, "away_score"),
+            "spread_line": _float_col(sched, "spread_line"),
+            "total_line": _float_col(sched, "total_line"),
+            "over_odds": _int_col(sched, "over_odds"),
+            "under_odds": _int_col(sched, "under_odds"),
+            "home_moneyline": _int_col(sched, "home_moneyline"),
+            "away_moneyline": _int_col(sched, "away_moneyline"),
+            "home_spread_odds": _int_col(sched, "home_spread_odds"),
+            "away_spread_odds": _int_col(sched, "away_spread_odds"),
             # Weather and venue
-            "roof": row.get("roof") if pd.notna(row.get("roof")) else None,
-            "surface": row.get("surface") if pd.notna(row.get("surface")) else None,
-            "temp": int(row["temp"]) if pd.notna(row.get("temp")) else None,
-            "wind": int(row["wind"]) if pd.notna(row.get("wind")) else None,
-            "stadium": row.get("stadium") if pd.notna(row.get("stadium")) else None,
+            "roof": _col(sched, "roof"),
+            "surface": _col(sched, "surface"),
+            "temp": _int_col(sched, "temp"),
+            "wind": _int_col(sched, "wind"),
+            "stadium": _col(sched, "stadium"),
             # Extra context
-            "home_coach": row.get("home_coach") if pd.notna(row.get("home_coach")) else None,
-            "away_coach": row.get("away_coach") if pd.notna(row.get("away_coach")) else None,
-            "referee": row.get("referee") if pd.notna(row.get("referee")) else None,
+            "home_coach": _col(sched, "home_coach"),
+            "away_coach": _col(sched, "away_coach"),
+            "referee": _col(sched, "referee"),
             "updated_at": _now_iso(),
-        })
+        },
+        index=sched.index,
+    )
     
-    logger.info("Upserting %d game lines...", len(rows))
+    logger.info("Upserting %d game lines...", len(out))
     upserted = 0
-    for chunk in _chunked(rows, batch_size):
+    for chunk in _iter_chunks_from_df(out, batch_size):
         upserted += supabase.upsert(
             "nfl_game_lines",
             chunk,
@@ -153,6 +182,7 @@ def ingest_snap_counts(
     seasons: list[int],
     supabase: SupabaseClient,
     batch_size: int = 500,
+    cache_dir: Optional[str] = None,
 ) -> int:
     """
     Ingest weekly snap count data from nfl_data_py.
@@ -160,39 +190,44 @@ def ingest_snap_counts(
     import nfl_data_py as nfl
     
     logger.info("Fetching snap counts for seasons %s...", seasons)
-    snaps = nfl.import_snap_counts(seasons)
-    
-    rows = []
-    for _, row in snaps.iterrows():
-        # Need player identification
-        if pd.isna(row.get("pfr_player_id")):
-            continue
-            
-        rows.append({
-            "pfr_player_id": row.get("pfr_player_id"),
-            "player_name": row.get("player"),
-            "season": int(row.get("season")),
-            "week": int(row.get("week")),
-            "game_type": row.get("game_type") if pd.notna(row.get("game_type")) else "REG",
-            "team": row.get("team"),
-            "position": row.get("position"),
-            "offense_snaps": int(row["offense_snaps"]) if pd.notna(row.get("offense_snaps")) else 0,
-            "offense_pct": float(row["offense_pct"]) if pd.notna(row.get("offense_pct")) else 0.0,
-            "defense_snaps": int(row["defense_snaps"]) if pd.notna(row.get("defense_snaps")) else 0,
-            "defense_pct": float(row["defense_pct"]) if pd.notna(row.get("defense_pct")) else 0.0,
-            "st_snaps": int(row["st_snaps"]) if pd.notna(row.get("st_snaps")) else 0,
-            "st_pct": float(row["st_pct"]) if pd.notna(row.get("st_pct")) else 0.0,
+    snaps = cached_frame(cache_dir, "snap_counts", seasons, lambda: nfl.import_snap_counts(seasons))
+    
+    # Need player identification
+    snaps = snaps[snaps["pfr_player_id"].notna()]
+    game_type = _col(snaps, "game_type")
+    out = pd.DataFrame(
+        {
+            "pfr_player_id": snaps["pfr_player_id"],
+            "player_name": _col(snaps, "player"),
+            "season": _int_col(snaps, "season"),
+            "week": _int_col(snaps, "week"),
+            "game_type": game_type.fillna("REG") if game_type is not None else "REG",
+            "team": _col(snaps, "team"),
+            "position": _col(snaps, "position"),
+            "offense_snaps": _int_col(snaps, "offense_snaps", 0),
+            "offense_pct": _float_col(snaps, "offense_pct", 0.0),
+            "defense_snaps": _int_col(snaps, "defense_snaps", 0),
+            "defense_pct": _float_col(snaps, "defense_pct", 0.0),
+            "st_snaps": _int_col(snaps, "st_snaps", 0),
+            "st_pct": _float_col(snaps, "st_pct", 0.0),
             "updated_at": _now_iso(),
-        })
+        },
+        index=snaps.index,
+    )
     
-    logger.info("Upserting %d snap count records...", len(rows))
+    logger.info("Upserting %d snap count records...", len(out))
     upserted = 0
-    for chunk in _chunked(rows, batch_size):
-        upserted += supabase.upsert(
-            "nfl_snap_counts",
-            chunk,
-            on_conflict="pfr_player_id,season,week"
-        )
+    upsert_frame = getattr(supabase, "upsert_frame", None)
+    if upsert_frame is not None:
+        # Direct Postgres sink (PostgresCopyClient): the typed frame goes in one COPY.
+        upserted = upsert_frame("nfl_snap_counts", out, on_conflict="pfr_player_id,season,week")
+    else:
+        for chunk in _iter_chunks_from_df(out, batch_size):
+            upserted += supabase.upsert(
+                "nfl_snap_counts",
+                chunk,
+                on_conflict="pfr_player_id,season,week"
+            )
     
     logger.info("Upserted nfl_snap_counts=%d", upserted)
     return upserted
@@ -206,29 +241,36 @@ def ingest_all(
     include_game_lines: bool = True,
     include_snap_counts: bool = True,
     batch_size: int = 500,
+    bulk_supabase: Optional[Any] = None,
+    cache_dir: Optional[str] = None,
 ) -> NFLPyIngestSummary:
     """
     Run all nfl_data_py ingestion.
+    ``bulk_supabase`` (e.g. PostgresCopyClient) takes the snap counts when given.
+    With ``cache_dir`` the nflverse downloads are kept as Parquet for a day
+    (the same cache the WR feature build uses).
     """
     player_ids = 0
     game_lines = 0
     snap_counts = 0
     
     if include_player_ids:
-        player_ids = ingest_player_id_mappings(supabase=supabase, batch_size=batch_size)
+        player_ids = ingest_player_id_mappings(supabase=supabase, batch_size=batch_size, cache_dir=cache_dir)
     
     if include_game_lines:
         game_lines = ingest_historic_game_lines(
             seasons=seasons, 
             supabase=supabase, 
-            batch_size=batch_size
+            batch_size=batch_size,
+            cache_dir=cache_dir,
         )
     
     if include_snap_counts:
         snap_counts = ingest_snap_counts(
             seasons=seasons,
-            supabase=supabase,
-            batch_size=batch_size
+            supabase=bulk_supabase or supabase,
+            batch_size=batch_size,
+            cache_dir=cache_dir,
         )
     
     return NFLPyIngestSummary(
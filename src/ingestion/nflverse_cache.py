@@ -0,0 +1,46 @@
+"""
+On-disk Parquet cache for nflverse downloads (the nfl_data_py importers).
+
+Shared by the WR feature build and the nfl_data_py ingestors, so a rerun within
+a day, or the other job asking for the same resource, skips the download and parse.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# In-season nflverse files change weekly; a day-old cached copy is fine for a rebuild.
+CACHE_TTL_SECONDS = 24 * 3600
+
+
+def cached_frame(
+    cache_dir: Optional[str | Path], name: str, seasons: Sequence[int], loader: Callable[[], pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    ``loader()``, or its Parquet copy under ``cache_dir`` while that is fresh.
+    Entries are keyed by ``name`` and the (sorted) seasons; season-less resources
+    pass ``seasons=()``. Without a Parquet engine (pyarrow/fastparquet) this just
+    calls the loader.
+    """
+    if not cache_dir:
+        return loader()
+    stem = "_".join([name, *map(str, sorted(seasons))])
+    path = Path(cache_dir) / f"{stem}.parquet"
+    if path.exists() and time.time() - path.stat().st_mtime < CACHE_TTL_SECONDS:
+        try:
+            return pd.read_parquet(path)
+        except Exception as exc:
+            logger.debug("Parquet cache read failed for %s: %s", path, exc)
+    df = loader()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression="zstd", index=False)
+    except Exception as exc:
+        logger.debug("Parquet cache write skipped for %s: %s", path, exc)
+    return df
@@ -38,7 +38,7 @@ def main():
         logger.error("Missing BallDontLie API Key")
         return
         
-    bdl = BallDontLieNFLClient(api_key=bdl_key)
+    bdl = BallDontLieNFLClient(api_key=bdl_key, cache_dir="data/bdl_cache")
     
     seasons = [2024, 2025] # Added 2024 for history
     
@@ -50,13 +50,22 @@ def main():
     
     # 2. Team Season Stats & Standings & Advanced
     logger.info("Ingesting Team Season Stats, Standings, Advanced...")
-    ingest_team_season_stats(seasons=seasons, supabase=sb, bdl=bdl)
+    # The wide / high-volume stats tables load via COPY when a direct Postgres URI is set.
+    bulk_sink = sb
+    db_uri = os.getenv("SUPABASE_DB_URI") or os.getenv("DB_URI")
+    if db_uri:
+        from sqlalchemy import create_engine
+
+        from src.database.pg_copy import PostgresCopyClient
+
+        bulk_sink = PostgresCopyClient(create_engine(db_uri))
+    ingest_team_season_stats(seasons=seasons, supabase=bulk_sink, bdl=bdl)
     ingest_standings(seasons=seasons, supabase=sb, bdl=bdl)
     ingest_stats_and_advanced(seasons=seasons, supabase=sb, bdl=bdl, include_advanced=True)
     
     # 3. Full Extra Stats (New coverage)
     logger.info("Ingesting Full Game/Season Stats...")
-    ingest_full_stats(seasons=seasons, supabase=sb, bdl=bdl)
+    ingest_full_stats(seasons=seasons, supabase=bulk_sink, bdl=bdl)
     
     # 4. Injuries
     logger.info("Ingesting Injuries...")
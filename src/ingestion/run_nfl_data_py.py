@@ -32,6 +32,16 @@ def main():
         service_role_key=os.getenv("SUPABASE_SERVICE_ROLE_KEY")
     )
     sb = SupabaseClient(cfg)
+
+    # Snap counts (the largest table here) load via COPY when a direct Postgres URI is set.
+    bulk_sink = sb
+    db_uri = os.getenv("SUPABASE_DB_URI") or os.getenv("DB_URI")
+    if db_uri:
+        from sqlalchemy import create_engine
+
+        from src.database.pg_copy import PostgresCopyClient
+
+        bulk_sink = PostgresCopyClient(create_engine(db_uri))
     
    # Ingest for 2024 and 2025 seasons
     seasons = [2024, 2025]
@@ -44,7 +54,9 @@ def main():
             supabase=sb,
             include_player_ids=True,
             include_game_lines=True,
-            include_snap_counts=True
+            include_snap_counts=True,
+            bulk_supabase=bulk_sink,
+            cache_dir="data/nfl_cache",
         )
         logger.info(f"✅ Complete! Player IDs: {result.player_ids_upserted}, Game Lines: {result.game_lines_upserted}, Snap Counts: {result.snap_counts_upserted}")
     except Exception as e:
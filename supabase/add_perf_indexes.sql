@@ -42,6 +42,10 @@ create index if not exists idx_pss_season_post_pass_yds
 create index if not exists idx_pss_season_post_team_pass_yds
   on public.nfl_player_season_stats (season, postseason, player_id, passing_yards desc);
 
+-- Injury full sync prunes rows not re-stamped by the latest run
+create index if not exists idx_injuries_updated_at
+  on public.nfl_injuries (updated_at);
+
 commit;
 
 
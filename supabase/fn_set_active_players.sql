@@ -0,0 +1,16 @@
+-- Set nfl_players.is_active from the full BallDontLie active list in one call.
+-- Used by ingest_active_players via POST /rest/v1/rpc/set_active_players.
+-- Players missing from `ids` are reset to false; only rows whose flag changes are written.
+
+create or replace function public.set_active_players(ids bigint[])
+returns integer
+language sql
+as $$
+  with changed as (
+    update public.nfl_players
+       set is_active = (id = any(ids))
+     where is_active is distinct from (id = any(ids))
+    returning 1
+  )
+  select count(*)::int from changed;
+$$;
@@ -1,16 +1,33 @@
+import gzip
+import json
+
 import pytest
 
-from src.database.supabase_client import SupabaseClient, SupabaseConfig
+from src.database.supabase_client import SupabaseClient, SupabaseConfig, SupabaseError
 from src.ingestion.balldontlie_client import BallDontLieError, BallDontLieNFLClient, RateLimiter
 from src.ingestion.balldontlie_ingestor import (
+    _chunked,
+    _prefetched,
+    _rows_with_keys,
+    _unique_rows,
+    ingest_active_players,
+    ingest_full_stats,
+    ingest_injuries,
+    ingest_odds,
+    ingest_player_props_filtered,
+    ingest_rosters,
     ingest_stats_and_advanced,
+    ingest_team_season_stats,
     map_adv_passing,
     map_adv_receiving,
     map_adv_rushing,
     map_game,
     map_player,
     map_team,
+    map_team_season_stat,
 )
+from src.ingestion.ingest_betting_and_extras import _get_best_props, _ingest_best_props, ingest_extras, is_valid_prop
+from src.ingestion.nfl_data_py_ingestor import ingest_player_id_mappings, ingest_snap_counts
 from src.web import queries_supabase
 
 
@@ -73,6 +90,7 @@ class StubResponse:
         self._json = json_body
         self.headers = {}
         self.text = str(json_body)
+        self.content = json.dumps(json_body).encode("utf-8")
 
     @property
     def ok(self):
@@ -500,3 +518,764 @@ def test_ingest_stats_and_advanced_skips_transient_bdl_errors_and_continues():
     assert "nfl_advanced_passing_stats" in tables
 
 
+
+
+def test_ingest_stats_and_advanced_dedupes_repeated_primary_keys():
+    class SB:
+        def __init__(self):
+            self.upserts = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.upserts.append((table, rows))
+            return len(rows)
+
+    class BDL:
+        def iter_advanced_receiving(self, *, season: int, week: int = 0, postseason: bool = False):
+            # Same player reported twice (e.g. overlapping pages) -> upserted once.
+            row = {"player": {"id": 10}, "season": season, "week": week, "postseason": postseason, "targets": 2}
+            return iter([dict(row), dict(row)])
+
+        def iter_advanced_rushing(self, *, season: int, week: int = 0, postseason: bool = False):
+            return iter([])
+
+        def iter_advanced_passing(self, *, season: int, week: int = 0, postseason: bool = False):
+            return iter([])
+
+    sb = SB()
+    ingest_stats_and_advanced(
+        seasons=[2024],
+        supabase=sb,  # type: ignore[arg-type]
+        bdl=BDL(),  # type: ignore[arg-type]
+        include_season_stats=False,
+        include_game_stats=False,
+        include_advanced=True,
+        advanced_weeks=[0],
+        advanced_include_postseason=False,
+        batch_size=50,
+    )
+    assert len(sb.upserts) == 1
+    assert len(sb.upserts[0][1]) == 1
+
+
+def test_postgres_copy_client_stages_and_merges_on_conflict():
+    import numpy as np
+    import pandas as pd
+
+    from src.database.pg_copy import PostgresCopyClient
+
+    class Cursor:
+        def __init__(self):
+            self.sql = []
+            self.copied = None
+
+        def execute(self, sql):
+            self.sql.append(sql)
+
+        def copy_expert(self, sql, buf):
+            self.sql.append(sql)
+            self.copied = buf.read()
+
+    class Raw:
+        def __init__(self):
+            self.cur = Cursor()
+            self.committed = False
+
+        def cursor(self):
+            return self.cur
+
+        def commit(self):
+            self.committed = True
+
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    class Engine:
+        def __init__(self):
+            self.raw = Raw()
+
+        def raw_connection(self):
+            return self.raw
+
+    eng = Engine()
+    n = PostgresCopyClient(eng).upsert(  # type: ignore[arg-type]
+        "nfl_games",
+        [{"id": 1, "status": "Final", "venue": None}, {"id": 2, "status": "", "venue": "X"}],
+        on_conflict="id",
+    )
+    assert n == 2
+    assert eng.raw.committed
+    create, copy, merge = eng.raw.cur.sql
+    assert 'LIKE "public"."nfl_games"' in create
+    assert copy.startswith('COPY "_stage_nfl_games" ("id", "status", "venue") FROM STDIN')
+    assert eng.raw.cur.copied.splitlines() == ["1,Final,\\N", "2,,X"]
+    assert 'ON CONFLICT ("id") DO UPDATE SET "status" = EXCLUDED."status", "venue" = EXCLUDED."venue"' in merge
+
+    eng = Engine()
+    n = PostgresCopyClient(eng).upsert(  # type: ignore[arg-type]
+        "nfl_games",
+        [{"id": 1, "status": "Old"}, {"id": 2, "status": "Final"}, {"id": 1, "status": "Final"}],
+        on_conflict="id",
+    )
+    assert n == 2
+    assert eng.raw.cur.copied.splitlines() == ["2,Final", "1,Final"]
+
+    eng = Engine()
+    frame = pd.DataFrame(
+        {"id": pd.array([1, 2, 1], dtype="Int64"), "status": ["Old", None, "Final"], "pct": [0.5, np.nan, 1.0]}
+    )
+    assert PostgresCopyClient(eng).upsert_frame("nfl_games", frame, on_conflict="id") == 2  # type: ignore[arg-type]
+    assert eng.raw.committed
+    assert eng.raw.cur.sql[1].startswith('COPY "_stage_nfl_games" ("id", "status", "pct") FROM STDIN')
+    assert eng.raw.cur.copied.splitlines() == ["2,\\N,\\N", "1,Final,1.0"]
+
+
+def test_copy_rows_method_copies_to_sql_chunk_on_pandas_connection():
+    from types import SimpleNamespace
+
+    from src.database.pg_copy import copy_rows_method
+
+    class Psycopg3Cursor:
+        def __init__(self):
+            self.sql = None
+            self.data = ""
+            self.closed = False
+
+        def copy(self, sql):
+            self.sql = sql
+            cur = self
+
+            class _Copy:
+                def __enter__(self):
+                    return self
+
+                def __exit__(self, *exc):
+                    return False
+
+                def write(self, data):
+                    cur.data += data
+
+            return _Copy()
+
+        def close(self):
+            self.closed = True
+
+    cur = Psycopg3Cursor()
+    conn = SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cur))
+    table = SimpleNamespace(name="features_wr", schema=None)
+    n = copy_rows_method(table, conn, ["player_id", "wopr", "is_home"], iter([(1, 0.5, True), (2, None, False)]))
+
+    assert n == 2 and cur.closed
+    assert cur.sql.startswith('COPY "features_wr" ("player_id", "wopr", "is_home") FROM STDIN WITH (FORMAT csv')
+    assert cur.data.splitlines() == ["1,0.5,true", "2,\\N,false"]
+
+def test_chunked_yields_independent_full_and_trailing_chunks():
+    chunks = list(_chunked(({"i": i} for i in range(5)), 2))
+    assert chunks == [[{"i": 0}, {"i": 1}], [{"i": 2}, {"i": 3}], [{"i": 4}]]
+    assert chunks[0] is not chunks[1]
+    assert list(_chunked(iter([]), 3)) == []
+
+
+def test_rows_with_keys_drops_rows_with_falsy_key_fields():
+    rows = [{"a": 1, "b": 2, "c": 3}, {"a": None, "b": 2, "c": 3}, {"a": 1, "b": 0, "c": 3}, {"a": 1, "b": 2, "c": None}]
+    assert list(_rows_with_keys(rows, ("a",))) == [rows[0], rows[2], rows[3]]
+    assert list(_rows_with_keys(rows, ("a", "b"))) == [rows[0], rows[3]]
+    assert list(_rows_with_keys(rows, ("a", "b", "c"))) == [rows[0]]
+
+
+def test_unique_rows_keeps_last_row_per_key_within_each_chunk():
+    rows = [
+        {"player_id": 1, "game_id": 9, "yds": 10},
+        {"player_id": 2, "game_id": 9, "yds": 5},
+        {"player_id": 1, "game_id": 9, "yds": 12},
+    ]
+    out = list(_unique_rows([rows, [{"player_id": 1, "game_id": 9, "yds": 14}]], ("player_id", "game_id")))
+    # Corrected rows win within a chunk; a repeat in a later chunk is still sent.
+    assert out == [[rows[2], rows[1]], [{"player_id": 1, "game_id": 9, "yds": 14}]]
+
+
+def test_supabase_upsert_gzips_large_bodies_only():
+    sess = StubSession([StubResponse(201, None), StubResponse(201, None)])
+    sb = SupabaseClient(
+        SupabaseConfig(url="https://x.supabase.co", service_role_key="k"),
+        session=sess,
+        gzip_min_bytes=1024,
+    )
+    small = [{"id": 1}]
+    large = [{"id": i, "name": "player"} for i in range(200)]
+    sb.upsert("nfl_players", small, on_conflict="id")
+    sb.upsert("nfl_players", large, on_conflict="id")
+
+    assert "Content-Encoding" not in sess.calls[0]["headers"]
+    assert json.loads(sess.calls[0]["data"]) == small
+    assert sess.calls[1]["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(sess.calls[1]["data"])) == large
+
+
+def test_supabase_upsert_sends_plain_json_by_default():
+    sess = StubSession([StubResponse(201, None)])
+    sb = SupabaseClient(SupabaseConfig(url="https://x.supabase.co", service_role_key="k"), session=sess)
+    large = [{"id": i, "name": "player"} for i in range(2000)]
+    sb.upsert("nfl_players", large, on_conflict="id")
+
+    assert "Content-Encoding" not in sess.calls[0]["headers"]
+    assert json.loads(sess.calls[0]["data"]) == large
+
+
+def test_supabase_upsert_skips_request_for_empty_rows():
+    sess = StubSession([])
+    sb = SupabaseClient(SupabaseConfig(url="https://x.supabase.co", service_role_key="k"), session=sess)
+    assert sb.upsert("nfl_players", [], on_conflict="id") == 0
+    assert sb.upsert("nfl_players", None, on_conflict="id") == 0
+    assert sess.calls == []
+
+
+def test_ingest_player_props_filtered_keeps_over_under_and_anytime_td_only():
+    class SB:
+        def __init__(self):
+            self.upserts = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.upserts.append((table, rows))
+            return len(rows)
+
+    class BDL:
+        def iter_player_props(self, *, game_id, vendors=None):
+            return iter(
+                [
+                    {"id": 1, "game_id": game_id, "player_id": 10, "prop_type": "rushing_yards", "market": {"type": "over_under", "over_odds": -110}},
+                    {"id": 2, "game_id": game_id, "player_id": 10, "prop_type": "anytime_td", "market": {"type": "milestone", "odds": 150}},
+                    {"id": 3, "game_id": game_id, "player_id": 10, "prop_type": "rushing_yards", "market": {"type": "milestone", "odds": 300}},
+                    {"id": 4, "game_id": game_id, "player_id": None, "prop_type": "receptions", "market": {"type": "over_under"}},
+                ]
+            )
+
+    sb = SB()
+    upserted = ingest_player_props_filtered(game_ids=[7], supabase=sb, bdl=BDL(), batch_size=10)  # type: ignore[arg-type]
+    assert upserted == 2
+    assert [(t, [r["id"] for r in rows]) for t, rows in sb.upserts] == [("nfl_player_props", [1, 2])]
+    assert sb.upserts[0][1][1]["milestone_odds"] == 150
+
+
+def test_ingest_player_props_filtered_skips_games_that_fail_to_fetch():
+    class SB:
+        def __init__(self):
+            self.rows = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.rows.extend(rows)
+            return len(rows)
+
+    class BDL:
+        def iter_player_props(self, *, game_id, vendors=None):
+            if game_id == 2:
+                raise BallDontLieError("HTTP 500")
+            return iter([{"id": game_id, "game_id": game_id, "player_id": 10, "market": {"type": "over_under"}}])
+
+    sb = SB()
+    upserted = ingest_player_props_filtered(game_ids=[1, 2, 3], supabase=sb, bdl=BDL(), max_workers=3)  # type: ignore[arg-type]
+    assert upserted == 2
+    assert sorted(r["game_id"] for r in sb.rows) == [1, 3]
+
+
+def test_prefetched_preserves_order_and_reraises_producer_errors():
+    assert list(_prefetched(iter([[1], [2], [3]]))) == [[1], [2], [3]]
+
+    def boom():
+        yield [1]
+        raise BallDontLieError("page failed")
+
+    got = []
+    with pytest.raises(BallDontLieError):
+        for chunk in _prefetched(boom()):
+            got.append(chunk)
+    assert got == [[1]]
+
+
+def test_supabase_upsert_omits_null_fields_and_lists_columns():
+    sess = StubSession([StubResponse(201, None), StubResponse(201, None)])
+    sb = SupabaseClient(SupabaseConfig(url="https://x.supabase.co", service_role_key="k"), session=sess)
+    sb.upsert("nfl_team_season_stats", [{"team_id": 1, "season": 2024, "wins": None}, {"team_id": 2, "season": 2024, "wins": 9}])
+    sb.upsert("nfl_teams", [{"id": 1, "name": "Lions"}], on_conflict="id")
+
+    assert json.loads(sess.calls[0]["data"]) == [{"team_id": 1, "season": 2024}, {"team_id": 2, "season": 2024, "wins": 9}]
+    assert "columns=team_id%2Cseason%2Cwins" in sess.calls[0]["url"]
+    assert "columns=" not in sess.calls[1]["url"]
+
+
+def test_supabase_upsert_encodes_numpy_values_natively():
+    np = pytest.importorskip("numpy")
+    sess = StubSession([StubResponse(201, None)])
+    sb = SupabaseClient(SupabaseConfig(url="https://x.supabase.co", service_role_key="k"), session=sess)
+    sb.upsert("nfl_snap_counts", [{"week": np.int64(3), "offense_pct": np.float64(0.5), "flags": np.array([1, 2])}])
+    assert json.loads(sess.calls[0]["data"]) == [{"week": 3, "offense_pct": 0.5, "flags": [1, 2]}]
+
+
+def test_map_team_season_stat_renames_and_derives_fields():
+    raw = {
+        "team": {"id": 14},
+        "season_type": 3,
+        "passing_yards": 4100,
+        "passing_qb_rating": 101.5,
+        "misc_third_down_convs": 32,
+        "misc_third_down_attempts": 85,
+        "def_pass_epa": -0.12,
+    }
+    row = map_team_season_stat(raw, season_override=2024, now="2024-01-01T00:00:00+00:00")
+    assert row["team_id"] == 14
+    assert row["season"] == 2024
+    assert row["postseason"] is True
+    assert row["passing_yards"] == 4100
+    assert row["qb_rating"] == 101.5
+    assert row["third_down_efficiency"] == "32-85"
+    assert row["fourth_down_efficiency"] is None
+    assert row["rushing_yards"] is None
+    assert row["stats_json"] is raw
+    assert row["updated_at"] == "2024-01-01T00:00:00+00:00"
+
+
+def test_ingest_injuries_full_sync_prunes_rows_not_restamped():
+    class SB:
+        def __init__(self):
+            self.calls = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.calls.append(("upsert", table, rows))
+            return len(rows)
+
+        def delete(self, table, *, filters):
+            self.calls.append(("delete", table, filters))
+            return 3
+
+    class BDL:
+        def iter_injuries(self, *, team_ids=None):
+            return iter([{"player": {"id": 5}, "status": "Out", "date": "2024-10-01"}, {"status": "Questionable"}])
+
+    sb = SB()
+    assert ingest_injuries(supabase=sb, bdl=BDL()) == 1  # type: ignore[arg-type]
+    assert [c[0] for c in sb.calls] == ["upsert", "delete"]
+    stamped = sb.calls[0][2][0]["updated_at"]
+    assert sb.calls[1][2] == {"updated_at": f"lt.{stamped}"}
+
+    sb = SB()
+    ingest_injuries(supabase=sb, bdl=BDL(), team_ids=[1])  # type: ignore[arg-type]
+    assert [c[0] for c in sb.calls] == ["upsert"]
+
+
+def test_supabase_select_decodes_response_body():
+    sess = StubSession([StubResponse(200, [{"id": 1, "name": "Lions"}])])
+    sb = SupabaseClient(SupabaseConfig(url="https://x.supabase.co", service_role_key="k"), session=sess)
+    assert sb.select("nfl_teams", select="id,name") == [{"id": 1, "name": "Lions"}]
+
+
+def test_ingest_active_players_uses_rpc_and_falls_back_to_chunked_updates():
+    class BDL:
+        def iter_active_players(self):
+            return iter([{"id": i} for i in range(1, 251)] + [{"id": None}])
+
+    class SB:
+        def __init__(self, rpc_ok):
+            self.rpc_ok = rpc_ok
+            self.rpc_calls = []
+            self.updates = []
+
+        def rpc(self, fn, params=None):
+            self.rpc_calls.append((fn, params))
+            if not self.rpc_ok:
+                raise SupabaseError("RPC failed fn=set_active_players status=404")
+            return 3
+
+        def update(self, table, data, filters):
+            self.updates.append(filters["id"].count(",") + 1)
+            return [{}] * self.updates[-1]
+
+    sb = SB(rpc_ok=True)
+    ingest_active_players(supabase=sb, bdl=BDL())  # type: ignore[arg-type]
+    assert sb.rpc_calls == [("set_active_players", {"ids": list(range(1, 251))})]
+    assert sb.updates == []
+
+    sb = SB(rpc_ok=False)
+    ingest_active_players(supabase=sb, bdl=BDL())  # type: ignore[arg-type]
+    assert sb.updates == [200, 50]
+
+
+def test_supabase_rpc_posts_params_to_function_endpoint():
+    sess = StubSession([StubResponse(200, 7)])
+    sb = SupabaseClient(SupabaseConfig(url="https://x.supabase.co", service_role_key="k"), session=sess)
+    assert sb.rpc("set_active_players", {"ids": [1, 2]}) == 7
+    call = sess.calls[0]
+    assert call["method"] == "POST"
+    assert call["url"] == "https://x.supabase.co/rest/v1/rpc/set_active_players"
+    assert json.loads(call["data"]) == {"ids": [1, 2]}
+
+
+def test_bdl_team_ids_fetched_once_per_client():
+    sess = StubSession([StubResponse(200, {"data": [{"id": 1}, {"id": 2}, {"id": None}], "meta": {"next_cursor": None}})])
+    rl = RateLimiter(min_interval_seconds=0.0, _sleep=lambda s: None)
+    c = BallDontLieNFLClient(api_key="k", session=sess, rate_limiter=rl, sleep_fn=lambda s: None)  # type: ignore[arg-type]
+    assert c.team_ids() == (1, 2)
+    assert c.team_ids() == (1, 2)
+    assert len(sess.calls) == 1
+
+
+def test_bdl_team_ids_reused_from_disk_cache(tmp_path):
+    rl = RateLimiter(min_interval_seconds=0.0, _sleep=lambda s: None)
+    sess = StubSession([StubResponse(200, {"data": [{"id": 1}, {"id": 2}], "meta": {"next_cursor": None}})])
+    c = BallDontLieNFLClient(api_key="k", session=sess, rate_limiter=rl, cache_dir=str(tmp_path))  # type: ignore[arg-type]
+    assert c.team_ids() == (1, 2)
+
+    fresh = StubSession([])
+    c2 = BallDontLieNFLClient(api_key="k", session=fresh, rate_limiter=rl, cache_dir=str(tmp_path))  # type: ignore[arg-type]
+    assert c2.team_ids() == (1, 2)
+    assert fresh.calls == []
+
+
+
+def test_ingest_team_season_stats_fetches_team_groups_and_upserts_all():
+    class SB:
+        def __init__(self):
+            self.rows = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.rows.extend(rows)
+            return len(rows)
+
+    class BDL:
+        def __init__(self):
+            self.groups = []
+
+        def team_ids(self):
+            return (1, 2, 3, 4, 5)
+
+        def iter_team_season_stats(self, *, season, team_ids):
+            self.groups.append(sorted(team_ids))
+            return iter([{"team": {"id": t}, "season": season, "season_type": 2} for t in team_ids])
+
+    sb, bdl = SB(), BDL()
+    n = ingest_team_season_stats(seasons=[2024], supabase=sb, bdl=bdl, team_batch=2)  # type: ignore[arg-type]
+    assert n == 5
+    assert sorted(bdl.groups) == [[1, 2], [3, 4], [5]]
+    assert sorted(r["team_id"] for r in sb.rows) == [1, 2, 3, 4, 5]
+
+
+def test_ingest_team_season_stats_dedupes_on_conflict_key():
+    class SB:
+        def __init__(self):
+            self.rows = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.rows.extend(rows)
+            return len(rows)
+
+    class BDL:
+        def team_ids(self):
+            return (1,)
+
+        def iter_team_season_stats(self, *, season, team_ids):
+            return iter(
+                [
+                    {"team": {"id": 1}, "season": season, "season_type": 2, "total_points": 300},
+                    {"team": {"id": 1}, "season": season, "season_type": 2, "total_points": 310},
+                    {"team": {"id": 1}, "season": season, "season_type": 3, "total_points": 40},
+                ]
+            )
+
+    sb = SB()
+    assert ingest_team_season_stats(seasons=[2024], supabase=sb, bdl=BDL()) == 2  # type: ignore[arg-type]
+    assert sorted((r["season_type"], r["total_points"]) for r in sb.rows) == [(2, 310), (3, 40)]
+
+
+def test_ingest_rosters_fetches_teams_concurrently_and_prefers_non_st_position():
+    class SB:
+        def __init__(self):
+            self.rows = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.rows.extend(rows)
+            return len(rows)
+
+    class BDL:
+        def team_ids(self):
+            return (1, 2, 3)
+
+        def iter_team_roster(self, *, team_id, season):
+            if team_id == 3:
+                raise BallDontLieError("boom")
+            return iter(
+                [
+                    {"player": {"id": team_id * 10}, "position": "WR", "depth": 1},
+                    {"player": {"id": team_id * 10}, "position": "KR", "depth": 2},
+                    {"player": {"id": team_id * 10 + 1}, "position": "P", "depth": 1},
+                ]
+            )
+
+    sb = SB()
+    ingest_rosters(seasons=[2024], supabase=sb, bdl=BDL())  # type: ignore[arg-type]
+    got = sorted((r["team_id"], r["player_id"], r["position"]) for r in sb.rows)
+    assert got == [(1, 10, "WR"), (1, 11, "P"), (2, 20, "WR"), (2, 21, "P")]
+
+
+def test_ingest_odds_fetches_game_chunks_concurrently_and_skips_failures():
+    class SB:
+        def __init__(self):
+            self.rows = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.rows.extend(rows)
+            return len(rows)
+
+    class BDL:
+        def iter_betting_odds(self, *, game_ids):
+            if 60 in game_ids:
+                raise BallDontLieError("boom")
+            return iter([{"id": g, "game_id": g, "vendor": "dk"} for g in game_ids])
+
+    sb = SB()
+    ingest_odds(game_ids=list(range(1, 121)), supabase=sb, bdl=BDL())  # type: ignore[arg-type]
+    assert sorted(r["game_id"] for r in sb.rows) == list(range(1, 51)) + list(range(101, 121))
+
+
+def test_ingest_full_stats_pipelines_each_phase_and_drops_rows_without_keys():
+    class SB:
+        def __init__(self):
+            self.batches = {}
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.batches.setdefault(table, []).append(len(rows))
+            return len(rows)
+
+    class BDL:
+        def iter_team_game_stats(self, *, season):
+            return iter([{"team": {"id": i % 3 or None}, "game": {"id": i}} for i in range(1, 8)])
+
+        def iter_player_season_stats(self, *, season):
+            return iter([{"player": {"id": i}, "season": season} for i in range(1, 4)])
+
+        def iter_player_game_stats(self, *, seasons):
+            return iter([{"player": {"id": i}, "game": {"id": 1}, "team": {"id": 1}} for i in range(5)])
+
+    sb = SB()
+    ingest_full_stats(seasons=[2024], supabase=sb, bdl=BDL(), batch_size=2)  # type: ignore[arg-type]
+    assert sb.batches == {
+        "nfl_team_game_stats": [2, 2, 1],
+        "nfl_player_season_stats": [2, 1],
+        "nfl_player_game_stats": [2, 2],
+    }
+
+
+def test_ingest_full_stats_isolates_failed_phase_season_jobs():
+    class SB:
+        def __init__(self):
+            self.tables = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.tables.append((table, rows[0].get("season") or rows[0]["game_id"]))
+            return len(rows)
+
+    class BDL:
+        def iter_team_game_stats(self, *, season):
+            if season == 2023:
+                raise BallDontLieError("boom")
+            return iter([{"team": {"id": 1}, "game": {"id": season}}])
+
+        def iter_player_season_stats(self, *, season):
+            return iter([{"player": {"id": 1}, "season": season}])
+
+        def iter_player_game_stats(self, *, seasons):
+            return iter([])
+
+    sb = SB()
+    ingest_full_stats(seasons=[2023, 2024], supabase=sb, bdl=BDL())  # type: ignore[arg-type]
+    assert sorted(sb.tables) == [
+        ("nfl_player_season_stats", 2023),
+        ("nfl_player_season_stats", 2024),
+        ("nfl_team_game_stats", 2024),
+    ]
+
+
+def test_ingest_player_props_filtered_packs_rows_from_several_games_per_batch():
+    class SB:
+        def __init__(self):
+            self.batches = []
+
+        def upsert(self, table, rows, on_conflict=None):
+            self.batches.append(len(rows))
+            return len(rows)
+
+    class BDL:
+        def iter_player_props(self, *, game_id, vendors=None):
+            return iter(
+                [{"id": game_id * 10 + i, "game_id": game_id, "player_id": i + 1, "market": {"type": "over_under"}} for i in range(3)]
+            )
+
+    sb = SB()
+    assert ingest_player_props_filtered(game_ids=[1, 2, 3, 4], supabase=sb, bdl=BDL(), batch_size=5) == 12  # type: ignore[arg-type]
+    assert sb.batches == [5, 5, 2]
+
+
+def test_nfl_data_py_ingestors_build_rows_column_wise_in_batches(monkeypatch):
+    import nfl_data_py as nfl
+    import numpy as np
+    import pandas as pd
+
+    ids = pd.DataFrame(
+        {
+            "gsis_id": ["00-1", None, "00-3"],
+            "name": ["A", "B", np.nan],
+            "espn_id": [123.0, 5.0, np.nan],
+            "sleeper_id": [np.nan, "9", "7"],
+        }
+    )
+    snaps = pd.DataFrame(
+        {
+            "pfr_player_id": ["p1", "p2"],
+            "player": ["A", "B"],
+            "season": [2024, 2024],
+            "week": [1.0, 2.0],
+            "game_type": [None, "POST"],
+            "offense_snaps": [40.0, np.nan],
+            "offense_pct": [np.nan, 0.5],
+        }
+    )
+    monkeypatch.setattr(nfl, "import_ids", lambda: ids)
+    monkeypatch.setattr(nfl, "import_snap_counts", lambda seasons: snaps)
+
+    class SB:
+        def __init__(self):
+            self.rows = []
+            self.batches = []
+
+        def upsert(self, table, rows, *, on_conflict=None):
+            self.batches.append(len(rows))
+            self.rows.extend(rows)
+            return len(rows)
+
+    sb = SB()
+    assert ingest_player_id_mappings(supabase=sb, batch_size=1) == 2
+    assert sb.batches == [1, 1]
+    first, last = sb.rows
+    assert (first["gsis_id"], first["name"], first["espn_id"], first["sleeper_id"]) == ("00-1", "A", 123, None)
+    assert type(first["espn_id"]) is int and first["yahoo_id"] is None
+    assert (last["name"], last["espn_id"], last["sleeper_id"]) == (None, None, "7")
+
+    sb = SB()
+    assert ingest_snap_counts(seasons=[2024], supabase=sb) == 2
+    r1, r2 = sb.rows
+    assert (r1["game_type"], r1["week"], r1["offense_snaps"], r1["offense_pct"], r1["st_snaps"]) == ("REG", 1, 40, 0.0, 0)
+    assert (r2["game_type"], r2["offense_snaps"], r2["offense_pct"], r2["team"]) == ("POST", 0, 0.5, None)
+
+    class FrameSink:
+        def upsert(self, table, rows, *, on_conflict=None):
+            raise AssertionError("frame sinks take the whole frame")
+
+        def upsert_frame(self, table, df, *, on_conflict=None):
+            self.call = (table, on_conflict, df)
+            return len(df)
+
+    sink = FrameSink()
+    assert ingest_snap_counts(seasons=[2024], supabase=sink, batch_size=1) == 2
+    table, on_conflict, df = sink.call
+    assert (table, on_conflict) == ("nfl_snap_counts", "pfr_player_id,season,week")
+    assert df["offense_snaps"].tolist() == [40, 0] and df["game_type"].tolist() == ["REG", "POST"]
+
+
+def test_get_best_props_keeps_highest_priority_vendor_per_player_prop():
+    ou = {"type": "over_under", "over_odds": -110, "under_odds": -110}
+    raw = [
+        {"id": 1, "game_id": 9, "player_id": 5, "vendor": "betmgm", "prop_type": "receiving_yards", "line_value": "60.5", "market": ou},
+        {"id": 2, "game_id": 9, "player_id": 5, "vendor": "DraftKings", "prop_type": "receiving_yards", "line_value": "61.5", "market": ou},
+        {"id": 3, "game_id": 9, "player_id": 5, "vendor": "fanduel", "prop_type": "receiving_yards", "line_value": "59.5", "market": ou},
+        {"id": 4, "game_id": 9, "player_id": 6, "vendor": "fanduel", "prop_type": "rushing_yards", "line_value": "40.5", "market": ou},
+        {"id": 5, "game_id": 9, "player_id": 6, "vendor": "fanduel", "prop_type": "rushing_yards", "line_value": "41.5", "market": ou},
+        {"id": 6, "game_id": 9, "player_id": 6, "vendor": "draftkings", "prop_type": "anytime_td", "market": ou},
+        {"id": 7, "game_id": 9, "player_id": 7, "vendor": "caesars", "prop_type": "rushing_yards", "market": ou},
+        {"id": 8, "game_id": 9, "player_id": 7, "vendor": "draftkings", "prop_type": "rushing_yards", "market": {"type": "milestone"}},
+        {"id": 9, "game_id": 9, "player_id": None, "vendor": "draftkings", "prop_type": "rushing_yards", "market": ou},
+    ]
+    raw[3]["updated_at"] = "2024-09-01T00:00:00+00:00"
+    assert [r["id"] for r in raw if not is_valid_prop(r)] == [7, 8]
+    best = _get_best_props(raw, now="2024-09-08T12:00:00+00:00")
+    assert [(r["id"], r["vendor"], r["prop_type"], r["updated_at"]) for r in best] == [
+        (2, "draftkings", "player_rec_yds", "2024-09-08T12:00:00+00:00"),
+        (4, "fanduel", "player_rush_yds", "2024-09-01T00:00:00+00:00"),
+    ]
+
+
+def test_ingest_best_props_fetches_games_concurrently_and_skips_failures():
+    ou = {"type": "over_under", "over_odds": -110, "under_odds": -110}
+
+    class BDL:
+        def iter_player_props(self, *, game_id, vendors=None):
+            if game_id == 3:
+                raise BallDontLieError("boom")
+            for vendor in ("fanduel", "draftkings"):
+                yield {"id": game_id * 10 + len(vendor), "game_id": game_id, "player_id": 7, "vendor": vendor,
+                       "prop_type": "receiving_yards", "line_value": "50.5", "market": ou}
+
+    class SB:
+        def __init__(self):
+            self.batches = []
+
+        def upsert(self, table, rows, *, on_conflict=None):
+            self.batches.append((table, [r["game_id"] for r in rows], {r["vendor"] for r in rows}))
+            return len(rows)
+
+    bdl, sb = BDL(), SB()
+    n = _ingest_best_props(supabase=sb, bdl=bdl, game_ids=[1, 2, 3, 4], batch_size=2, max_workers=4)
+
+    assert n == 3
+    assert all(t == "nfl_player_props" and vendors == {"draftkings"} for t, _, vendors in sb.batches)
+    assert sorted(g for _, games, _ in sb.batches for g in games) == [1, 2, 4]
+    assert [len(games) for _, games, _ in sb.batches] == [2, 1]
+
+
+def test_ingest_extras_filters_game_ids_and_streams_odds_once():
+    class BDL:
+        def __init__(self):
+            self.odds_calls = []
+
+        def iter_games(self, *, seasons):
+            yield {"id": 1, "date": "2024-09-08T17:00:00Z"}
+            yield {"id": 2, "date": "2024-09-09T00:20:00Z"}
+            yield {"id": None, "date": "2024-09-08"}
+
+        def iter_team_season_stats(self, *, season):
+            return iter([{"team_id": 5, "season": season}, {"team_id": 5, "season": season, "opp_sacks": 40}])
+
+        def iter_standings(self, *, season):
+            if season == 2023:
+                raise BallDontLieError("boom")
+            return iter([{"team": {"id": 5}, "season": season, "wins": 10}])
+
+        def iter_betting_odds(self, *, game_ids):
+            self.odds_calls.append(list(game_ids))
+            for i, vendor in enumerate(["DraftKings", "fanduel", "draftkings"]):
+                yield {"id": i, "game_id": game_ids[0], "vendor": vendor}
+
+        def iter_player_props(self, *, game_id, vendors=None):
+            return iter([])
+
+        def iter_injuries(self):
+            return iter([])
+
+    class SB:
+        def __init__(self):
+            self.batches = []
+
+        def upsert(self, table, rows, *, on_conflict=None):
+            self.batches.append((table, rows))
+            return len(rows)
+
+    bdl, sb = BDL(), SB()
+    out = ingest_extras(supabase=sb, bdl=bdl, seasons=[2023, 2024], dates=["2024-09-08"], batch_size=1)
+
+    assert bdl.odds_calls == [[1]]
+    by_table = {}
+    for table, rows in sb.batches:
+        by_table.setdefault(table, []).extend(rows)
+    assert [r["id"] for r in by_table["nfl_betting_odds"]] == [0, 2]
+    assert sorted((r["season"], r["opp_sacks"]) for r in by_table["nfl_team_season_stats"]) == [(2023, 40), (2024, 40)]
+    assert [(r["season"], r["wins"]) for r in by_table["nfl_team_standings"]] == [(2024, 10)]
+    assert (out["game_odds"], out["team_season_stats"], out["standings"]) == (2, 2, 1)
@@ -1,6 +1,30 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from src.ingestion.features_wr_receiving import ensure_feature_columns, FEATURE_COLUMNS, _compute_derived
+from src.ingestion.features_wr_receiving import (
+    FEATURE_COLUMNS,
+    Lookups,
+    _compute_derived,
+    _fix_team,
+    _grouped_roll,
+    _ingestion_engine,
+    _join_on_keys,
+    _merge_defense_context,
+    _merge_player_features,
+    _merge_stacked,
+    _prior_cumsum,
+    _prior_window_mean,
+    _rest_days,
+    _rolling_features,
+    _run_starts,
+    clean_name,
+    clean_name_series,
+    downcast_numeric,
+    ensure_feature_columns,
+    safe_read_sql,
+)
+from src.ingestion.nflverse_cache import cached_frame
 
 
 def test_ensure_feature_columns_adds_and_fills():
@@ -10,6 +34,66 @@ def test_ensure_feature_columns_adds_and_fills():
     assert out["missing_col"].iloc[0] == 0
 
 
+def test_safe_read_sql_shares_connection_and_recovers(tmp_path):
+    engine = _ingestion_engine(f"sqlite:///{tmp_path / 'f.db'}")
+    with engine.connect() as conn:
+        assert safe_read_sql(conn, "select * from missing_table").empty
+        out = safe_read_sql(conn, "select 1 as a union all select 2", chunksize=1)
+        assert out["a"].tolist() == [1, 2]
+        assert not conn.get_execution_options().get("stream_results")
+
+
+def test_clean_name_series_matches_clean_name():
+    names = ["Odell Beckham Jr.", "Marvin Harrison Jr", "Michael Pittman Jr.", "Robert Griffin III", "Calvin Austin II", " A.J. Brown ", "A J.r", None, np.nan, ""]
+    out = clean_name_series(pd.Series(names))
+    assert out.tolist() == [clean_name(n) for n in names]
+
+
+def test_fix_team_merges_colliding_codes_and_keeps_missing():
+    s = pd.Series(["LAR", "LA", "WSH", None, "KC"], index=[5, 6, 7, 8, 9])
+    out = _fix_team(s)
+    assert out.dtype == "category"
+    assert out.tolist()[:3] == ["LA", "LA", "WAS"]
+    assert pd.isna(out.iloc[3]) and out.iloc[4] == "KC"
+    assert list(out.index) == [5, 6, 7, 8, 9]
+    assert _fix_team(pd.Series([None, None], dtype=object)).isna().all()
+
+
+def test_grouped_roll_matches_lagged_transform():
+    df = pd.DataFrame(
+        {
+            "player_id": [1, 2, 1, 1, 2, 1, 2, 1],
+            "yards": [10.0, 5.0, 20.0, None, 15.0, 40.0, 25.0, 50.0],
+        },
+        index=[0, 0, 1, 1, 2, 2, 3, 3],
+    )
+    expected = df.groupby("player_id")["yards"].transform(lambda x: x.rolling(2).mean().shift(1))
+    pd.testing.assert_series_equal(_grouped_roll(df, "player_id", "yards", 2, lag=1), expected, check_names=False)
+    expected = df.groupby("player_id")["yards"].transform(lambda x: x.rolling(2).std())
+    pd.testing.assert_series_equal(_grouped_roll(df, "player_id", "yards", 2, stat="std"), expected, check_names=False)
+
+
+def test_rolling_features_match_groupby_for_categorical_and_missing_keys():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "player_id": pd.Categorical(rng.choice(["a", "b", "c", None], 60)),
+            "season": rng.integers(2023, 2025, 60),
+            "week": rng.integers(1, 19, 60),
+            "yards": np.where(rng.random(60) < 0.1, np.nan, rng.random(60) * 100),
+        }
+    )
+    out = _rolling_features(df, ["yards", "not_there"])
+
+    ordered = df.sort_values(["player_id", "season", "week"])
+    for window in (3, 5):
+        expected = ordered.groupby("player_id", observed=True)["yards"].transform(
+            lambda x: x.shift(1).rolling(window).mean()
+        )
+        np.testing.assert_allclose(out[f"yards_last{window}"], expected.reindex(out.index), rtol=1e-9)
+    assert "not_there_last3" not in out.columns
+
+
 def test_compute_derived_basic_signals():
     rows = [
         {
@@ -68,3 +152,155 @@ def test_compute_derived_basic_signals():
         assert pd.notnull(derived[col]).any()
 
 
+
+
+def test_downcast_numeric_matches_per_column_to_numeric():
+    df = pd.DataFrame(
+        {
+            "f": [0.5, 1.5, 2.5],
+            "date_like": [20241231.0, 20240908.0, np.nan],
+            "precise": [1e8 + 0.1, 1.0, 2.0],
+            "huge": [1e39, 0.0, 1.0],
+            "nullable_f": pd.array([20241231.0, None, 1.5], dtype="Float64"),
+            "small": [1, 2, 3],
+            "wide": [0, 70_000, 10**10],
+            "nullable": pd.array([1, None, 300], dtype="Int64"),
+            "name": ["a", "b", "c"],
+        }
+    )
+    floats = ["f", "date_like", "precise", "huge", "nullable_f"]
+    expected = df.copy()
+    for col in floats + ["small", "wide", "nullable"]:
+        kind = "float" if col in floats else "integer"
+        expected[col] = pd.to_numeric(expected[col], downcast=kind)
+    out = downcast_numeric(df)
+    assert out.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(out, expected)
+    # Already-narrow frames (and bools) come back untouched.
+    assert downcast_numeric(out) is out
+    flags = pd.DataFrame({"b": [True, False]})
+    assert downcast_numeric(flags) is flags
+
+
+def test_load_player_lookup_resolves_duplicate_names_consistently(monkeypatch, tmp_path):
+    import src.ingestion.features_wr_receiving as fw
+
+    players = pd.DataFrame(
+        {
+            "player_id": [1, 2, 3],
+            "first_name": ["Mike", "Mike", "Amon-Ra"],
+            "last_name": ["Williams", "Williams", "St. Brown"],
+            "position_abbreviation": ["WR", "WR", "WR"],
+            "team_id": [10, 11, 12],
+        }
+    )
+    teams = pd.DataFrame({"team_id": [10, 11, 12], "abbreviation": ["NYJ", "WSH", "DET"]})
+    monkeypatch.setattr(fw, "safe_read_sql", lambda con, q, **kw: (players if "nfl_players" in q else teams).copy())
+    ids = tmp_path / "ids.csv"
+    pd.DataFrame({"gsis_id": ["00-1"], "merge_name": ["Mike Williams"]}).to_csv(ids, index=False)
+
+    lookups = fw.load_player_lookup(None, str(ids))
+    assert lookups.merge_to_player["mike williams"] == 2
+    assert lookups.merge_to_team_abbr["mike williams"] == "WAS"
+    assert lookups.merge_to_team_abbr["amon-ra st brown"] == "DET"
+
+
+def test_rest_days_diffs_distinct_games_in_date_order():
+    # Two players per game, rows out of date order: rest days come from the team's game dates.
+    team = pd.Series([1, 1, 1, 1, 2, 2])
+    date = pd.to_datetime(pd.Series(["2025-09-14", "2025-09-07", "2025-09-14", "2025-09-07", "2025-09-08", "2025-09-18"]))
+    out = _rest_days(team, date)
+    assert pd.isna(out[1]) and pd.isna(out[3]) and pd.isna(out[4])
+    assert out[0] == 7 and out[2] == 7 and out[5] == 10
+
+
+def test_cached_frame_reuses_parquet_copy(tmp_path):
+    pytest.importorskip("pyarrow")
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return pd.DataFrame({"season": [2024, 2025], "team": ["KC", "BUF"]})
+
+    first = cached_frame(tmp_path, "pbp", [2025, 2024], loader)
+    second = cached_frame(str(tmp_path), "pbp", [2024, 2025], loader)
+    pd.testing.assert_frame_equal(second, first)
+    assert len(calls) == 1
+    cached_frame(tmp_path, "ids", (), loader)
+    assert (tmp_path / "ids.parquet").exists() and len(calls) == 2
+
+
+def test_merge_context_keeps_team_abbr_for_script_join():
+    base = pd.DataFrame(
+        {"player_id": [7], "season": [2025], "week": [3], "team_abbr": ["KC"], "opponent_team_abbr": ["BUF"]}
+    )
+    lookups = Lookups(
+        players=pd.DataFrame({"player_id": [7], "merge_name": ["travis kelce"]}),
+        teams=pd.DataFrame(columns=["team_id", "abbreviation"]),
+        merge_to_player={},
+        gsis_to_merge={},
+        merge_to_team_abbr={},
+    )
+    receiver_pbp = pd.DataFrame(
+        {"merge_name": ["travis kelce"], "team_abbr": ["KC"], "season": [2025], "week": [3], "wopr": [0.6]}
+    )
+    empty = pd.DataFrame()
+    df = _merge_player_features(base, pd.DataFrame(), receiver_pbp, empty, empty, empty, lookups)
+    defense = pd.DataFrame({"team_abbr": ["BUF"], "season": [2025], "week": [3], "def_epa": [-0.1]})
+    allowance = pd.DataFrame({"team_abbr": ["BUF"], "season": [2025], "opp_comp_pct_allowed": [0.61]})
+    script = pd.DataFrame({"team_abbr": ["KC"], "season": [2025], "week": [3], "team_pace": [27.5]})
+    out = _merge_defense_context(df, defense, script, allowance)
+
+    assert "team_abbr_x" not in out.columns and "team_abbr_y" not in out.columns
+    row = out.iloc[0]
+    assert (row["team_abbr"], row["wopr"], row["def_epa"], row["team_pace"]) == ("KC", 0.6, -0.1, 27.5)
+    assert row["opp_comp_pct_allowed"] == 0.61
+
+    with pytest.raises(pd.errors.MergeError):
+        _merge_defense_context(df, pd.concat([defense, defense]), script, allowance)
+
+
+def test_join_on_keys_matches_sequential_merges():
+    keys = ["merge_name", "season", "week"]
+    base = pd.DataFrame({"merge_name": ["a", "b", None, "c"], "season": [2025] * 4, "week": [1, 1, 1, 2], "x": [1, 2, 3, 4]})
+    snaps = pd.DataFrame({"merge_name": ["a", None, "c"], "season": [2025.0] * 3, "week": [1, 1, 2], "snap_pct": [0.9, 0.1, 0.5]})
+    depth = pd.DataFrame({"merge_name": ["b", "b"], "season": [2025, 2025], "week": [1, 1], "depth_rank": [1, 2], "x": [0, 0]})
+    ngs = pd.DataFrame({"merge_name": ["c"], "season": [2025], "week": [2], "ngs_adot": [11.0]})
+
+    expected = base
+    for ext in (snaps, depth, ngs):
+        expected = expected.merge(ext.drop(columns=[c for c in ext.columns if c == "x"]), on=keys, how="left")
+    out = _join_on_keys(base, (snaps, depth, ngs, pd.DataFrame()), keys)
+    pd.testing.assert_frame_equal(out.reset_index(drop=True), expected)
+
+
+def test_prior_stats_match_groupby_and_reset_per_run():
+    df = pd.DataFrame(
+        {
+            "player_id": [1, 1, 1, 1, 1, 2, 2],
+            "season": [2024, 2024, 2024, 2024, 2025, 2025, 2025],
+            "yards": [10.0, None, 30.0, 40.0, 50.0, 60.0, 70.0],
+        }
+    )
+    start = _run_starts(df["player_id"].to_numpy(), df["season"].to_numpy())
+    assert start.tolist() == [0, 0, 0, 0, 4, 5, 5]
+    x = df["yards"].to_numpy(dtype=float)
+    grouped = df.groupby(["player_id", "season"])["yards"]
+
+    expected_cum = grouped.cumsum().groupby([df["player_id"], df["season"]]).shift(1)
+    pd.testing.assert_series_equal(pd.Series(_prior_cumsum(x, start)), expected_cum, check_names=False)
+    expected_mean = grouped.transform(lambda s: s.shift(1).rolling(2).mean())
+    pd.testing.assert_series_equal(pd.Series(_prior_window_mean(x, start, 2)), expected_mean, check_names=False)
+
+
+def test_merge_stacked_matches_separate_merges():
+    right = pd.DataFrame({"game_id": [1, 2, 2], "total_value": [44.5, 47.0, 48.0]})
+    train = pd.DataFrame({"game_id": [2, 1, 3], "receptions": [4, 5, 6]})
+    inf = pd.DataFrame({"game_id": [1, 2], "prop_line_yards": [55.5, 61.5]})
+
+    def merge(df):
+        return df.merge(right, on="game_id", how="left")
+
+    out_train, out_inf = _merge_stacked((train, inf), merge)
+    pd.testing.assert_frame_equal(out_train, merge(train))
+    pd.testing.assert_frame_equal(out_inf, merge(inf))